@@ -0,0 +1,88 @@
+import argparse
+import os
+import sys
+
+from benchmarks import stages
+from benchmarks.workloads import WORKLOADS
+
+# Базовая линия по умолчанию хранится рядом с пакетом
+BASELINE_PATH = os.path.join(os.path.dirname(__file__), 'baseline.json')
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(
+        prog='python -m benchmarks',
+        description=(
+            'Замеры этапов разбора, проверки скобок и вычисления RPN '
+            'на синтетических нагрузках со сравнением с базовой линией'
+        ),
+    )
+    parser.add_argument(
+        '--workload',
+        action='append',
+        choices=[workload.name for workload in WORKLOADS],
+        help='нагрузка для замера (можно несколько; по умолчанию - все)',
+    )
+    parser.add_argument('--repeat', type=int, default=7, help='число замеров')
+    parser.add_argument('-o', '--output', metavar='FILE', help='файл для JSON')
+    parser.add_argument(
+        '--baseline', default=BASELINE_PATH, metavar='FILE', help='базовая линия'
+    )
+    parser.add_argument(
+        '--tolerance',
+        type=float,
+        default=stages.DEFAULT_TOLERANCE,
+        help='допустимое замедление (0.5 - на 50%%)',
+    )
+    parser.add_argument(
+        '--update-baseline',
+        action='store_true',
+        help='записать результаты как новую базовую линию',
+    )
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    """
+    Returns:
+        int: 0 - без регрессий, 1 - есть замедления сверх допуска.
+    """
+    args = parse_args(argv)
+    workloads = [
+        workload
+        for workload in WORKLOADS
+        if args.workload is None or workload.name in args.workload
+    ]
+    results = stages.run(workloads, args.repeat)
+
+    for name, result in results['results'].items():
+        timings = ', '.join(
+            f'{stage} {timing["best_us"]} мкс'
+            for stage, timing in result.items()
+            if isinstance(timing, dict) and stage != 'calibration'
+        )
+        print(f'{name} ({result["tokens"]} токенов): {timings}')
+
+    if args.output:
+        stages.save(results, args.output)
+
+    if args.update_baseline:
+        stages.save(results, args.baseline)
+        print(f'Базовая линия записана: {args.baseline}')
+        return 0
+
+    if not os.path.exists(args.baseline):
+        print(f'Базовая линия не найдена: {args.baseline}', file=sys.stderr)
+        return 0
+
+    regressions = stages.compare(results, stages.load(args.baseline), args.tolerance)
+    for name, stage, base, current, ratio in regressions:
+        print(
+            f'РЕГРЕССИЯ {name}/{stage}: {base} -> {current} мкс (x{ratio})',
+            file=sys.stderr,
+        )
+    return 1 if regressions else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,118 @@
+import argparse
+import json
+import statistics
+import subprocess
+import sys
+import time
+
+
+def measure_import(module='src.main'):
+    """
+    Измеряет время импорта модуля по данным python -X importtime.
+
+    Args:
+        module (str): Имя модуля.
+
+    Returns:
+        int: Суммарное время импорта модуля в микросекундах.
+    """
+    completed = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', f'import {module}'],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    for line in completed.stderr.splitlines():
+        # Формат строки: 'import time: self | cumulative | name'
+        parts = [part.strip() for part in line.split('|')]
+        if len(parts) == 3 and parts[2] == module:
+            return int(parts[1])
+    raise RuntimeError(f'Модуль {module} не найден в выводе importtime')
+
+
+def measure_one_shot(expr, repeat):
+    """
+    Измеряет полное время однократных вызовов python -m src.main -e.
+
+    Args:
+        expr (str): Выражение в RPN.
+        repeat (int): Число запусков.
+
+    Returns:
+        list: Время каждого запуска в секундах.
+    """
+    command = [sys.executable, '-m', 'src.main', '-e', expr]
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        subprocess.run(command, capture_output=True, check=True)
+        timings.append(time.perf_counter() - start)
+    return timings
+
+
+def measure_coprocess(expr, repeat):
+    """
+    Измеряет время ответа долгоживущего процесса python -m src.main --coprocess.
+
+    Args:
+        expr (str): Выражение в RPN.
+        repeat (int): Число запросов.
+
+    Returns:
+        list: Время каждого запроса в секундах.
+    """
+    process = subprocess.Popen(
+        [sys.executable, '-m', 'src.main', '--coprocess'],
+        stdin=subprocess.PIPE,
+        stdout=subprocess.PIPE,
+        text=True,
+    )
+    timings = []
+    try:
+        for _ in range(repeat):
+            start = time.perf_counter()
+            process.stdin.write(expr + '\n')
+            process.stdin.flush()
+            process.stdout.readline()
+            timings.append(time.perf_counter() - start)
+    finally:
+        process.stdin.close()
+        process.wait()
+    return timings
+
+
+def summarize(timings):
+    """Возвращает минимум и медиану в миллисекундах."""
+    return {
+        'min_ms': round(min(timings) * 1000, 3),
+        'median_ms': round(statistics.median(timings) * 1000, 3),
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        prog='python -m benchmarks.import_time',
+        description='Время запуска CLI: импорт, однократный вызов и сопроцесс',
+    )
+    parser.add_argument('--repeat', type=int, default=20)
+    parser.add_argument('--expr', default='3 4 + 2 *')
+    parser.add_argument('--json', action='store_true', help='вывод в формате JSON')
+    args = parser.parse_args(argv)
+
+    results = {
+        'import_src_main_us': measure_import(),
+        'one_shot': summarize(measure_one_shot(args.expr, args.repeat)),
+        'coprocess': summarize(measure_coprocess(args.expr, args.repeat)),
+    }
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+    else:
+        print(f'Импорт src.main: {results["import_src_main_us"]} мкс')
+        for name in ('one_shot', 'coprocess'):
+            print(f'{name}: {results[name]}')
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,175 @@
+import gc
+import json
+import platform
+import statistics
+import time
+
+from src.rpn_evaluator import RPNEvaluator
+from src.token_parser import TokenParser
+
+# Минимальная длительность одного замера: короткие вызовы повторяются
+MIN_SAMPLE_TIME = 0.05
+# Допустимое замедление относительно базовой линии (доля); с запасом
+# на шум замеров на общих машинах
+DEFAULT_TOLERANCE = 0.5
+
+
+def time_call(func, repeat=7):
+    """
+    Измеряет время одного вызова func. Вызов повторяется столько раз,
+    чтобы замер длился не меньше MIN_SAMPLE_TIME, и замер выполняется
+    repeat раз. Сборщик мусора на время замеров отключается, как в timeit.
+
+    Args:
+        func (Callable): Функция без аргументов.
+        repeat (int): Число замеров.
+
+    Returns:
+        dict: Лучшее и медианное время одного вызова в микросекундах.
+    """
+    enabled = gc.isenabled()
+    gc.disable()
+    try:
+        return _time_call(func, repeat)
+    finally:
+        if enabled:
+            gc.enable()
+
+
+def _time_call(func, repeat):
+    """Выполняет замеры time_call при отключённом сборщике мусора."""
+    number = 1
+    while True:
+        start = time.perf_counter()
+        for _ in range(number):
+            func()
+        elapsed = time.perf_counter() - start
+        if elapsed >= MIN_SAMPLE_TIME:
+            break
+        number *= 2
+
+    samples = [elapsed / number]
+    for _ in range(repeat - 1):
+        start = time.perf_counter()
+        for _ in range(number):
+            func()
+        samples.append((time.perf_counter() - start) / number)
+
+    return {
+        'best_us': round(min(samples) * 1e6, 3),
+        'median_us': round(statistics.median(samples) * 1e6, 3),
+    }
+
+
+def _calibration_loop():
+    """Эталонная нагрузка на интерпретатор для учёта скорости машины."""
+    stack = []
+    for i in range(2000):
+        stack.append(i)
+        if len(stack) > 1:
+            b = stack.pop()
+            stack[-1] = stack[-1] + b
+    return stack
+
+
+def bench_workload(workload, repeat=7):
+    """
+    Измеряет отдельно этапы обработки выражения: полный разбор
+    (TokenParser.parse), токенизацию (TokenParser.tokenize), проверку скобок
+    (TokenParser.validate) и вычисление (RPNEvaluator.evaluate).
+
+    Args:
+        workload (Workload): Нагрузка.
+        repeat (int): Число замеров каждого этапа.
+
+    Returns:
+        dict: Этап -> результаты time_call, а также число токенов.
+    """
+    parser = TokenParser()
+    evaluator = RPNEvaluator()
+    expr = workload.generate()
+    tokens = parser.parse(expr)
+
+    return {
+        'tokens': len(tokens),
+        # Эталон замеряется рядом с каждой нагрузкой, чтобы учесть
+        # скорость машины и изменения частоты процессора во время прогона
+        'calibration': time_call(_calibration_loop, repeat),
+        'parse': time_call(lambda: parser.parse(expr), repeat),
+        'tokenize': time_call(lambda: parser.tokenize(expr), repeat),
+        'validate': time_call(lambda: parser.validate(tokens), repeat),
+        'evaluate': time_call(lambda: evaluator.evaluate(tokens), repeat),
+    }
+
+
+def run(workloads, repeat=7):
+    """
+    Выполняет замеры для набора нагрузок.
+
+    Args:
+        workloads (Iterable[Workload]): Нагрузки.
+        repeat (int): Число замеров каждого этапа.
+
+    Returns:
+        dict: Сведения об окружении и результаты по нагрузкам.
+    """
+    return {
+        'python': platform.python_version(),
+        'implementation': platform.python_implementation(),
+        'machine': platform.machine(),
+        'results': {
+            workload.name: bench_workload(workload, repeat) for workload in workloads
+        },
+    }
+
+
+def compare(current, baseline, tolerance=DEFAULT_TOLERANCE):
+    """
+    Сравнивает лучшее время этапов с базовой линией. Время делится на
+    время эталонной нагрузки, поэтому сравнение меньше зависит от скорости
+    машины, на которой записана базовая линия.
+
+    Args:
+        current (dict): Результаты run().
+        baseline (dict): Сохранённые результаты run().
+        tolerance (float): Допустимое замедление (0.5 - на 50%).
+
+    Returns:
+        list: Регрессии - кортежи (нагрузка, этап, базовое время,
+            текущее время, отношение).
+    """
+    regressions = []
+    for name, stages in current['results'].items():
+        base_stages = baseline.get('results', {}).get(name)
+        if base_stages is None:
+            continue
+        scale = 1.0
+        if 'calibration' in stages and 'calibration' in base_stages:
+            scale = (
+                base_stages['calibration']['best_us'] / stages['calibration']['best_us']
+            )
+        for stage, timing in stages.items():
+            if stage == 'calibration' or not isinstance(timing, dict):
+                continue
+            if stage not in base_stages:
+                continue
+            base = base_stages[stage]['best_us']
+            ratio = timing['best_us'] * scale / base if base else 1.0
+            if ratio > 1 + tolerance:
+                regressions.append(
+                    (name, stage, base, timing['best_us'], round(ratio, 3))
+                )
+    return regressions
+
+
+def load(path):
+    """Читает результаты из JSON-файла."""
+    with open(path, encoding='utf-8') as file:
+        return json.load(file)
+
+
+def save(results, path):
+    """Записывает результаты в JSON-файл."""
+    with open(path, 'w', encoding='utf-8') as file:
+        json.dump(results, file, indent=2, ensure_ascii=False)
+        file.write('\n')
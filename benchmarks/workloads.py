@@ -0,0 +1,122 @@
+import random
+
+# Вероятность того, что слагаемое будет подвыражением в скобках
+GROUP_PROBABILITY = 0.1
+# Число слагаемых в подвыражении в скобках
+GROUP_TERMS = 4
+
+
+class Workload:
+    """
+    Параметры синтетического выражения в RPN: число слагаемых, глубина
+    вложенности скобок, набор операторов внутри слагаемых и доли целых,
+    вещественных и больших целых чисел.
+    """
+
+    def __init__(self, name, terms, depth=0, mix=('*',), ratios=(1, 0, 0), seed=0):
+        """
+        Args:
+            name (str): Имя нагрузки в результатах.
+            terms (int): Число слагаемых верхнего уровня.
+            depth (int): Глубина вложенности скобок.
+            mix (tuple): Операторы внутри слагаемых ('*', '/', '//', '%', '~').
+            ratios (tuple): Веса целых, вещественных и больших целых чисел.
+            seed (int): Зерно генератора для воспроизводимости.
+        """
+        self.name = name
+        self.terms = terms
+        self.depth = depth
+        self.mix = mix
+        self.ratios = ratios
+        self.seed = seed
+
+    def generate(self):
+        """
+        Returns:
+            str: Выражение в RPN.
+        """
+        return generate_expression(
+            self.terms, self.depth, self.mix, self.ratios, self.seed
+        )
+
+    def __repr__(self):
+        return f'Workload({self.name!r})'
+
+
+def generate_expression(terms, depth=0, mix=('*',), ratios=(1, 0, 0), seed=0):
+    """
+    Генерирует корректное выражение в RPN: сумму слагаемых со знаками + и -,
+    где слагаемое - число, операция над двумя числами или подвыражение
+    в скобках. Операторы применяются только к числам, поэтому значения
+    не растут с длиной выражения, а делители не равны нулю.
+
+    Args:
+        terms (int): Число слагаемых верхнего уровня.
+        depth (int): Глубина вложенности скобок.
+        mix (tuple): Операторы внутри слагаемых.
+        ratios (tuple): Веса целых, вещественных и больших целых чисел.
+        seed (int): Зерно генератора.
+
+    Returns:
+        str: Выражение в RPN.
+    """
+    rng = random.Random(seed)
+    parts = []
+    _chain(rng, parts, terms, depth, mix, ratios, GROUP_PROBABILITY)
+    return ' '.join(parts)
+
+
+def _chain(rng, parts, terms, depth, mix, ratios, group_probability=0):
+    """
+    Добавляет сумму terms слагаемых. Первое слагаемое при depth > 0 -
+    подвыражение, чтобы глубина была точной; остальные становятся
+    подвыражениями с вероятностью group_probability (только на верхнем
+    уровне, иначе размер рос бы экспоненциально от глубины).
+    """
+    for i in range(terms):
+        if depth > 0 and (i == 0 or rng.random() < group_probability):
+            parts.append('(')
+            _chain(rng, parts, GROUP_TERMS, depth - 1, mix, ratios)
+            parts.append(')')
+        else:
+            _term(rng, parts, mix, ratios)
+        if i:
+            parts.append(rng.choice('+-'))
+
+
+def _term(rng, parts, mix, ratios):
+    """Добавляет слагаемое без скобок."""
+    operator = rng.choice(mix) if mix else None
+    if operator in ('//', '%'):
+        # Целочисленные операции - только над целыми
+        parts.append(str(rng.randint(1, 999)))
+        parts.append(str(rng.randint(1, 99)))
+        parts.append(operator)
+        return
+
+    parts.append(_number(rng, ratios))
+    if operator == '~':
+        parts.append('~')
+    elif operator is not None:
+        parts.append(_number(rng, ratios))
+        parts.append(operator)
+
+
+def _number(rng, ratios):
+    """Возвращает положительное число случайного вида."""
+    kind = rng.choices(('int', 'float', 'bigint'), weights=ratios)[0]
+    if kind == 'int':
+        return str(rng.randint(1, 999))
+    if kind == 'float':
+        return f'{rng.uniform(0.5, 999):.3f}'
+    return str(rng.randint(10**30, 10**40))
+
+
+WORKLOADS = (
+    Workload('small-int', 10),
+    Workload('medium-mixed', 1000, depth=2, mix=('*', '/', '~'), ratios=(3, 2, 0)),
+    Workload('large-int', 20000, mix=('*', '//', '%', '~')),
+    Workload('large-float', 20000, mix=('*', '/'), ratios=(0, 1, 0)),
+    Workload('deep-nesting', 500, depth=30, mix=('*', '~'), ratios=(1, 1, 0)),
+    Workload('bigint', 2000, mix=('*', '//', '%'), ratios=(1, 0, 1)),
+)
@@ -0,0 +1,214 @@
+import math
+import operator
+from importlib import import_module
+
+from src.exceptions import DivisionByZeroError, InvalidOperandTypeError, ParserError
+from src.operators import DEFAULT_OPERATORS, Operators, OperatorSpec
+
+
+class NumericBackend:
+    """
+    Числовой режим калькулятора: разбор чисел, приведение значений переменных,
+    реализации операторов и нормализация результата.
+    """
+
+    __slots__ = (
+        'name',
+        'operators',
+        'parse_number',
+        'coerce',
+        'finalize',
+        'normalize_each',
+    )
+
+    def __init__(
+        self,
+        name,
+        operators,
+        parse_number=None,
+        coerce=None,
+        finalize=None,
+        normalize_each=False,
+    ):
+        """
+        Args:
+            name (str): Имя режима.
+            operators (Operators): Реализации операторов режима.
+            parse_number (Callable | None): Разбор числа из строки; должен
+                выбрасывать ValueError для не-чисел. None - встроенный разбор
+                в int/float с приведением целых вещественных к int.
+            coerce (Callable | None): Приведение значения переменной к числу
+                режима; None - без приведения.
+            finalize (Callable | None): Нормализация итогового результата.
+            normalize_each (bool): Приводить целые вещественные к int после
+                каждой операции (семантика режима exact).
+        """
+        self.name = name
+        self.operators = operators
+        self.parse_number = parse_number
+        self.coerce = coerce
+        self.finalize = finalize
+        self.normalize_each = normalize_each
+
+    def __repr__(self):
+        return f'NumericBackend({self.name!r})'
+
+
+def check_number_syntax(part):
+    """
+    Проверяет, что строка - число в синтаксисе калькулятора: с точкой -
+    вещественное, без точки - целое.
+
+    Raises:
+        ValueError: Если строка не число.
+    """
+    if '.' in part:
+        float(part)
+    else:
+        int(part)
+
+
+def check_divisor(b, message):
+    """
+    Raises:
+        DivisionByZeroError: Если делитель равен нулю.
+    """
+    if b == 0:
+        raise DivisionByZeroError(message)
+
+
+# Режим float64: все числа - float, без приведения после каждой операции
+
+
+def _parse_float(part):
+    """
+    Разбирает число как float.
+
+    Raises:
+        ValueError: Если строка не число.
+        ParserError: Если целое не помещается в float.
+    """
+    if '.' in part:
+        return float(part)
+    value = int(part)
+    try:
+        return float(value)
+    except OverflowError:
+        raise ParserError(f'Число вне диапазона float64: {part}') from None
+
+
+def _finalize_float(value):
+    """Приводит целый результат к int, как в режиме exact."""
+    if isinstance(value, float) and value.is_integer():
+        return int(value)
+    return value
+
+
+def _check_float_integers(a, b, symbol):
+    """
+    Raises:
+        InvalidOperandTypeError: Если операнды не целые по значению.
+    """
+    if not (float(a).is_integer() and float(b).is_integer()):
+        raise InvalidOperandTypeError(
+            f"Операнды должны быть целыми числами для операции '{symbol}'"
+        )
+
+
+def _float_division(a, b):
+    check_divisor(b, 'Деление на ноль')
+    return a / b
+
+
+def _float_integer_division(a, b):
+    _check_float_integers(a, b, '//')
+    check_divisor(b, 'Целочисленное деление на ноль')
+    return a // b
+
+
+def _float_modulo(a, b):
+    _check_float_integers(a, b, '%')
+    check_divisor(b, 'Остаток от деления на ноль')
+    return a % b
+
+
+def make_operators(division, integer_division, modulo, power):
+    """Создаёт реестр встроенных операторов с заданными реализациями."""
+    return Operators(
+        (
+            OperatorSpec('+', 2, operator.add, priority=1),
+            OperatorSpec('-', 2, operator.sub, priority=1),
+            OperatorSpec('*', 2, operator.mul, priority=2),
+            OperatorSpec('/', 2, division, priority=2),
+            OperatorSpec('//', 2, integer_division, priority=2),
+            OperatorSpec('%', 2, modulo, priority=2),
+            OperatorSpec('^', 2, power, priority=3, right_associative=True),
+            OperatorSpec('~', 1, operator.neg, priority=4),
+            OperatorSpec('@', 1, operator.pos, priority=4),
+        )
+    )
+
+
+EXACT = NumericBackend('exact', DEFAULT_OPERATORS, normalize_each=True)
+
+FLOAT64 = NumericBackend(
+    'float64',
+    make_operators(_float_division, _float_integer_division, _float_modulo, math.pow),
+    parse_number=_parse_float,
+    coerce=float,
+    finalize=_finalize_float,
+)
+
+# Загруженные встроенные режимы. Режимы decimal и fraction создаются при
+# первом обращении: модули decimal и fractions (и re через fractions)
+# замедлили бы запуск калькулятора, которому они не нужны
+BACKENDS = {backend.name: backend for backend in (EXACT, FLOAT64)}
+# Встроенные режимы, создаваемые при первом обращении: имя -> (модуль, имя)
+_LAZY_BACKENDS = {
+    'decimal': ('src.decimal_backend', 'DECIMAL'),
+    'fraction': ('src.fraction_backend', 'FRACTION'),
+}
+# Имена всех встроенных режимов
+BACKEND_NAMES = ('exact', 'float64', *_LAZY_BACKENDS)
+
+
+def get_backend(backend):
+    """
+    Возвращает числовой режим по имени.
+
+    Args:
+        backend (str | NumericBackend | None): Имя режима ('exact', 'float64',
+            'decimal', 'fraction') или сам режим; None - 'exact'.
+
+    Returns:
+        NumericBackend: Числовой режим.
+
+    Raises:
+        ValueError: Если режим неизвестен.
+    """
+    if backend is None:
+        return EXACT
+    if isinstance(backend, NumericBackend):
+        return backend
+    if backend in BACKENDS:
+        return BACKENDS[backend]
+    location = _LAZY_BACKENDS.get(backend)
+    if location is None:
+        raise ValueError(f'Неизвестный числовой режим: {backend}')
+    module, name = location
+    BACKENDS[backend] = getattr(import_module(module), name)
+    return BACKENDS[backend]
+
+
+def is_builtin_backend(backend):
+    """
+    Проверяет, что режим встроенный: такой режим можно передать в другой
+    процесс по имени.
+
+    Args:
+        backend (NumericBackend): Числовой режим.
+
+    Returns:
+        bool: True для встроенного режима.
+    """
+    return backend.name in BACKEND_NAMES and get_backend(backend.name) is backend
@@ -0,0 +1,276 @@
+import os
+from collections import deque
+from itertools import islice
+
+# Калькулятор процесса-исполнителя, создаётся в init_worker
+_worker_calculator = None
+
+
+class BatchResult:
+    """
+    Результат вычисления одного выражения в пакетном режиме:
+    значение или объект ошибки вместо выброшенного исключения.
+    """
+
+    __slots__ = ('expr', 'value', 'error')
+
+    def __init__(self, expr, value=None, error=None):
+        """
+        Args:
+            expr (str): Исходное выражение.
+            value (float | int | None): Результат вычисления.
+            error (CalculatorError | None): Ошибка вычисления.
+        """
+        self.expr = expr
+        self.value = value
+        self.error = error
+
+    @property
+    def ok(self):
+        """bool: True, если выражение вычислено без ошибок."""
+        return self.error is None
+
+    def unwrap(self):
+        """
+        Возвращает значение или выбрасывает сохранённую ошибку.
+
+        Returns:
+            float или int: Результат вычисления.
+
+        Raises:
+            CalculatorError: Ошибка вычисления выражения.
+        """
+        if self.error is not None:
+            raise self.error
+        return self.value
+
+    def __eq__(self, other):
+        if not isinstance(other, BatchResult):
+            return NotImplemented
+        return (self.expr, self.value, self.error) == (
+            other.expr,
+            other.value,
+            other.error,
+        )
+
+    def __repr__(self):
+        if self.error is not None:
+            return f'BatchResult({self.expr!r}, error={self.error!r})'
+        return f'BatchResult({self.expr!r}, {self.value!r})'
+
+
+def format_result(result):
+    """
+    Форматирует результат в строку вывода пакетного режима и протоколов.
+    Ошибки выводятся в виде 'ERROR<TAB>класс ошибки<TAB>сообщение'.
+
+    Args:
+        result (BatchResult): Результат вычисления выражения.
+
+    Returns:
+        str: Строка вывода без перевода строки.
+    """
+    if result.error is not None:
+        message = str(result.error).replace('\n', ' ')
+        return f'ERROR\t{type(result.error).__name__}\t{message}'
+    return str(result.value)
+
+
+def init_worker(options):
+    """
+    Создаёт калькулятор в процессе-исполнителе с настройками родителя.
+
+    Args:
+        options (dict): Аргументы конструктора Calculator.
+    """
+    global _worker_calculator
+    from src.calculator import Calculator
+
+    _worker_calculator = Calculator(**options)
+
+
+def evaluate_chunk(chunk, env):
+    """
+    Вычисляет часть пакета в процессе-исполнителе.
+
+    Args:
+        chunk (list): Выражения в RPN.
+        env (Mapping | None): Значения переменных.
+
+    Returns:
+        list: Результаты BatchResult в порядке выражений.
+    """
+    return list(_worker_calculator.evaluate_many(chunk, env))
+
+
+def _chunks(exprs, chunksize):
+    """Разбивает последовательность выражений на списки по chunksize."""
+    iterator = iter(exprs)
+    while chunk := list(islice(iterator, chunksize)):
+        yield chunk
+
+
+def evaluate_parallel(exprs, options, env=None, max_workers=None, chunksize=1000):
+    """
+    Вычисляет выражения в пуле процессов, возвращая результаты в исходном порядке.
+    Одновременно в работе не больше двух частей на процесс, поэтому вход
+    читается лениво и память не растёт с размером пакета.
+
+    Args:
+        exprs (Iterable[str]): Выражения в RPN.
+        options (dict): Аргументы конструктора Calculator для исполнителей.
+        env (Mapping | None): Значения переменных, общие для всех выражений.
+        max_workers (int | None): Число процессов (по умолчанию - число ядер).
+        chunksize (int): Число выражений, отправляемых процессу за раз.
+
+    Yields:
+        BatchResult: Результат вычисления очередного выражения.
+
+    Raises:
+        ValueError: Если chunksize не положительный.
+    """
+    if chunksize <= 0:
+        raise ValueError('Размер части должен быть положительным')
+
+    # Импорт здесь: concurrent.futures и multiprocessing заметно замедляют
+    # запуск программы, а нужны только для параллельного режима
+    from concurrent.futures import ProcessPoolExecutor
+
+    max_workers = max_workers or os.cpu_count() or 1
+    executor = ProcessPoolExecutor(
+        max_workers=max_workers, initializer=init_worker, initargs=(options,)
+    )
+    try:
+        max_pending = 2 * max_workers
+        pending = deque()
+        for chunk in _chunks(exprs, chunksize):
+            pending.append(executor.submit(evaluate_chunk, chunk, env))
+            if len(pending) >= max_pending:
+                yield from pending.popleft().result()
+        while pending:
+            yield from pending.popleft().result()
+    finally:
+        executor.shutdown(cancel_futures=True)
+
+
+class GroupRef:
+    """
+    Ссылка на подвыражение в скобках, вынесенное из программы для
+    вычисления в другом процессе.
+    """
+
+    __slots__ = ('index',)
+
+    def __init__(self, index):
+        """
+        Args:
+            index (int): Номер подвыражения в списке групп split_groups.
+        """
+        self.index = index
+
+    def __eq__(self, other):
+        if not isinstance(other, GroupRef):
+            return NotImplemented
+        return self.index == other.index
+
+    def __hash__(self):
+        return hash((GroupRef, self.index))
+
+    def __repr__(self):
+        return f'GroupRef({self.index})'
+
+
+def split_groups(tokens, min_size):
+    """
+    Выносит из программы подвыражения в скобках верхнего уровня длиной
+    не меньше min_size токенов. Проверка скобок (TokenParser.parse)
+    гарантирует, что каждое такое подвыражение - отдельная корректная
+    программа RPN, оставляющая на стеке одно значение.
+
+    Args:
+        tokens (list): Проверенные токены выражения.
+        min_size (int): Минимальное число токенов выносимого подвыражения.
+
+    Returns:
+        tuple: (каркас, группы) - токены, где вынесенные подвыражения
+            заменены на GroupRef, и списки токенов подвыражений без скобок.
+    """
+    skeleton = []
+    groups = []
+    depth = 0
+    start = 0
+    for index, token in enumerate(tokens):
+        if token == '(' and isinstance(token, str):
+            if depth == 0:
+                start = index
+            depth += 1
+        elif token == ')' and isinstance(token, str):
+            depth -= 1
+            if depth == 0:
+                if index - start - 1 >= min_size:
+                    skeleton.append(GroupRef(len(groups)))
+                    groups.append(tokens[start + 1 : index])
+                else:
+                    skeleton.extend(tokens[start : index + 1])
+        elif depth == 0:
+            skeleton.append(token)
+    return skeleton, groups
+
+
+def _evaluate_group(tokens, env):
+    """
+    Вычисляет подвыражение в процессе-исполнителе.
+
+    Args:
+        tokens (list): Токены подвыражения.
+        env (Mapping | None): Значения переменных.
+
+    Returns:
+        Значение подвыражения.
+    """
+    return _worker_calculator.rpn_evaluator.evaluate(tokens, env)
+
+
+def evaluate_groups(
+    skeleton, groups, evaluator, options, env=None, max_workers=None, coerce=None
+):
+    """
+    Вычисляет подвыражения в пуле процессов, а каркас - в текущем процессе,
+    подставляя значения подвыражений по мере их готовности. Каркас
+    вычисляется слева направо, поэтому при нескольких ошибках выбрасывается
+    та же, что и при последовательном вычислении.
+
+    Args:
+        skeleton (list): Каркас программы из split_groups.
+        groups (list): Подвыражения из split_groups.
+        evaluator (RPNEvaluator): Вычислитель каркаса.
+        options (dict): Аргументы конструктора Calculator для исполнителей.
+        env (Mapping | None): Значения переменных.
+        max_workers (int | None): Число процессов (по умолчанию - число ядер,
+            но не больше числа подвыражений).
+        coerce (Callable | None): Приведение значения подвыражения к числу
+            режима (исполнитель нормализует итоговое значение).
+
+    Returns:
+        Результат вычисления выражения.
+    """
+    from concurrent.futures import ProcessPoolExecutor
+
+    max_workers = min(max_workers or os.cpu_count() or 1, len(groups))
+    executor = ProcessPoolExecutor(
+        max_workers=max_workers, initializer=init_worker, initargs=(options,)
+    )
+    try:
+        futures = [executor.submit(_evaluate_group, group, env) for group in groups]
+
+        def resolved():
+            for token in skeleton:
+                if isinstance(token, GroupRef):
+                    value = futures[token.index].result()
+                    yield coerce(value) if coerce is not None else value
+                else:
+                    yield token
+
+        return evaluator.evaluate(resolved(), env)
+    finally:
+        executor.shutdown(cancel_futures=True)
@@ -0,0 +1,82 @@
+from collections import OrderedDict
+
+
+class LRUCache:
+    """
+    Ограниченный по размеру кэш с вытеснением давно не использованных записей (LRU)
+    и счётчиками попаданий и промахов.
+    """
+
+    def __init__(self, maxsize=128):
+        """
+        Args:
+            maxsize (int): Максимальное число записей в кэше.
+
+        Raises:
+            ValueError: Если размер кэша не положительный.
+        """
+        if maxsize <= 0:
+            raise ValueError('Размер кэша должен быть положительным')
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._data = OrderedDict()
+
+    def get(self, key, default=None):
+        """
+        Возвращает значение по ключу и помечает запись как недавно использованную.
+
+        Args:
+            key: Ключ.
+            default: Значение, возвращаемое при промахе.
+
+        Returns:
+            Значение из кэша или default.
+        """
+        try:
+            value = self._data[key]
+        except KeyError:
+            self.misses += 1
+            return default
+        self._data.move_to_end(key)
+        self.hits += 1
+        return value
+
+    def put(self, key, value):
+        """
+        Сохраняет значение, вытесняя самую старую запись при переполнении.
+
+        Args:
+            key: Ключ.
+            value: Значение.
+        """
+        self._data[key] = value
+        self._data.move_to_end(key)
+        if len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
+
+    def clear(self):
+        """Очищает кэш и сбрасывает счётчики."""
+        self._data.clear()
+        self.hits = 0
+        self.misses = 0
+
+    def info(self):
+        """
+        Возвращает статистику кэша.
+
+        Returns:
+            dict: Попадания, промахи, текущий и максимальный размер.
+        """
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'size': len(self._data),
+            'maxsize': self.maxsize,
+        }
+
+    def __len__(self):
+        return len(self._data)
+
+    def __contains__(self, key):
+        return key in self._data
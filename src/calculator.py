@@ -1,6 +1,28 @@
+from time import perf_counter
+
+from src.backends import EXACT, FLOAT64, get_backend, is_builtin_backend
+from src.batch import BatchResult, evaluate_groups, evaluate_parallel, split_groups
+from src.cache import LRUCache
+from src.compact import CompactProgram
+from src.compiled_expression import CompiledExpression
 from src.exceptions import CalculatorError
+from src.memo import MemoProgram, share_groups
+from src.metrics import Measurement, Metrics
+from src.optimizer import Optimizer
 from src.rpn_evaluator import RPNEvaluator
 from src.token_parser import TokenParser
+from src.variable import Variable
+
+# Минимальное число токенов подвыражения, вычисляемого в отдельном процессе
+MIN_GROUP_SIZE = 10000
+
+# Минимальный размер группы выражений с общим каркасом для векторного вычисления
+MIN_VECTOR_GROUP = 8
+
+# Маркер записи кэша, для которой результат ещё не вычислен
+_NO_RESULT = object()
+# Маркер записи кэша для выражения с переменными: результат не кэшируется
+_NOT_CONSTANT = object()
 
 
 class Calculator:
@@ -8,30 +30,722 @@ class Calculator:
     Основной класс калькулятора, обрабатывающий выражения в обратной польской записи
     """
 
-    def __init__(self):
-        self.token_parser = TokenParser()
-        self.rpn_evaluator = RPNEvaluator()
+    def __init__(
+        self,
+        cache_size=None,
+        optimize=False,
+        operators=None,
+        limits=None,
+        backend=None,
+        metrics=False,
+        slow_log=None,
+        memoize=False,
+    ):
+        """
+        Args:
+            cache_size (int | None): Размер LRU-кэша разобранных выражений и
+                результатов. None отключает кэширование.
+            optimize (bool): Оптимизировать программу после разбора
+                (свёртка констант и упрощение тождеств). Оптимизатор работает
+                с числами int и float, поэтому действует только в режимах
+                'exact' и 'float64'; в остальных режимах флаг не учитывается.
+                С limits оптимизатор тоже не применяется: свёртка констант
+                при разборе обошла бы ограничения на операции и размер целых.
+            operators (Operators | None): Реестр операторов (например, с
+                пользовательскими операторами из Operators.register).
+                По умолчанию - операторы числового режима.
+            limits (EvaluationLimits | None): Ограничения ресурсов на одно
+                вычисление (число операций, размер целых, глубина стека, время).
+            backend (str | NumericBackend | None): Числовой режим: 'exact'
+                (по умолчанию), 'float64', 'decimal' или 'fraction'.
+            metrics (bool): Собирать метрики: время этапов, число вхождений
+                операторов в успешно вычисленные программы, ошибки по классам
+                и гистограмму времени вычисления (см. stats() и metrics_text()).
+            slow_log (SlowLog | None): Журнал вычислений, которые длились
+                дольше его порога (см. SlowLog).
+            memoize (bool): Вычислять одинаковые подвыражения в скобках один
+                раз за вычисление. С optimize скобки удаляются оптимизатором,
+                а постоянные подвыражения сворачиваются, поэтому memoize
+                применяется только без optimize.
+
+        Raises:
+            ValueError: Если числовой режим неизвестен.
+        """
+        self.backend = get_backend(backend)
+        # Общие операторы для разбора и вычисления
+        if operators is None:
+            operators = self.backend.operators
+        self.token_parser = TokenParser(operators, self.backend)
+        self.rpn_evaluator = RPNEvaluator(operators, limits, self.backend)
+        self.optimizer = (
+            Optimizer(operators, self.backend.normalize_each)
+            if optimize and limits is None and self.backend in (EXACT, FLOAT64)
+            else None
+        )
+        self.cache = LRUCache(cache_size) if cache_size is not None else None
+        self.memoize = memoize
+        self.metrics = Metrics(operators) if metrics else None
+        self.slow_log = slow_log
+        # Разборщик инфиксной записи создаётся при первом использовании
+        self._infix_parser = None
+        # Настройки для создания таких же калькуляторов в других процессах
+        # (встроенные реестр и режимы передаются по имени: процесс создаёт их сам)
+        self._options = {
+            'cache_size': cache_size,
+            'optimize': optimize,
+            'operators': None if operators is self.backend.operators else operators,
+            'limits': limits,
+            'slow_log': slow_log,
+            'memoize': memoize,
+            'backend': self.backend.name
+            if is_builtin_backend(self.backend)
+            else self.backend,
+        }
 
-    def evaluate(self, expr):
+    def evaluate(self, expr, env=None):
         """
         Вычисляет значение выражения в обратной польской записи.
         Args:
              expr (str): Строка с выражением в RPN.
+             env (Mapping | None): Значения переменных выражения.
         Returns:
             float/int: Результат вычисления выражения.
         Raises:
             CalculatorError: При наличии ошибок в выражении.
         """
-        try:
-            # Токенизация выражения
-            tokens = self.token_parser.parse(expr)
+        if self.metrics is not None or self.slow_log is not None:
+            return self._evaluate_measured(expr, env)
 
-            # Вычисление результата
-            result = self.rpn_evaluator.evaluate(tokens)
-            return result
+        try:
+            return self._evaluate(expr, env)
 
         except Exception as e:
             # Преобразование всех исключений в CalculatorError
             if isinstance(e, CalculatorError):
                 raise
             raise CalculatorError(f'Ошибка при вычислении: {str(e)}') from e
+
+    def evaluate_infix(self, expr, env=None):
+        """
+        Вычисляет выражение в инфиксной записи, например '(3 + 4) * -x'.
+        Выражение преобразуется сразу в программу вычислителя по приоритетам
+        и ассоциативности операторов; преобразования кэшируются. Метрики,
+        журнал медленных выражений и memoize действуют так же, как в evaluate.
+        Args:
+             expr (str): Строка с выражением в инфиксной записи.
+             env (Mapping | None): Значения переменных выражения.
+        Returns:
+            float/int: Результат вычисления выражения.
+        Raises:
+            CalculatorError: При наличии ошибок в выражении.
+        """
+        if self.metrics is not None or self.slow_log is not None:
+            return self._evaluate_measured(expr, env, self._evaluate_infix)
+
+        try:
+            return self._evaluate_infix(expr, env)
+
+        except Exception as e:
+            if isinstance(e, CalculatorError):
+                raise
+            raise CalculatorError(f'Ошибка при вычислении: {str(e)}') from e
+
+    @property
+    def infix_parser(self):
+        """
+        Returns:
+            InfixParser: Разборщик инфиксной записи с операторами, числовым
+                режимом, оптимизатором и объединением подвыражений калькулятора.
+        """
+        if self._infix_parser is None:
+            # Импорт здесь: модуль с регулярными выражениями нужен не всем
+            from src.infix_parser import InfixParser
+
+            self._infix_parser = InfixParser(
+                self.rpn_evaluator.operators,
+                self.backend,
+                self.optimizer,
+                memoize=self.memoize,
+            )
+        return self._infix_parser
+
+    def evaluate_stream(self, stream, env=None):
+        """
+        Вычисляет выражение, читая его из файлового объекта или mmap по частям.
+        Токены подаются в стек вычислителя по мере чтения, поэтому память
+        не зависит от длины выражения. Кэш и оптимизатор в этом режиме
+        не применяются, так как им нужна вся программа целиком.
+        Args:
+             stream: Объект с методом read(size), возвращающим str или bytes.
+             env (Mapping | None): Значения переменных выражения.
+        Returns:
+            float/int: Результат вычисления выражения.
+        Raises:
+            CalculatorError: При наличии ошибок в выражении.
+        """
+        try:
+            tokens = self.token_parser.iter_stream_tokens(stream)
+            return self.rpn_evaluator.evaluate(tokens, env)
+
+        except Exception as e:
+            if isinstance(e, CalculatorError):
+                raise
+            raise CalculatorError(f'Ошибка при вычислении: {str(e)}') from e
+
+    def evaluate_many(self, exprs, env=None):
+        """
+        Лениво вычисляет последовательность выражений. Ошибки не прерывают
+        обработку: для каждого выражения возвращается значение или объект ошибки.
+        Ошибки разбора и ошибки, видные по самой программе (нехватка
+        операндов, лишние значения в стеке, переменная, которой нет в env),
+        возвращаются без выброса исключений (TokenParser.try_parse,
+        RPNEvaluator.evaluate_or_error). Исключение выбрасывается только
+        ошибками самих операторов (деление на ноль и т.п.) и ограничений.
+        С метриками или журналом медленных выражений каждое выражение
+        вычисляется как в evaluate.
+        Args:
+             exprs (Iterable[str]): Выражения в RPN.
+             env (Mapping | None): Значения переменных, общие для всех выражений.
+        Yields:
+            BatchResult: Результат вычисления очередного выражения.
+        """
+        if self.metrics is None and self.slow_log is None:
+            for expr in exprs:
+                yield self._batch_evaluate(expr, env)
+            return
+
+        for expr in exprs:
+            try:
+                value = self._evaluate_measured(expr, env)
+            except Exception as e:
+                yield _batch_error(expr, e)
+            else:
+                yield BatchResult(expr, value)
+
+    def evaluate_many_vectorized(
+        self, exprs, env=None, min_group_size=MIN_VECTOR_GROUP
+    ):
+        """
+        Вычисляет пакет выражений, группируя их по каркасу (операторы,
+        переменные и скобки без чисел): числа группы становятся столбцами,
+        и каждая группа вычисляется одним проходом NumPy. Выражения, для
+        которых векторный результат может отличаться от скалярного
+        (поэлементная ошибка, бесконечность, в режиме exact - целые больше
+        2 ** 53), а также малые группы вычисляются как в evaluate_many,
+        поэтому результаты и ошибки те же. Векторно вычисляются только
+        режимы exact и float64 без ограничений limits; кэш, оптимизатор
+        и объединение подвыражений в этом случае не применяются.
+        Args:
+             exprs (Iterable[str]): Выражения в RPN.
+             env (Mapping | None): Значения переменных, общие для всех выражений.
+             min_group_size (int): Минимальный размер группы для векторного
+                 вычисления.
+        Returns:
+            list: Результаты BatchResult в порядке выражений.
+        """
+        exprs = list(exprs)
+        results = [None] * len(exprs)
+        vectorize = (
+            self.rpn_evaluator.limits is None
+            and self.backend in (EXACT, FLOAT64)
+            and len(exprs) >= min_group_size
+        )
+        if vectorize:
+            # Импорт здесь: NumPy нужен только для векторного режима
+            from src.vectorized import evaluate_skeleton, np, split_literals
+
+            vectorize = np is not None
+
+        if not vectorize:
+            for index, expr in enumerate(exprs):
+                results[index] = self._batch_evaluate(expr, env)
+            return results
+
+        tokenize = self.token_parser.try_tokenize
+        check = self.token_parser.check
+        # Каркас -> ошибка в скобках или None: корректность скобок
+        # зависит только от каркаса
+        validated = {}
+        groups = {}
+        for index, expr in enumerate(exprs):
+            try:
+                tokens, error = tokenize(expr)
+                if error is None:
+                    skeleton, literals = split_literals(tokens)
+                    if skeleton in validated:
+                        error = validated[skeleton]
+                    else:
+                        error = validated[skeleton] = check(skeleton)
+            except Exception as e:
+                results[index] = _batch_error(expr, e)
+                continue
+            if error is not None:
+                results[index] = BatchResult(expr, error=error)
+                continue
+            groups.setdefault(skeleton, []).append((index, tokens, literals))
+
+        for skeleton, rows in groups.items():
+            values = [None] * len(rows)
+            if len(rows) >= min_group_size:
+                try:
+                    values = evaluate_skeleton(
+                        skeleton,
+                        [literals for _, _, literals in rows],
+                        self.rpn_evaluator.operators,
+                        env,
+                        self.backend is EXACT,
+                    )
+                except Exception:
+                    # Группа целиком вычисляется скалярно
+                    pass
+            for (index, tokens, _), value in zip(rows, values, strict=True):
+                expr = exprs[index]
+                if value is None:
+                    results[index] = self._batch_run(expr, tokens, env)
+                else:
+                    results[index] = BatchResult(expr, value)
+
+        return results
+
+    def _batch_run(self, expr, tokens, env):
+        """Вычисляет разобранное выражение в результат BatchResult."""
+        try:
+            value, error = self.rpn_evaluator.evaluate_or_error(tokens, env)
+        except Exception as e:
+            return _batch_error(expr, e)
+        if error is not None:
+            return _batch_error(expr, error)
+        return BatchResult(expr, value)
+
+    def _batch_evaluate(self, expr, env):
+        """
+        Вычисляет выражение в результат BatchResult так же, как evaluate
+        (с кэшем, оптимизатором и memoize), но ошибки разбора и ошибки,
+        видные по программе, возвращаются без выброса исключения.
+        """
+        try:
+            if self.cache is None:
+                tokens, error = self._try_tokenize(expr)
+                result = _NOT_CONSTANT
+            else:
+                key = self._normalize(expr)
+                entry = self.cache.get(key)
+                if entry is None:
+                    tokens, error = self._try_tokenize(key)
+                    if error is not None:
+                        return BatchResult(expr, error=error)
+                    entry = self._cache_entry(key, tokens)
+                tokens, result = entry
+                error = None
+        except Exception as e:
+            return _batch_error(expr, e)
+        if error is not None:
+            return BatchResult(expr, error=error)
+        if result is _NOT_CONSTANT:
+            return self._batch_run(expr, tokens, env)
+        if result is not _NO_RESULT:
+            return BatchResult(expr, result)
+
+        outcome = self._batch_run(expr, tokens, None)
+        if outcome.error is None:
+            self.cache.put(key, (tokens, outcome.value))
+        return outcome
+
+    def worker_options(self):
+        """
+        Возвращает настройки для создания такого же калькулятора в другом
+        процессе (см. batch.init_worker): встроенные реестр операторов
+        и числовой режим передаются по имени.
+        Returns:
+            dict: Аргументы конструктора Calculator.
+        """
+        return dict(self._options)
+
+    def evaluate_parallel(self, exprs, env=None, max_workers=None, chunksize=1000):
+        """
+        Вычисляет большой пакет выражений в пуле процессов. Результаты
+        возвращаются в исходном порядке, ошибки - как значения.
+        Args:
+             exprs (Iterable[str]): Выражения в RPN.
+             env (Mapping | None): Значения переменных, общие для всех выражений.
+             max_workers (int | None): Число процессов (по умолчанию - число ядер).
+             chunksize (int): Число выражений, отправляемых процессу за раз.
+        Yields:
+            BatchResult: Результат вычисления очередного выражения.
+        """
+        return evaluate_parallel(exprs, self._options, env, max_workers, chunksize)
+
+    def evaluate_grouped(
+        self, expr, env=None, max_workers=None, min_group_size=MIN_GROUP_SIZE
+    ):
+        """
+        Вычисляет одно большое выражение, распределяя подвыражения в скобках
+        верхнего уровня по пулу процессов; их значения подставляются
+        в оставшуюся программу. Имеет смысл для выражений из многих больших
+        независимых групп: запуск пула стоит десятки миллисекунд. Если больших
+        групп меньше двух, выражение вычисляется как в evaluate. Ограничения
+        limits действуют на каждое подвыражение и остаток программы отдельно.
+        Args:
+             expr (str): Строка с выражением в RPN.
+             env (Mapping | None): Значения переменных выражения.
+             max_workers (int | None): Число процессов (по умолчанию - число ядер).
+             min_group_size (int): Минимальное число токенов подвыражения,
+                 вычисляемого в отдельном процессе.
+        Returns:
+            float/int: Результат вычисления выражения.
+        Raises:
+            CalculatorError: При наличии ошибок в выражении; при нескольких
+                ошибках - та же, что и у evaluate.
+        """
+        try:
+            tokens = self._parse(expr)
+            skeleton, groups = split_groups(tokens, min_group_size)
+            if len(groups) < 2:
+                return self.rpn_evaluator.evaluate(tokens, env)
+            return evaluate_groups(
+                skeleton,
+                groups,
+                self.rpn_evaluator,
+                self._options,
+                env,
+                max_workers,
+                self.backend.coerce,
+            )
+
+        except Exception as e:
+            if isinstance(e, CalculatorError):
+                raise
+            raise CalculatorError(f'Ошибка при вычислении: {str(e)}') from e
+
+    def evaluate_vectorized(self, expr, env):
+        """
+        Вычисляет выражение для массивов значений переменных за один проход.
+        Args:
+             expr (str): Строка с выражением в RPN.
+             env (Mapping): Значения переменных - числа или массивы NumPy.
+        Returns:
+            numpy.ndarray: Результат вычисления для каждого элемента.
+        Raises:
+            CalculatorError: При наличии ошибок в выражении. Для поэлементных
+                ошибок атрибут indices содержит номера неудачных элементов.
+        """
+        try:
+            tokens = self._parse(expr)
+            return self.rpn_evaluator.evaluate_vectorized(tokens, env)
+
+        except Exception as e:
+            if isinstance(e, CalculatorError):
+                raise
+            raise CalculatorError(f'Ошибка при вычислении: {str(e)}') from e
+
+    def compile(self, expr):
+        """
+        Разбирает и проверяет выражение один раз, возвращая объект,
+        который можно многократно вычислять без повторного разбора.
+        Args:
+             expr (str): Строка с выражением в RPN.
+        Returns:
+            CompiledExpression: Скомпилированное выражение.
+        Raises:
+            CalculatorError: При наличии ошибок в выражении.
+        """
+        try:
+            tokens = self._parse(expr)
+            return CompiledExpression(
+                tokens,
+                self.rpn_evaluator.operators,
+                self.rpn_evaluator.limits,
+                self.backend,
+            )
+
+        except Exception as e:
+            if isinstance(e, CalculatorError):
+                raise
+            raise CalculatorError(f'Ошибка при компиляции: {str(e)}') from e
+
+    def encode(self, expr):
+        """
+        Разбирает выражение в компактную программу на массивах.
+        Args:
+             expr (str): Строка с выражением в RPN.
+        Returns:
+            CompactProgram: Закодированная программа.
+        Raises:
+            CalculatorError: При наличии ошибок в выражении.
+        """
+        try:
+            tokens = self._parse(expr)
+            return CompactProgram.from_tokens(tokens, self.rpn_evaluator.operators)
+
+        except Exception as e:
+            if isinstance(e, CalculatorError):
+                raise
+            raise CalculatorError(f'Ошибка при компиляции: {str(e)}') from e
+
+    def evaluate_compact(self, program, env=None):
+        """
+        Вычисляет компактную программу, полученную из encode().
+        Args:
+             program (CompactProgram): Закодированная программа.
+             env (Mapping | None): Значения переменных выражения.
+        Returns:
+            float/int: Результат вычисления выражения.
+        Raises:
+            CalculatorError: При наличии ошибок в выражении.
+        """
+        try:
+            return self.rpn_evaluator.evaluate_compact(program, env)
+
+        except Exception as e:
+            if isinstance(e, CalculatorError):
+                raise
+            raise CalculatorError(f'Ошибка при вычислении: {str(e)}') from e
+
+    def cache_info(self):
+        """
+        Возвращает статистику кэша.
+        Returns:
+            dict | None: Попадания, промахи и размер кэша или None, если кэш отключён.
+        """
+        return self.cache.info() if self.cache is not None else None
+
+    def cache_clear(self):
+        """Очищает кэш выражений."""
+        if self.cache is not None:
+            self.cache.clear()
+
+    def stats(self):
+        """
+        Возвращает снимок метрик.
+        Returns:
+            dict | None: Время этапов, счётчики операторов и ошибок и
+                гистограмма времени вычисления или None, если метрики отключены.
+        """
+        return self.metrics.snapshot() if self.metrics is not None else None
+
+    def metrics_text(self):
+        """
+        Возвращает метрики в текстовом формате Prometheus.
+        Returns:
+            str | None: Текст метрик или None, если метрики отключены.
+        """
+        return self.metrics.to_prometheus() if self.metrics is not None else None
+
+    def _tokenize(self, expr, measurement=None):
+        """
+        Разбирает выражение на токены и, если включено, оптимизирует программу
+        или объединяет одинаковые подвыражения. С measurement записывает время
+        токенизации, проверки скобок и оптимизации по отдельности.
+        """
+        if measurement is not None:
+            return self._tokenize_measured(expr, measurement)
+
+        return self._prepare(self.token_parser.parse(expr))
+
+    def _try_tokenize(self, expr):
+        """
+        То же, что _tokenize без замера, но ошибка разбора возвращается,
+        а не выбрасывается.
+        Returns:
+            tuple: (токены, None) или (None, ParserError).
+        """
+        tokens, error = self.token_parser.try_parse(expr)
+        if error is not None:
+            return None, error
+        return self._prepare(tokens), None
+
+    def _prepare(self, tokens):
+        """
+        Оптимизирует проверенную программу или, если включено, объединяет
+        одинаковые подвыражения.
+        """
+        if self.optimizer is not None:
+            return self.optimizer.optimize(tokens)
+        if self.memoize:
+            return share_groups(tokens)
+        return tokens
+
+    def _tokenize_measured(self, expr, measurement):
+        """
+        То же, что _tokenize, но с замером времени каждого этапа.
+        """
+        stages = measurement.stages
+        start = perf_counter()
+        tokens = self.token_parser.tokenize(expr)
+        tokenized = perf_counter()
+        stages['tokenize'] = tokenized - start
+
+        self.token_parser.validate(tokens)
+        validated = perf_counter()
+        stages['validate'] = validated - tokenized
+
+        if self.optimizer is not None:
+            tokens = self.optimizer.optimize(tokens)
+            stages['optimize'] = perf_counter() - validated
+        elif self.memoize:
+            tokens = share_groups(tokens)
+            stages['memoize'] = perf_counter() - validated
+        return tokens
+
+    def _run(self, tokens, env=None, measurement=None):
+        """
+        Вычисляет разобранную программу, с measurement - с замером времени.
+        """
+        if measurement is None:
+            return self.rpn_evaluator.evaluate(tokens, env)
+
+        measurement.tokens = _source(tokens)
+        start = perf_counter()
+        try:
+            return self.rpn_evaluator.evaluate(tokens, env)
+        finally:
+            measurement.stages['evaluate'] = perf_counter() - start
+
+    def _evaluate_measured(self, expr, env, evaluate=None):
+        """
+        Вычисляет выражение с замером этапов и передаёт результат замера
+        в метрики и журнал медленных выражений.
+        Args:
+             expr (str): Выражение.
+             env (Mapping | None): Значения переменных выражения.
+             evaluate (Callable | None): Вычисление (expr, env, measurement);
+                 по умолчанию - выражения в RPN.
+        Raises:
+            CalculatorError: При наличии ошибок в выражении.
+        """
+        if evaluate is None:
+            evaluate = self._evaluate
+        measurement = Measurement()
+        profiler = self.slow_log.profiler() if self.slow_log is not None else None
+        error = None
+        start = perf_counter()
+        try:
+            if profiler is None:
+                return evaluate(expr, env, measurement)
+            profiler.enable()
+            try:
+                return evaluate(expr, env, measurement)
+            finally:
+                profiler.disable()
+
+        except Exception as e:
+            error = e
+            if not isinstance(e, CalculatorError):
+                error = CalculatorError(f'Ошибка при вычислении: {str(e)}')
+            if error is e:
+                raise
+            raise error from e
+        finally:
+            measurement.seconds = perf_counter() - start
+            measurement.error = error
+            if self.metrics is not None:
+                self.metrics.observe(measurement)
+            if self.slow_log is not None:
+                self.slow_log.observe(
+                    expr, measurement, self.rpn_evaluator.operators, profiler
+                )
+
+    def _parse(self, expr):
+        """
+        Разбирает выражение на токены, используя кэш, если он включён.
+        """
+        if self.cache is not None:
+            tokens, _ = self._lookup(self._normalize(expr))
+            return _source(tokens)
+        return _source(self._tokenize(expr))
+
+    def _evaluate(self, expr, env, measurement=None):
+        """
+        Вычисляет выражение без преобразования исключений в CalculatorError.
+        """
+        if self.cache is not None:
+            return self._evaluate_cached(expr, env, measurement)
+
+        # Токенизация выражения
+        tokens = self._tokenize(expr, measurement)
+
+        # Вычисление результата
+        return self._run(tokens, env, measurement)
+
+    def _evaluate_infix(self, expr, env, measurement=None):
+        """
+        Вычисляет выражение в инфиксной записи без преобразования исключений
+        в CalculatorError. С measurement записывает время перевода в программу
+        (этап infix, с оптимизацией или объединением подвыражений) и вычисления.
+        """
+        if measurement is None:
+            return self.rpn_evaluator.evaluate(self.infix_parser.parse(expr), env)
+
+        start = perf_counter()
+        tokens = self.infix_parser.parse(expr)
+        measurement.stages['infix'] = perf_counter() - start
+        return self._run(tokens, env, measurement)
+
+    @staticmethod
+    def _normalize(expr):
+        """
+        Приводит выражение к каноническому виду (токены через один пробел),
+        чтобы одинаковые выражения с разными пробелами делили запись кэша.
+        """
+        return ' '.join(expr.split()) if expr else expr
+
+    def _lookup(self, key, measurement=None):
+        """
+        Возвращает токены и, если он уже известен, результат выражения из кэша.
+        При промахе разбирает выражение и сохраняет токены.
+        Args:
+            key (str): Нормализованное выражение.
+            measurement (Measurement | None): Замер этапов разбора.
+        Returns:
+            tuple: (токены, результат либо маркер _NO_RESULT/_NOT_CONSTANT).
+        """
+        entry = self.cache.get(key)
+        if entry is None:
+            entry = self._cache_entry(key, self._tokenize(key, measurement))
+        return entry
+
+    def _cache_entry(self, key, tokens):
+        """
+        Сохраняет в кэш разобранное выражение и возвращает запись.
+        Returns:
+            tuple: (токены, _NO_RESULT или _NOT_CONSTANT).
+        """
+        constant = not any(isinstance(token, Variable) for token in _source(tokens))
+        entry = (tokens, _NO_RESULT if constant else _NOT_CONSTANT)
+        self.cache.put(key, entry)
+        return entry
+
+    def _evaluate_cached(self, expr, env, measurement=None):
+        """
+        Вычисляет выражение с использованием кэша токенов и результатов.
+        Результат кэшируется только для выражений без переменных.
+        """
+        key = self._normalize(expr)
+        tokens, result = self._lookup(key, measurement)
+        if result is _NOT_CONSTANT:
+            return self._run(tokens, env, measurement)
+        if result is not _NO_RESULT:
+            return result
+
+        result = self._run(tokens, measurement=measurement)
+        self.cache.put(key, (tokens, result))
+        return result
+
+
+def _batch_error(expr, error):
+    """
+    Возвращает результат BatchResult с ошибкой, приведённой к CalculatorError.
+    Общий для evaluate_many и evaluate_many_vectorized.
+    """
+    if isinstance(error, CalculatorError):
+        # Ошибка хранится в результате: без трассировки она не держит
+        # в памяти кадры стека до конца обработки пакета
+        error.__traceback__ = None
+    else:
+        error = CalculatorError(f'Ошибка при вычислении: {str(error)}')
+    return BatchResult(expr, error=error)
+
+
+def _source(tokens):
+    """Возвращает исходные токены программы с общими подвыражениями."""
+    return tokens.source if tokens.__class__ is MemoProgram else tokens
@@ -0,0 +1,177 @@
+from array import array
+
+from src.exceptions import EvaluationError
+from src.variable import Variable
+
+# Коды операций компактной программы. Коды от OP_BASE и выше обозначают
+# операторы: OP_BASE + i соответствует symbols[i] программы.
+OP_INT = 0  # целое из массива ints
+OP_FLOAT = 1  # вещественное из массива floats
+OP_OBJECT = 2  # значение из списка objects (большие целые, Decimal, Fraction)
+OP_VARIABLE = 3  # переменная с именем из списка names
+OP_BASE = 4
+
+# Максимальное число различных операторов в одной программе
+MAX_SYMBOLS = 256 - OP_BASE
+
+_INT64_MIN = -(1 << 63)
+_INT64_MAX = (1 << 63) - 1
+
+
+class CompactProgram:
+    """
+    Компактное представление программы RPN на массивах вместо списка объектов:
+    коды операций - по байту на токен, целые - в массиве int64, вещественные -
+    в массиве float64. Операнды каждого вида хранятся в порядке использования,
+    поэтому коды операций не содержат индексов.
+    """
+
+    def __init__(self, code, ints, floats, objects, names, symbols):
+        """
+        Args:
+            code (Sequence[int]): Коды операций (array('B') или memoryview).
+            ints (Sequence[int]): Целые операнды (array('q') или memoryview).
+            floats (Sequence[float]): Вещественные операнды (array('d')).
+            objects (list): Операнды, не помещающиеся в массивы.
+            names (list): Имена переменных.
+            symbols (tuple): Операторы программы.
+        """
+        self.code = code
+        self.ints = ints
+        self.floats = floats
+        self.objects = objects
+        self.names = names
+        self.symbols = symbols
+
+    @classmethod
+    def from_tokens(cls, tokens, operators):
+        """
+        Кодирует проверенный список токенов. Скобки отбрасываются.
+
+        Args:
+            tokens (Iterable): Токены (результат TokenParser.parse).
+            operators (Operators): Операторы для проверки программы.
+
+        Returns:
+            CompactProgram: Закодированная программа.
+
+        Raises:
+            EvaluationError: Если выражение некорректно по числу операндов
+                или содержит слишком много различных операторов.
+        """
+        code = array('B')
+        ints = array('q')
+        floats = array('d')
+        objects = []
+        names = []
+        opcodes = {}
+
+        for token in tokens:
+            if isinstance(token, int):
+                if _INT64_MIN <= token <= _INT64_MAX:
+                    code.append(OP_INT)
+                    ints.append(token)
+                else:
+                    code.append(OP_OBJECT)
+                    objects.append(token)
+            elif isinstance(token, float):
+                code.append(OP_FLOAT)
+                floats.append(token)
+            elif isinstance(token, Variable):
+                code.append(OP_VARIABLE)
+                names.append(token.name)
+            elif not isinstance(token, str):
+                # Числа других типов (Decimal, Fraction)
+                code.append(OP_OBJECT)
+                objects.append(token)
+            elif token == '(' or token == ')':
+                continue
+            else:
+                opcode = opcodes.get(token)
+                if opcode is None:
+                    if len(opcodes) >= MAX_SYMBOLS:
+                        raise EvaluationError('Слишком много различных операторов')
+                    opcode = opcodes[token] = OP_BASE + len(opcodes)
+                code.append(opcode)
+
+        program = cls(code, ints, floats, objects, names, tuple(opcodes))
+        program.validate(operators)
+        return program
+
+    def validate(self, operators):
+        """
+        Проверяет, что все операторы известны, операндов хватает каждому
+        оператору и в конце на стеке остаётся одно значение.
+
+        Args:
+            operators (Operators): Операторы.
+
+        Raises:
+            EvaluationError: Если программа некорректна.
+        """
+        supported_operators = operators.get_operators()
+        arities = [0] * OP_BASE
+        for symbol in self.symbols:
+            if symbol not in supported_operators:
+                raise EvaluationError(f'Неизвестный оператор: {symbol}')
+            arities.append(operators.get_operator_info(symbol).arity)
+
+        counts = [0] * OP_BASE
+        stack_size = 0
+        for opcode in self.code:
+            if opcode >= len(arities):
+                raise EvaluationError(f'Неизвестный код операции: {opcode}')
+            if opcode < OP_BASE:
+                counts[opcode] += 1
+                stack_size += 1
+                continue
+            arity = arities[opcode]
+            if stack_size < arity:
+                raise EvaluationError('Недостаточно операндов для оператора')
+            stack_size = stack_size - arity + 1
+
+        if stack_size != 1:
+            raise EvaluationError(
+                f'Некорректное выражение: в стеке осталось {stack_size} элементов'
+            )
+        operand_counts = [len(self.ints), len(self.floats), len(self.objects)]
+        if counts != operand_counts + [len(self.names)]:
+            raise EvaluationError('Число операндов не совпадает с кодом программы')
+
+    def to_tokens(self):
+        """
+        Восстанавливает список токенов (без скобок).
+
+        Returns:
+            list: Токены программы.
+        """
+        ints = iter(self.ints)
+        floats = iter(self.floats)
+        objects = iter(self.objects)
+        names = iter(self.names)
+        tokens = []
+        for opcode in self.code:
+            if opcode == OP_INT:
+                tokens.append(next(ints))
+            elif opcode == OP_FLOAT:
+                tokens.append(next(floats))
+            elif opcode == OP_OBJECT:
+                tokens.append(next(objects))
+            elif opcode == OP_VARIABLE:
+                tokens.append(Variable(next(names)))
+            else:
+                tokens.append(self.symbols[opcode - OP_BASE])
+        return tokens
+
+    @property
+    def nbytes(self):
+        """int: Размер массивов программы в байтах (без списков objects и names)."""
+        return sum(
+            len(part) * part.itemsize for part in (self.code, self.ints, self.floats)
+        )
+
+    def __len__(self):
+        return len(self.code)
+
+    def __repr__(self):
+        return f'CompactProgram({len(self.code)} операций, {self.nbytes} байт)'
@@ -0,0 +1,161 @@
+from src.exceptions import CalculatorError, EvaluationError
+from src.limits import evaluate_limited
+from src.variable import Variable
+
+# arity инструкции, которая кладёт на стек значение переменной
+_VARIABLE = -1
+
+
+class CompiledExpression:
+    """
+    Скомпилированное выражение в обратной польской нотации.
+    Разбор, проверка и поиск операторов выполняются один раз при создании,
+    а метод run() только прогоняет готовую программу на стеке.
+    Переменные связываются со значениями при каждом запуске.
+    """
+
+    def __init__(self, tokens, operators, limits=None, backend=None):
+        """
+        Args:
+            tokens (list): Проверенный список токенов (результат TokenParser.parse).
+            operators (Operators): Операторы, которыми разрешаются токены.
+            limits (EvaluationLimits | None): Ограничения ресурсов на запуск.
+            backend (NumericBackend | None): Числовой режим; None - exact.
+
+        Raises:
+            EvaluationError: Если выражение некорректно по числу операндов.
+        """
+        self.tokens = [token for token in tokens if token not in ('(', ')')]
+        self._program = self._build_program(self.tokens, operators)
+        self._limits = limits
+        # Режим без приведения к int после каждой операции
+        self._backend = (
+            backend if backend is not None and not backend.normalize_each else None
+        )
+        if limits is not None:
+            self._dispatch = {
+                symbol: (spec.arity, spec.func)
+                for symbol, spec in operators.operators.items()
+            }
+        self.variables = frozenset(
+            token.name for token in self.tokens if isinstance(token, Variable)
+        )
+
+    @staticmethod
+    def _build_program(tokens, operators):
+        """
+        Превращает токены в список инструкций (arity, операнд или функция, токен)
+        и заранее проверяет, что стек не опустеет и в конце останется одно значение.
+
+        Args:
+            tokens (list): Список токенов без скобок.
+            operators (Operators): Операторы.
+
+        Returns:
+            list: Список инструкций.
+
+        Raises:
+            EvaluationError: При нехватке или избытке операндов.
+        """
+        supported_operators = operators.get_operators()
+        program = []
+        stack_size = 0
+
+        for token in tokens:
+            if isinstance(token, Variable):
+                program.append((_VARIABLE, token, token))
+                stack_size += 1
+                continue
+
+            if not isinstance(token, str):
+                # Число (в числовых режимах - Decimal, Fraction и т.п.)
+                program.append((0, token, token))
+                stack_size += 1
+                continue
+
+            if token not in supported_operators:
+                raise EvaluationError(f'Неизвестный оператор: {token}')
+
+            spec = operators.get_operator_info(token)
+            arity = spec.arity
+            if stack_size < arity:
+                raise EvaluationError('Недостаточно операндов для оператора')
+            stack_size = stack_size - arity + 1
+            program.append((arity, spec.func, token))
+
+        if stack_size != 1:
+            raise EvaluationError(
+                f'Некорректное выражение: в стеке осталось {stack_size} элементов'
+            )
+
+        return program
+
+    def run(self, env=None):
+        """
+        Вычисляет скомпилированное выражение.
+
+        Args:
+            env (Mapping | None): Значения переменных выражения.
+
+        Returns:
+            float или int: Результат вычисления выражения.
+
+        Raises:
+            EvaluationError: При ошибке вычисления выражения.
+            DivisionByZeroError: При попытке деления на ноль.
+            InvalidOperandTypeError: При неподходящем типе операндов.
+            UndefinedVariableError: Если значение переменной не задано.
+            ResourceLimitError: При превышении ограничений limits.
+        """
+        if self._limits is not None:
+            return evaluate_limited(
+                self.tokens, self._dispatch, self._limits, env, self._backend
+            )
+
+        backend = self._backend
+        normalize = backend is None
+        coerce = backend.coerce if backend is not None else None
+        stack = []
+        push = stack.append
+        pop = stack.pop
+        token = None
+
+        try:
+            # token нужен только для сообщения об ошибке в except
+            for arity, payload, token in self._program:  # noqa: B007
+                if arity == 0:
+                    push(payload)
+                    continue
+
+                if arity == _VARIABLE:
+                    value = payload.resolve(env)
+                    push(coerce(value) if coerce is not None else value)
+                    continue
+
+                if arity == 1:
+                    result = payload(pop())
+                elif arity == 2:
+                    b = pop()
+                    result = payload(pop(), b)
+                else:
+                    operands = stack[-arity:]
+                    del stack[-arity:]
+                    result = payload(*operands)
+
+                # Преобразовываем в int, если возможно
+                if normalize and isinstance(result, float) and result.is_integer():
+                    result = int(result)
+                push(result)
+        except CalculatorError:
+            raise
+        except Exception as e:
+            raise EvaluationError(
+                f"Ошибка при выполнении оператора '{token}': {e}"
+            ) from e
+
+        if backend is not None and backend.finalize is not None:
+            return backend.finalize(stack[0])
+        return stack[0]
+
+    def __repr__(self):
+        return f'CompiledExpression({" ".join(map(str, self.tokens))!r})'
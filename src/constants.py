@@ -4,3 +4,11 @@ HELP_TEXT = """
 Пример ввода: 3 4 2 * + (через пробелы)
 Для выхода введите 'q'
 """
+
+SESSION_HELP_TEXT = """
+Сеанс RPN с постоянным стеком: каждая строка продолжает вычисление
+Пример: 3 4 (стек: 3 4), затем + (стек: 7), затем dup * (стек: 49)
+Команды: dup (копия вершины), drop (снять вершину), swap (обменять две
+верхние), clear (очистить стек), stack (показать стек)
+Для выхода введите 'q'
+"""
@@ -0,0 +1,97 @@
+from decimal import Decimal, InvalidOperation
+
+from src.backends import (
+    NumericBackend,
+    check_divisor,
+    check_number_syntax,
+    make_operators,
+)
+from src.exceptions import (
+    DivisionByZeroError,
+    EvaluationError,
+    InvalidOperandTypeError,
+)
+
+
+def _parse_decimal(part):
+    """Разбирает число как Decimal без двоичного округления."""
+    check_number_syntax(part)
+    return Decimal(part)
+
+
+def _coerce_decimal(value):
+    """Приводит значение переменной к Decimal (float - по его записи)."""
+    if isinstance(value, float):
+        return Decimal(repr(value))
+    return Decimal(value)
+
+
+def _decimal_integers(a, b, symbol):
+    """
+    Возвращает операнды как int.
+
+    Raises:
+        InvalidOperandTypeError: Если операнды не целые по значению.
+    """
+    if not (
+        a.is_finite()
+        and b.is_finite()
+        and a == a.to_integral_value()
+        and b == b.to_integral_value()
+    ):
+        raise InvalidOperandTypeError(
+            f"Операнды должны быть целыми числами для операции '{symbol}'"
+        )
+    return int(a), int(b)
+
+
+def _decimal_division(a, b):
+    check_divisor(b, 'Деление на ноль')
+    return a / b
+
+
+def _decimal_integer_division(a, b):
+    a, b = _decimal_integers(a, b, '//')
+    check_divisor(b, 'Целочисленное деление на ноль')
+    # Округление вниз, как у int, а не к нулю, как у Decimal
+    return Decimal(a // b)
+
+
+def _decimal_power(a, b):
+    """
+    Raises:
+        DivisionByZeroError: Если ноль возводится в отрицательную степень
+            (Decimal вернул бы бесконечность, как другие режимы - нет).
+        EvaluationError: Если степень не определена в Decimal (например,
+            отрицательное основание и дробный показатель).
+    """
+    if a == 0:
+        if b < 0:
+            raise DivisionByZeroError('Деление на ноль')
+        if b == 0:
+            # Как в режимах exact и fraction; Decimal считает 0 ^ 0 неопределённым
+            return Decimal(1)
+    try:
+        return a**b
+    except InvalidOperation:
+        raise EvaluationError(f'Степень не определена: {a} ^ {b}') from None
+
+
+def _decimal_modulo(a, b):
+    a, b = _decimal_integers(a, b, '%')
+    check_divisor(b, 'Остаток от деления на ноль')
+    return Decimal(a % b)
+
+
+# Режим decimal: десятичная арифметика в текущем контексте модуля decimal
+DECIMAL = NumericBackend(
+    'decimal',
+    make_operators(
+        _decimal_division,
+        _decimal_integer_division,
+        _decimal_modulo,
+        _decimal_power,
+    ),
+    parse_number=_parse_decimal,
+    coerce=_coerce_decimal,
+)
@@ -10,12 +10,26 @@ class ParserError(CalculatorError):
     pass
 
 
-class EvaluationError(CalculatorError):
-    """Ошибка при вычислении выражения."""
+class LibraryError(CalculatorError):
+    """Ошибка формата или целостности файла библиотеки выражений."""
 
     pass
 
 
+class EvaluationError(CalculatorError):
+    """
+    Ошибка при вычислении выражения.
+
+    Attributes:
+        indices (list | None): Номера элементов массива, на которых возникла
+            ошибка при векторном вычислении; None для скалярных вычислений.
+    """
+
+    def __init__(self, *args, indices=None):
+        super().__init__(*args)
+        self.indices = indices
+
+
 class DivisionByZeroError(EvaluationError):
     """Ошибка деления на ноль."""
 
@@ -26,3 +40,15 @@ class InvalidOperandTypeError(EvaluationError):
     """Ошибка неверного типа операнда."""
 
     pass
+
+
+class UndefinedVariableError(EvaluationError):
+    """Ошибка обращения к переменной, для которой не задано значение."""
+
+    pass
+
+
+class ResourceLimitError(EvaluationError):
+    """Ошибка превышения ограничения ресурсов на вычисление (EvaluationLimits)."""
+
+    pass
@@ -0,0 +1,82 @@
+from fractions import Fraction
+
+from src.backends import (
+    NumericBackend,
+    check_divisor,
+    check_number_syntax,
+    make_operators,
+)
+from src.exceptions import DivisionByZeroError, InvalidOperandTypeError
+
+
+def _parse_fraction(part):
+    """Разбирает число как Fraction без двоичного округления."""
+    check_number_syntax(part)
+    return Fraction(part)
+
+
+def _coerce_fraction(value):
+    """Приводит значение переменной к Fraction (float - по его записи)."""
+    if isinstance(value, float):
+        return Fraction(repr(value))
+    return Fraction(value)
+
+
+def _fraction_integers(a, b, symbol):
+    """
+    Возвращает операнды как int.
+
+    Raises:
+        InvalidOperandTypeError: Если операнды не целые.
+    """
+    if a.denominator != 1 or b.denominator != 1:
+        raise InvalidOperandTypeError(
+            f"Операнды должны быть целыми числами для операции '{symbol}'"
+        )
+    return a.numerator, b.numerator
+
+
+def _fraction_division(a, b):
+    check_divisor(b, 'Деление на ноль')
+    return a / b
+
+
+def _fraction_integer_division(a, b):
+    a, b = _fraction_integers(a, b, '//')
+    check_divisor(b, 'Целочисленное деление на ноль')
+    return Fraction(a // b)
+
+
+def _fraction_modulo(a, b):
+    a, b = _fraction_integers(a, b, '%')
+    check_divisor(b, 'Остаток от деления на ноль')
+    return Fraction(a % b)
+
+
+def _fraction_power(a, b):
+    """
+    Raises:
+        InvalidOperandTypeError: Если показатель не целый (результат
+            был бы неточным).
+    """
+    if b.denominator != 1:
+        raise InvalidOperandTypeError(
+            "Показатель степени должен быть целым для операции '^'"
+        )
+    if a == 0 and b < 0:
+        raise DivisionByZeroError('Деление на ноль')
+    return a**b.numerator
+
+
+# Режим fraction: точные рациональные числа
+FRACTION = NumericBackend(
+    'fraction',
+    make_operators(
+        _fraction_division,
+        _fraction_integer_division,
+        _fraction_modulo,
+        _fraction_power,
+    ),
+    parse_number=_parse_fraction,
+    coerce=_coerce_fraction,
+)
@@ -0,0 +1,261 @@
+import re
+
+from src.cache import LRUCache
+from src.exceptions import ParserError
+from src.memo import share_groups
+from src.operators import DEFAULT_OPERATORS
+from src.variable import Variable
+
+# Число запомненных преобразований выражений
+DEFAULT_CACHE_SIZE = 256
+# Унарные операторы, которыми записываются знаки '-' и '+' перед операндом
+PREFIX_SIGNS = {'-': '~', '+': '@'}
+
+_NUMBER = r'\d+\.\d*|\.\d+|\d+'
+_NAME = r'[^\W\d]\w*'
+# Маркер открывающей скобки на стеке операторов
+_PAREN = object()
+
+
+class InfixParser:
+    """
+    Преобразует выражение в инфиксной записи сразу в программу для
+    вычислителя RPN (алгоритм сортировочной станции) по приоритетам и
+    ассоциативности из реестра операторов.
+
+    Бинарные операторы записываются между операндами, унарные - перед
+    операндом ('-' и '+' перед операндом означают '~' и '@'), операторы-имена
+    (например, зарегистрированные min или clamp) - как вызов функции:
+    min(a, b). Приоритеты берутся из реестра, но, как в математике и
+    Python, префиксный оператор связывает слабее правоассоциативного
+    бинарного справа от операнда: -2 ^ 2 равно -(2 ^ 2) = -4, а -2 * 3 -
+    (-2) * 3.
+    """
+
+    def __init__(
+        self,
+        operators=None,
+        backend=None,
+        optimizer=None,
+        cache_size=DEFAULT_CACHE_SIZE,
+        memoize=False,
+    ):
+        """
+        Args:
+            operators (Operators | None): Операторы; по умолчанию - общий
+                реестр встроенных операторов.
+            backend (NumericBackend | None): Числовой режим, задающий тип
+                чисел; None - int и float с приведением целых к int.
+            optimizer (Optimizer | None): Оптимизатор, применяемый к программе
+                до сохранения в кэш.
+            cache_size (int | None): Размер LRU-кэша преобразований;
+                None отключает кэширование.
+            memoize (bool): Оставлять в программе скобки подвыражений и
+                объединять одинаковые (см. share_groups). С оптимизатором
+                не применяется.
+        """
+        self.operators = operators if operators is not None else DEFAULT_OPERATORS
+        self.optimizer = optimizer
+        self.memoize = memoize and optimizer is None
+        self.cache = LRUCache(cache_size) if cache_size is not None else None
+        self._parse_number = backend.parse_number if backend is not None else None
+        self._specs = self.operators.operators
+        # Символьные операторы: более длинные проверяются первыми ('//' до '/')
+        symbols = sorted(
+            (symbol for symbol in self._specs if not symbol.isidentifier()),
+            key=len,
+            reverse=True,
+        )
+        alternatives = [_NUMBER, _NAME, r'[(),]']
+        alternatives.extend(re.escape(symbol) for symbol in symbols)
+        self._lexeme = re.compile(r'\s*(?:(' + '|'.join(alternatives) + r'))')
+
+    def parse(self, expr):
+        """
+        Преобразует инфиксное выражение в программу RPN.
+
+        Args:
+            expr (str): Выражение в инфиксной записи.
+
+        Returns:
+            list | MemoProgram: Токены программы (числа, переменные и
+                операторы) в порядке вычисления, без скобок, или с memoize -
+                программа с общими подвыражениями. Программа из кэша общая -
+                не изменяйте её.
+
+        Raises:
+            ParserError: При синтаксической ошибке.
+        """
+        if self.cache is None:
+            return self._convert(expr)
+
+        tokens = self.cache.get(expr)
+        if tokens is None:
+            tokens = self._convert(expr)
+            self.cache.put(expr, tokens)
+        return tokens
+
+    def _convert(self, expr):
+        """
+        Преобразует выражение без кэша и применяет оптимизатор или
+        объединение подвыражений.
+        """
+        tokens = self._shunting_yard(self._lex(expr))
+        if self.optimizer is not None:
+            tokens = self.optimizer.optimize(tokens)
+        elif self.memoize:
+            tokens = share_groups(tokens)
+        return tokens
+
+    def _lex(self, expr):
+        """
+        Разбивает выражение на лексемы.
+
+        Raises:
+            ParserError: При пустом выражении или неизвестном символе.
+        """
+        if not expr or expr.isspace():
+            raise ParserError('Пустое выражение')
+
+        lexemes = []
+        match = self._lexeme.match
+        position = 0
+        end = len(expr.rstrip())
+        while position < end:
+            found = match(expr, position)
+            if found is None:
+                part = expr[position:].split(maxsplit=1)[0]
+                raise ParserError(f'Неизвестный токен: {part}')
+            lexemes.append(found.group(1))
+            position = found.end()
+        return lexemes
+
+    def _shunting_yard(self, lexemes):
+        """
+        Строит программу RPN по лексемам.
+
+        Стек операторов хранит символы операторов, а для скобок - маркер
+        _PAREN; для скобок вызова функции отдельно хранится счётчик
+        аргументов. С memoize скобки подвыражений переносятся в программу.
+
+        Raises:
+            ParserError: При синтаксической ошибке.
+        """
+        specs = self._specs
+        groups = self.memoize
+        output = []
+        stack = []
+        # Для каждой открытой скобки: [имя функции или None, число аргументов]
+        calls = []
+        expect_operand = True
+        index = 0
+        count = len(lexemes)
+
+        while index < count:
+            lexeme = lexemes[index]
+            index += 1
+
+            if expect_operand:
+                if lexeme == '(':
+                    stack.append(_PAREN)
+                    calls.append([None, 1])
+                    if groups:
+                        output.append('(')
+                    continue
+                spec = specs.get(lexeme)
+                if spec is not None and lexeme.isidentifier():
+                    # Вызов функции: имя, затем скобка
+                    if index >= count or lexemes[index] != '(':
+                        raise ParserError(f"Ожидалась '(' после '{lexeme}'")
+                    index += 1
+                    stack.append(_PAREN)
+                    calls.append([lexeme, 1])
+                    continue
+                sign = PREFIX_SIGNS.get(lexeme)
+                if sign is not None and sign in specs and specs[sign].arity == 1:
+                    spec = specs[sign]
+                if spec is not None:
+                    if spec.arity != 1:
+                        raise ParserError(f"Ожидался операнд перед '{lexeme}'")
+                    stack.append(spec.symbol)
+                    continue
+                if lexeme in (')', ','):
+                    raise ParserError(f"Ожидался операнд перед '{lexeme}'")
+                output.append(self._operand(lexeme))
+                expect_operand = False
+                continue
+
+            if lexeme == ')' or lexeme == ',':
+                while stack and stack[-1] is not _PAREN:
+                    output.append(stack.pop())
+                if not stack:
+                    raise ParserError(f"Лишняя '{lexeme}'")
+                call = calls[-1]
+                if lexeme == ',':
+                    if call[0] is None:
+                        raise ParserError("',' вне вызова функции")
+                    call[1] += 1
+                    expect_operand = True
+                    continue
+                stack.pop()
+                calls.pop()
+                name, arguments = call
+                if name is not None:
+                    arity = specs[name].arity
+                    if arguments != arity:
+                        raise ParserError(
+                            f"'{name}' принимает {arity} аргумент(ов), "
+                            f'передано {arguments}'
+                        )
+                    output.append(name)
+                elif groups:
+                    output.append(')')
+                continue
+
+            spec = specs.get(lexeme)
+            if spec is None or spec.arity != 2 or lexeme.isidentifier():
+                raise ParserError(f"Ожидался бинарный оператор вместо '{lexeme}'")
+            priority = spec.priority
+            while stack and stack[-1] is not _PAREN:
+                top = specs[stack[-1]]
+                if top.arity == 1 and spec.right_associative:
+                    # Префиксный оператор применяется к результату, например, '^'
+                    break
+                if top.priority > priority or (
+                    top.priority == priority and not spec.right_associative
+                ):
+                    output.append(stack.pop())
+                else:
+                    break
+            stack.append(lexeme)
+            expect_operand = True
+
+        if expect_operand:
+            raise ParserError('Выражение оборвано: ожидался операнд')
+        while stack:
+            top = stack.pop()
+            if top is _PAREN:
+                raise ParserError("Не закрыта '('")
+            output.append(top)
+        return output
+
+    def _operand(self, lexeme):
+        """
+        Возвращает число или переменную.
+
+        Raises:
+            ParserError: Если лексема не операнд.
+        """
+        if lexeme[0].isdigit() or lexeme[0] == '.':
+            try:
+                if self._parse_number is not None:
+                    return self._parse_number(lexeme)
+                number = float(lexeme) if '.' in lexeme else int(lexeme)
+            except ValueError:
+                raise ParserError(f'Неизвестный токен: {lexeme}') from None
+            if isinstance(number, float) and number.is_integer():
+                return int(number)
+            return number
+        if lexeme.isidentifier():
+            return Variable(lexeme)
+        raise ParserError(f"Ожидался операнд вместо '{lexeme}'")
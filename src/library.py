@@ -0,0 +1,353 @@
+import json
+import mmap
+import os
+import struct
+import sys
+import zlib
+from array import array
+from decimal import Decimal
+from fractions import Fraction
+
+from src.calculator import Calculator
+from src.compact import CompactProgram
+from src.exceptions import CalculatorError, LibraryError
+
+# Сигнатура и версия формата файла библиотеки
+MAGIC = b'RPNL'
+VERSION = 1
+
+# Заголовок: сигнатура, версия, резерв, число формул, смещение, размер
+# и CRC32 оглавления, CRC32 предыдущих полей заголовка. Все числа - little-endian
+_HEADER = struct.Struct('<4sHHIQII')
+_HEADER_SIZE = _HEADER.size + 4
+# Заголовок записи программы: длины code, ints, floats и хвоста JSON
+_RECORD = struct.Struct('<IIII')
+# Граница выравнивания записей: массивы int64 и float64 читаются без копии
+_ALIGN = 8
+
+# Массивы программы хранятся в little-endian и на таких машинах
+# отображаются из файла без копирования
+_NATIVE = sys.byteorder == 'little'
+
+
+def build_library(path, formulas, calculator=None):
+    """
+    Разбирает формулы и сохраняет скомпилированные программы в файл
+    библиотеки. Файл записывается во временный и переименовывается,
+    поэтому читатели не увидят его недописанным.
+
+    Args:
+        path (str | PathLike): Путь к файлу библиотеки.
+        formulas (Mapping | Iterable): Формулы {имя: выражение RPN} или
+            пары (имя, выражение); номер формулы - её порядковый номер.
+        calculator (Calculator | None): Калькулятор, чьи разборщик,
+            оптимизатор и числовой режим используются; по умолчанию -
+            новый Calculator().
+
+    Returns:
+        int: Число сохранённых формул.
+
+    Raises:
+        CalculatorError: При ошибке в формуле (с её именем в сообщении).
+        LibraryError: Если имя формулы не строка или имена повторяются.
+    """
+    if calculator is None:
+        calculator = Calculator()
+    if hasattr(formulas, 'items'):
+        formulas = formulas.items()
+
+    entries = []
+    names = set()
+    temp_path = f'{os.fspath(path)}.tmp'
+    try:
+        with open(temp_path, 'wb') as file:
+            file.write(bytes(_HEADER_SIZE))
+            offset = _HEADER_SIZE
+            for name, expr in formulas:
+                if not isinstance(name, str):
+                    raise LibraryError(f'Имя формулы должно быть строкой: {name!r}')
+                if name in names:
+                    raise LibraryError(f'Повторяющееся имя формулы: {name}')
+                names.add(name)
+                try:
+                    program = calculator.encode(expr)
+                except CalculatorError as e:
+                    raise type(e)(f'Формула {name}: {e}') from e
+                record = _pack_program(program)
+                file.write(record)
+                entries.append([name, offset, len(record), zlib.crc32(record)])
+                offset += len(record)
+
+            index = json.dumps(
+                {'backend': calculator.backend.name, 'formulas': entries},
+                ensure_ascii=False,
+                separators=(',', ':'),
+            ).encode()
+            file.write(index)
+            header = _HEADER.pack(
+                MAGIC, VERSION, 0, len(entries), offset, len(index), zlib.crc32(index)
+            )
+            file.seek(0)
+            file.write(header + struct.pack('<I', zlib.crc32(header)))
+        os.replace(temp_path, path)
+    except BaseException:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+        raise
+    return len(entries)
+
+
+class Library:
+    """
+    Библиотека скомпилированных формул, отображённая в память (mmap).
+    При открытии читается только оглавление; массивы программы отображаются
+    из файла без разбора и копирования при первом обращении к формуле,
+    тогда же проверяется её контрольная сумма. Формулы ищутся по имени
+    или номеру.
+    """
+
+    def __init__(self, path, calculator=None):
+        """
+        Args:
+            path (str | PathLike): Путь к файлу библиотеки.
+            calculator (Calculator | None): Калькулятор для проверки и
+                вычисления программ; по умолчанию - новый Calculator()
+                в числовом режиме библиотеки.
+
+        Raises:
+            LibraryError: Если файл повреждён, имеет другую версию формата
+                или числовой режим не совпадает с режимом калькулятора.
+        """
+        with open(path, 'rb') as file:
+            size = os.fstat(file.fileno()).st_size
+            if size < _HEADER_SIZE:
+                raise LibraryError('Файл не является библиотекой выражений')
+            self._mmap = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        try:
+            self._index = self._read_index(size)
+        except BaseException:
+            self._mmap.close()
+            raise
+
+        backend = self._index['backend']
+        if calculator is None:
+            calculator = Calculator(backend=backend)
+        elif calculator.backend.name != backend:
+            self._mmap.close()
+            raise LibraryError(
+                f'Библиотека собрана в режиме {backend}, '
+                f'калькулятор - в режиме {calculator.backend.name}'
+            )
+        self.calculator = calculator
+        self._entries = self._index['formulas']
+        self._ids = {entry[0]: index for index, entry in enumerate(self._entries)}
+        self._programs = [None] * len(self._entries)
+
+    def _read_index(self, size):
+        """
+        Проверяет заголовок и читает оглавление.
+
+        Raises:
+            LibraryError: Если заголовок или оглавление повреждены.
+        """
+        header = self._mmap[: _HEADER.size]
+        magic, version, _, count, offset, length, crc = _HEADER.unpack(header)
+        if magic != MAGIC:
+            raise LibraryError('Файл не является библиотекой выражений')
+        if version != VERSION:
+            raise LibraryError(f'Неподдерживаемая версия библиотеки: {version}')
+        (header_crc,) = struct.unpack_from('<I', self._mmap, _HEADER.size)
+        if zlib.crc32(header) != header_crc:
+            raise LibraryError('Повреждён заголовок библиотеки')
+        if offset + length > size:
+            raise LibraryError('Библиотека обрезана')
+
+        index = self._mmap[offset : offset + length]
+        if zlib.crc32(index) != crc:
+            raise LibraryError('Повреждено оглавление библиотеки')
+        index = json.loads(index)
+        if len(index['formulas']) != count:
+            raise LibraryError('Повреждено оглавление библиотеки')
+        return index
+
+    @property
+    def backend(self):
+        """str: Числовой режим, в котором собрана библиотека."""
+        return self._index['backend']
+
+    def get(self, key):
+        """
+        Возвращает программу формулы.
+
+        Args:
+            key (str | int): Имя или номер формулы.
+
+        Returns:
+            CompactProgram: Программа, массивы которой отображены из файла.
+
+        Raises:
+            KeyError: Если формулы нет.
+            LibraryError: Если запись формулы повреждена.
+        """
+        index = key if isinstance(key, int) else self._ids.get(key)
+        if index is None or not 0 <= index < len(self._programs):
+            raise KeyError(key)
+
+        program = self._programs[index]
+        if program is None:
+            name, offset, length, crc = self._entries[index]
+            view = memoryview(self._mmap)[offset : offset + length]
+            if zlib.crc32(view) != crc:
+                raise LibraryError(f'Повреждена запись формулы {name}')
+            try:
+                program = _unpack_program(view)
+                program.validate(self.calculator.rpn_evaluator.operators)
+            except Exception as e:
+                raise LibraryError(f'Формула {name}: {e}') from e
+            self._programs[index] = program
+        return program
+
+    def evaluate(self, key, env=None):
+        """
+        Вычисляет формулу.
+
+        Args:
+            key (str | int): Имя или номер формулы.
+            env (Mapping | None): Значения переменных формулы.
+
+        Returns:
+            Результат вычисления формулы.
+
+        Raises:
+            KeyError: Если формулы нет.
+            CalculatorError: При ошибке вычисления или повреждённой записи.
+        """
+        return self.calculator.evaluate_compact(self.get(key), env)
+
+    def name(self, index):
+        """
+        Returns:
+            str: Имя формулы с номером index.
+        """
+        return self._entries[index][0]
+
+    def close(self):
+        """
+        Закрывает библиотеку. Отображение освобождается, когда не останется
+        программ, полученных из неё.
+        """
+        self._programs = [None] * len(self._entries)
+        try:
+            self._mmap.close()
+        except BufferError:
+            # Программы ещё используются: файл закроется вместе с ними
+            pass
+
+    def __getitem__(self, key):
+        return self.get(key)
+
+    def __contains__(self, key):
+        if isinstance(key, int):
+            return 0 <= key < len(self._entries)
+        return key in self._ids
+
+    def __iter__(self):
+        return iter(self._ids)
+
+    def __len__(self):
+        return len(self._entries)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def __repr__(self):
+        return f'Library({len(self)} формул, режим {self.backend})'
+
+
+def _pack_program(program):
+    """
+    Записывает программу: заголовок записи, массивы ints, floats и code
+    и текстовый хвост из трёх строк - операторы, имена переменных и прочие
+    операнды через пробел (в этих токенах пробелов нет, а разбор такого
+    хвоста в разы быстрее JSON). Запись дополняется до границы _ALIGN.
+    """
+    ints = array('q', program.ints)
+    floats = array('d', program.floats)
+    if not _NATIVE:
+        ints.byteswap()
+        floats.byteswap()
+    extra = '\n'.join(
+        (
+            ' '.join(program.symbols),
+            ' '.join(program.names),
+            ' '.join(_pack_object(value) for value in program.objects),
+        )
+    ).encode()
+    parts = [
+        _RECORD.pack(len(program.code), len(ints), len(floats), len(extra)),
+        ints.tobytes(),
+        floats.tobytes(),
+        bytes(program.code),
+        extra,
+    ]
+    size = sum(len(part) for part in parts)
+    parts.append(bytes(-size % _ALIGN))
+    return b''.join(parts)
+
+
+def _unpack_program(view):
+    """Восстанавливает программу из записи, не копируя массивы."""
+    code_length, ints_length, floats_length, extra_length = _RECORD.unpack_from(view)
+    start = _RECORD.size
+    ints = view[start : start + ints_length * 8].cast('q')
+    start += ints_length * 8
+    floats = view[start : start + floats_length * 8].cast('d')
+    start += floats_length * 8
+    code = view[start : start + code_length]
+    start += code_length
+    extra = str(view[start : start + extra_length], 'utf-8')
+    symbols, names, objects = extra.split('\n')
+    if not _NATIVE:
+        ints = array('q', ints.tobytes())
+        ints.byteswap()
+        floats = array('d', floats.tobytes())
+        floats.byteswap()
+    return CompactProgram(
+        code,
+        ints,
+        floats,
+        [_unpack_object(value) for value in objects.split()],
+        names.split(),
+        tuple(symbols.split()),
+    )
+
+
+def _pack_object(value):
+    """
+    Записывает операнд, не помещающийся в массивы, как 'вид:запись'. Целые
+    записываются в шестнадцатеричном виде: запись в десятичном ограничена
+    числом цифр.
+    """
+    if isinstance(value, int):
+        return f'i:{value:x}'
+    if isinstance(value, Decimal):
+        return f'd:{value}'
+    if isinstance(value, Fraction):
+        return f'f:{value.numerator:x}/{value.denominator:x}'
+    raise LibraryError(f'Неподдерживаемый тип операнда: {type(value).__name__}')
+
+
+def _unpack_object(value):
+    """Восстанавливает операнд, записанный _pack_object."""
+    kind, _, text = value.partition(':')
+    if kind == 'i':
+        return int(text, 16)
+    if kind == 'd':
+        return Decimal(text)
+    if kind == 'f':
+        numerator, _, denominator = text.partition('/')
+        return Fraction(int(numerator, 16), int(denominator, 16))
+    raise LibraryError(f'Неизвестный тип операнда: {kind}')
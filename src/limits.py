@@ -0,0 +1,262 @@
+import math
+import time
+from numbers import Rational
+
+from src.exceptions import CalculatorError, EvaluationError, ResourceLimitError
+from src.variable import Variable
+
+
+class EvaluationLimits:
+    """
+    Ограничения ресурсов на одно вычисление выражения. None отключает
+    соответствующее ограничение.
+    """
+
+    __slots__ = ('max_operations', 'max_int_bits', 'max_stack_depth', 'timeout')
+
+    def __init__(
+        self,
+        max_operations=None,
+        max_int_bits=None,
+        max_stack_depth=None,
+        timeout=None,
+    ):
+        """
+        Args:
+            max_operations (int | None): Максимальное число применений операторов.
+            max_int_bits (int | None): Максимальная длина целого результата в
+                битах; для '^' и '*' оценивается до вычисления.
+            max_stack_depth (int | None): Максимальная глубина стека.
+            timeout (float | None): Максимальное время вычисления в секундах.
+
+        Raises:
+            ValueError: Если ограничение не положительное.
+        """
+        for name, value in (
+            ('max_operations', max_operations),
+            ('max_int_bits', max_int_bits),
+            ('max_stack_depth', max_stack_depth),
+            ('timeout', timeout),
+        ):
+            if value is not None and value <= 0:
+                raise ValueError(f'Ограничение {name} должно быть положительным')
+        self.max_operations = max_operations
+        self.max_int_bits = max_int_bits
+        self.max_stack_depth = max_stack_depth
+        self.timeout = timeout
+
+    def __eq__(self, other):
+        if not isinstance(other, EvaluationLimits):
+            return NotImplemented
+        return all(
+            getattr(self, name) == getattr(other, name) for name in self.__slots__
+        )
+
+    def __repr__(self):
+        options = ', '.join(
+            f'{name}={getattr(self, name)!r}'
+            for name in self.__slots__
+            if getattr(self, name) is not None
+        )
+        return f'EvaluationLimits({options})'
+
+
+class LimitBudget:
+    """
+    Общий для нескольких вызовов apply_limited расход ограничений одного
+    вычисления: счётчик операций и срок. Нужен, когда программа
+    вычисляется по частям (например, MemoProgram): без него каждая часть
+    получила бы собственные ограничения.
+    """
+
+    __slots__ = ('operations', 'deadline')
+
+    def __init__(self, limits):
+        """
+        Args:
+            limits (EvaluationLimits): Ограничения; срок отсчитывается от
+                создания.
+        """
+        self.operations = 0
+        self.deadline = None
+        if limits.timeout is not None:
+            self.deadline = time.monotonic() + limits.timeout
+
+
+def _magnitude(value):
+    """
+    Возвращает наибольшее по модулю целое в записи точного числа:
+    само целое или больший из числителя и знаменателя дроби.
+    None для неточных чисел (float, Decimal).
+    """
+    if isinstance(value, int):
+        return abs(value)
+    # Rational вместо Fraction: модуль fractions не нужен без режима fraction
+    if isinstance(value, Rational):
+        return max(abs(value.numerator), value.denominator)
+    return None
+
+
+def int_bits(value):
+    """
+    Возвращает длину точного числа в битах (для дроби - большей из частей).
+
+    Returns:
+        int: Число бит; 0 для неточных чисел.
+    """
+    magnitude = _magnitude(value)
+    return magnitude.bit_length() if magnitude is not None else 0
+
+
+def estimate_int_bits(token, a, b):
+    """
+    Оценивает длину в битах точного результата '^' или '*' без вычисления.
+
+    Args:
+        token (str): Оператор.
+        a: Левый операнд.
+        b: Правый операнд.
+
+    Returns:
+        int: Оценка числа бит результата; 0, если результат неточный
+            или оценка не нужна.
+    """
+    base = _magnitude(a)
+    if base is None or _magnitude(b) is None:
+        return 0
+    if token == '*':
+        return base.bit_length() + int_bits(b)
+    if token == '^':
+        if b.denominator != 1:
+            return 0
+        exponent = abs(int(b))
+        if isinstance(a, int) and b < 0:
+            # Целое в отрицательной степени - вещественное число
+            return 0
+        if base <= 1:
+            return 1
+        # Длина a^b в битах равна floor(b * log2|a|) + 1
+        try:
+            return int(exponent * math.log2(base)) + 1
+        except OverflowError:
+            # Показатель не помещается в float: достаточно оценки снизу
+            # в целых числах, она всё равно больше любого ограничения
+            return (base.bit_length() - 1) * exponent + 1
+    return 0
+
+
+def evaluate_limited(tokens, dispatch, limits, env=None, backend=None, budget=None):
+    """
+    Вычисляет выражение в RPN, проверяя ограничения ресурсов перед каждой
+    операцией. Работает медленнее обычного цикла, поэтому используется
+    только при заданных ограничениях.
+
+    Args:
+        tokens (Iterable): Токены (числа, переменные, операторы и скобки).
+        dispatch (Mapping): Оператор -> (arity, функция).
+        limits (EvaluationLimits): Ограничения.
+        env (Mapping | None): Значения переменных выражения.
+        backend (NumericBackend | None): Числовой режим без приведения после
+            каждой операции; None - режим exact.
+        budget (LimitBudget | None): Расход ограничений, общий с другими
+            частями того же вычисления; None - ограничения на этот вызов.
+
+    Returns:
+        float или int: Результат вычисления выражения.
+
+    Raises:
+        ResourceLimitError: При превышении ограничения.
+        EvaluationError: При ошибке вычисления выражения.
+        DivisionByZeroError: При попытке деления на ноль.
+        InvalidOperandTypeError: При неподходящем типе операндов.
+        UndefinedVariableError: Если значение переменной не задано.
+    """
+    stack = apply_limited(tokens, [], dispatch, limits, env, backend, budget)
+
+    if len(stack) != 1:
+        raise EvaluationError(
+            f'Некорректное выражение: в стеке осталось {len(stack)} элементов'
+        )
+
+    if backend is not None and backend.finalize is not None:
+        return backend.finalize(stack[0])
+    return stack[0]
+
+
+def apply_limited(tokens, stack, dispatch, limits, env=None, backend=None, budget=None):
+    """
+    Применяет токены к стеку значений с проверкой ограничений ресурсов
+    (см. evaluate_limited). Ограничения считаются для этого вызова или,
+    с budget, вместе с другими частями вычисления.
+
+    Returns:
+        list: Тот же стек.
+    """
+    if budget is None:
+        budget = LimitBudget(limits)
+    max_operations = limits.max_operations
+    max_int_bits = limits.max_int_bits
+    max_stack_depth = limits.max_stack_depth
+    deadline = budget.deadline
+
+    normalize = backend is None
+    coerce = backend.coerce if backend is not None else None
+
+    for token in tokens:
+        if isinstance(token, Variable):
+            value = token.resolve(env)
+            stack.append(coerce(value) if coerce is not None else value)
+        elif not isinstance(token, str):
+            # Число (в числовых режимах - Decimal, Fraction и т.п.)
+            stack.append(token)
+        elif token in dispatch:
+            arity, func = dispatch[token]
+            if len(stack) < arity:
+                raise EvaluationError('Недостаточно операндов для оператора')
+
+            budget.operations += 1
+            if max_operations is not None and budget.operations > max_operations:
+                raise ResourceLimitError(f'Превышено число операций: {max_operations}')
+            if deadline is not None and time.monotonic() > deadline:
+                raise ResourceLimitError(
+                    f'Превышено время вычисления: {limits.timeout} с'
+                )
+
+            operands = stack[-arity:]
+            if max_int_bits is not None and arity == 2:
+                bits = estimate_int_bits(token, *operands)
+                if bits > max_int_bits:
+                    raise ResourceLimitError(
+                        f"Результат '{token}' превысит {max_int_bits} бит"
+                    )
+
+            del stack[-arity:]
+            try:
+                result = func(*operands)
+            except CalculatorError:
+                raise
+            except Exception as e:
+                raise EvaluationError(
+                    f"Ошибка при выполнении оператора '{token}': {e}"
+                ) from e
+
+            # Преобразовываем в int, если возможно
+            if normalize and isinstance(result, float) and result.is_integer():
+                result = int(result)
+            if max_int_bits is not None and int_bits(result) > max_int_bits:
+                raise ResourceLimitError(
+                    f"Результат '{token}' превысил {max_int_bits} бит"
+                )
+            stack.append(result)
+            continue
+        elif token == '(' or token == ')':
+            continue
+        else:
+            raise EvaluationError(f'Неизвестный оператор: {token}')
+
+        if max_stack_depth is not None and len(stack) > max_stack_depth:
+            raise ResourceLimitError(
+                f'Превышена глубина стека: {limits.max_stack_depth}'
+            )
+
+    return stack
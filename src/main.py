@@ -1,12 +1,198 @@
+import sys
+
+from src.batch import format_result
 from src.calculator import Calculator
-from src.constants import HELP_TEXT
+from src.constants import HELP_TEXT, SESSION_HELP_TEXT
 from src.exceptions import CalculatorError
 
+# Размер буфера для файлов пакетного режима
+BATCH_BUFFER_SIZE = 1 << 20
+# Число строк результата, записываемых за одну операцию
+BATCH_WRITE_LINES = 4096
+
 
-def main():
+def parse_args(argv=None):
     """
-    Основная функция программы. Запрашивает у пользователя ввод в обратной польской
-    нотации и вычисляет результат.
+    Разбирает аргументы командной строки.
+
+    Args:
+        argv (list | None): Аргументы (по умолчанию - sys.argv).
+
+    Returns:
+        argparse.Namespace: Разобранные аргументы.
+    """
+    # argparse импортируется только здесь: быстрый путь -e обходится без него
+    import argparse
+
+    parser = argparse.ArgumentParser(
+        prog='python -m src.main',
+        description='Калькулятор выражений в обратной польской нотации (RPN)',
+    )
+    mode = parser.add_mutually_exclusive_group()
+    mode.add_argument(
+        '-e',
+        '--expr',
+        metavar='EXPR',
+        help='вычислить одно выражение, вывести результат и завершиться',
+    )
+    mode.add_argument(
+        '--coprocess',
+        action='store_true',
+        help='режим сопроцесса: выражение на строку stdin, ответ на строку stdout',
+    )
+    mode.add_argument(
+        '--session',
+        action='store_true',
+        help='интерактивный сеанс с постоянным стеком между строками',
+    )
+    mode.add_argument(
+        '--batch',
+        metavar='FILE',
+        help="пакетный режим: по выражению на строку из файла ('-' - stdin)",
+    )
+    parser.add_argument(
+        '-o',
+        '--output',
+        metavar='FILE',
+        help='файл для результатов пакетного режима (по умолчанию - stdout)',
+    )
+    parser.add_argument(
+        '--jobs',
+        type=int,
+        default=1,
+        metavar='N',
+        help='число процессов для пакетного режима',
+    )
+    parser.add_argument(
+        '--chunksize',
+        type=int,
+        default=1000,
+        metavar='N',
+        help='число выражений, отправляемых процессу за раз',
+    )
+    parser.add_argument(
+        '--backend',
+        choices=('exact', 'float64', 'decimal', 'fraction'),
+        default='exact',
+        help='числовой режим для --batch, --coprocess и --session',
+    )
+    return parser.parse_args(argv)
+
+
+def run_batch(calculator, source, target, jobs=1, chunksize=1000):
+    """
+    Вычисляет выражения по одному на строку и записывает результаты
+    построчно в том же порядке. Вывод накапливается и пишется блоками.
+
+    Args:
+        calculator (Calculator): Калькулятор.
+        source (TextIO): Входной поток с выражениями.
+        target (TextIO): Выходной поток для результатов.
+        jobs (int): Число процессов; 1 - вычисление в текущем процессе.
+        chunksize (int): Число выражений, отправляемых процессу за раз.
+
+    Returns:
+        int: Число выражений, вычисленных с ошибкой.
+    """
+    exprs = (line.rstrip('\r\n') for line in source)
+    if jobs > 1:
+        results = calculator.evaluate_parallel(
+            exprs, max_workers=jobs, chunksize=chunksize
+        )
+    else:
+        results = calculator.evaluate_many(exprs)
+
+    errors = 0
+    lines = []
+    for result in results:
+        if result.error is not None:
+            errors += 1
+        lines.append(format_result(result))
+        if len(lines) >= BATCH_WRITE_LINES:
+            lines.append('')
+            target.write('\n'.join(lines))
+            lines.clear()
+    if lines:
+        lines.append('')
+        target.write('\n'.join(lines))
+    target.flush()
+
+    return errors
+
+
+def expr_main(expr):
+    """
+    Вычисляет одно выражение и выводит результат (однократный режим).
+
+    Args:
+        expr (str): Выражение в RPN.
+
+    Returns:
+        int: Код завершения: 0 - успех, 1 - ошибка в выражении.
+    """
+    try:
+        result = Calculator().evaluate(expr)
+    except CalculatorError as e:
+        print(f'Ошибка: {str(e)}', file=sys.stderr)
+        return 1
+
+    print(result)
+    return 0
+
+
+def run_coprocess(calculator, source, target):
+    """
+    Построчный протокол для долгоживущего процесса: на каждую строку
+    с выражением отвечает ровно одной строкой в формате пакетного режима
+    и сразу сбрасывает вывод, чтобы вызывающая сторона могла читать ответ.
+
+    Args:
+        calculator (Calculator): Калькулятор.
+        source (TextIO): Входной поток с выражениями.
+        target (TextIO): Выходной поток для ответов.
+    """
+    for result in calculator.evaluate_many(line.rstrip('\r\n') for line in source):
+        target.write(format_result(result) + '\n')
+        target.flush()
+
+
+def batch_main(args):
+    """
+    Запускает пакетный режим с файлами из аргументов командной строки.
+
+    Args:
+        args (argparse.Namespace): Разобранные аргументы.
+
+    Returns:
+        int: Код завершения.
+    """
+    calculator = Calculator(backend=args.backend)
+
+    source = (
+        sys.stdin
+        if args.batch == '-'
+        else open(args.batch, encoding='utf-8', buffering=BATCH_BUFFER_SIZE)
+    )
+    target = (
+        sys.stdout
+        if args.output is None
+        else open(args.output, 'w', encoding='utf-8', buffering=BATCH_BUFFER_SIZE)
+    )
+    try:
+        run_batch(calculator, source, target, args.jobs, args.chunksize)
+    finally:
+        if source is not sys.stdin:
+            source.close()
+        if target is not sys.stdout:
+            target.close()
+
+    return 0
+
+
+def interactive_main():
+    """
+    Запрашивает у пользователя ввод в обратной польской нотации
+    и вычисляет результат.
     """
     calculator = Calculator()
 
@@ -30,5 +216,78 @@ def main():
             print(f'Непредвиденная ошибка: {str(e)}')
 
 
+def session_main(calculator):
+    """
+    Интерактивный сеанс с постоянным стеком: после каждой строки выводится
+    стек, при ошибке строка не меняет стек.
+
+    Args:
+        calculator (Calculator): Калькулятор.
+    """
+    # Импорт здесь: сеанс нужен только в этом режиме
+    from src.session import Session
+
+    session = Session(calculator)
+
+    print(SESSION_HELP_TEXT)
+
+    while True:
+        try:
+            user_input = input('\n> ')
+        except EOFError:
+            break
+
+        if user_input.strip().lower() == 'q':
+            print('Выход из калькулятора')
+            break
+
+        try:
+            values = session.feed(user_input)
+        except CalculatorError as e:
+            print(f'Ошибка: {str(e)}')
+            values = session.values()
+        print('Стек: ' + ' '.join(str(value) for value in values))
+
+
+def main(argv=None):
+    """
+    Основная функция программы. Без аргументов запускает интерактивный режим,
+    с -e - вычисление одного выражения, с --coprocess - построчный протокол,
+    с --batch - пакетное вычисление выражений из файла или stdin,
+    с --session - сеанс с постоянным стеком.
+
+    Args:
+        argv (list | None): Аргументы командной строки.
+
+    Returns:
+        int: Код завершения.
+    """
+    if argv is None:
+        argv = sys.argv[1:]
+
+    # Быстрый путь для частых однократных вызовов: без разбора аргументов
+    if len(argv) == 2 and argv[0] in ('-e', '--expr'):
+        return expr_main(argv[1])
+
+    args = parse_args(argv)
+
+    if args.expr is not None:
+        return expr_main(args.expr)
+
+    if args.coprocess:
+        run_coprocess(Calculator(backend=args.backend), sys.stdin, sys.stdout)
+        return 0
+
+    if args.batch is not None:
+        return batch_main(args)
+
+    if args.session:
+        session_main(Calculator(backend=args.backend))
+        return 0
+
+    interactive_main()
+    return 0
+
+
 if __name__ == '__main__':
-    main()
+    sys.exit(main())
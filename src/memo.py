@@ -0,0 +1,191 @@
+from src.variable import Variable
+
+
+class SharedGroup:
+    """
+    Токен повторяющегося подвыражения в скобках: значение вычисляется
+    при первой встрече и используется повторно до конца вычисления.
+    """
+
+    __slots__ = ('index',)
+
+    def __init__(self, index):
+        """
+        Args:
+            index (int): Номер подвыражения в MemoProgram.groups.
+        """
+        self.index = index
+
+    def __eq__(self, other):
+        if not isinstance(other, SharedGroup):
+            return NotImplemented
+        return self.index == other.index
+
+    def __hash__(self):
+        return hash((SharedGroup, self.index))
+
+    def __repr__(self):
+        return f'SharedGroup({self.index})'
+
+
+class MemoProgram:
+    """
+    Программа, в которой одинаковые подвыражения в скобках записаны один
+    раз: в tokens и в самих подвыражениях их вхождения заменены на
+    SharedGroup.
+    """
+
+    __slots__ = ('tokens', 'groups', 'source')
+
+    def __init__(self, tokens, groups, source):
+        """
+        Args:
+            tokens (list): Программа с токенами SharedGroup.
+            groups (list): Программы подвыражений (без скобок).
+            source (list): Исходная программа без замен.
+        """
+        self.tokens = tokens
+        self.groups = groups
+        self.source = source
+
+    def __repr__(self):
+        return f'MemoProgram({len(self.source)} токенов, {len(self.groups)} групп)'
+
+
+def _key(token):
+    """
+    Возвращает ключ токена для сравнения подвыражений. Числа сравниваются
+    вместе с типом и записью: 1, 1.0 и -0.0, 0.0 дают разные результаты
+    операций, хотя равны.
+    """
+    if isinstance(token, str | Variable):
+        return token
+    if isinstance(token, int):
+        # repr больших целых медленный и ограничен по числу цифр
+        return (int, token)
+    return (type(token), repr(token))
+
+
+def share_groups(tokens):
+    """
+    Находит одинаковые подвыражения в скобках (на любом уровне вложенности)
+    и записывает каждое один раз (hash-consing): подвыражение получает номер
+    по ключу из токенов, где вложенные подвыражения заменены их номерами.
+
+    Args:
+        tokens (list): Проверенные токены выражения.
+
+    Returns:
+        MemoProgram | list: Программа с общими подвыражениями или исходные
+            токены, если одинаковых подвыражений нет.
+    """
+    # Проход 1: номер каждого подвыражения и число его вхождений
+    ids = {}
+    counts = []
+    spans = {}  # позиция '(' -> (номер подвыражения, позиция ')')
+    open_groups = []  # (позиция '(', элементы ключа)
+    elements = []
+    for index, token in enumerate(tokens):
+        if isinstance(token, str) and token == '(':
+            open_groups.append((index, elements))
+            elements = []
+        elif isinstance(token, str) and token == ')':
+            group = ids.setdefault(tuple(elements), len(ids))
+            if group == len(counts):
+                counts.append(0)
+            counts[group] += 1
+            start, elements = open_groups.pop()
+            spans[start] = (group, index)
+            elements.append((SharedGroup, group))
+        else:
+            elements.append(_key(token))
+
+    if not any(count > 1 for count in counts):
+        return tokens
+
+    # Проход 2: повторяющиеся подвыражения выносятся в groups. Вложенные
+    # подвыражения обходятся явным стеком, а не рекурсией: глубина
+    # вложенности скобок не ограничена глубиной стека Python
+    shared = {}  # номер подвыражения -> номер в groups
+    groups = []
+    # Ждущие части: (вывод, позиция продолжения, конец, номер в groups)
+    pending = []
+    output = []
+    index = 0
+    end = len(tokens)
+    while True:
+        if index < end:
+            token = tokens[index]
+            span = spans.get(index) if isinstance(token, str) else None
+            if span is None or counts[span[0]] == 1:
+                output.append(token)
+                index += 1
+                continue
+            group, close = span
+            position = shared.get(group)
+            if position is not None:
+                output.append(SharedGroup(position))
+                index = close + 1
+                continue
+            # Первое вхождение: записываем подвыражение, затем продолжаем
+            position = shared[group] = len(groups)
+            groups.append(None)
+            pending.append((output, close + 1, end, position))
+            output, index, end = [], index + 1, close
+            continue
+
+        if not pending:
+            return MemoProgram(output, groups, tokens)
+        parent, index, end, position = pending.pop()
+        groups[position] = output
+        parent.append(SharedGroup(position))
+        output = parent
+
+
+def evaluate_memo(program, apply, env=None):
+    """
+    Вычисляет MemoProgram на одном стеке значений: каждое общее
+    подвыражение вычисляется при первой встрече (в том же порядке, что и
+    без замен, поэтому ошибка выбрасывается там же), а затем его значение
+    подставляется повторно. Ждущие части программы хранятся в явном стеке,
+    поэтому глубина вложенности подвыражений не ограничена рекурсией.
+
+    Args:
+        program (MemoProgram): Программа.
+        apply (Callable): Применение токенов к стеку (токены, стек, env),
+            как RPNEvaluator.apply.
+        env (Mapping | None): Значения переменных.
+
+    Returns:
+        list: Стек значений после программы; проверку и нормализацию
+            результата выполняет вызывающий.
+    """
+    groups = program.groups
+    memo = {}
+    stack = []
+    # Ждущие части: (токены, позиция продолжения, номер подвыражения или None)
+    pending = [(program.tokens, 0, None)]
+    while pending:
+        tokens, start, group = pending.pop()
+        index = start
+        end = len(tokens)
+        while index < end:
+            token = tokens[index]
+            if token.__class__ is SharedGroup:
+                if index > start:
+                    apply(tokens[start:index], stack, env)
+                if token.index not in memo:
+                    # Сначала подвыражение, затем эта часть с того же токена
+                    pending.append((tokens, index, group))
+                    pending.append((groups[token.index], 0, token.index))
+                    break
+                stack.append(memo[token.index])
+                start = index + 1
+            index += 1
+        else:
+            if start < end:
+                apply(tokens[start:] if start else tokens, stack, env)
+            if group is not None:
+                # Значение кладётся в стек продолжением с токена подвыражения
+                memo[group] = stack.pop()
+    return stack
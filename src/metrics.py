@@ -0,0 +1,273 @@
+from bisect import bisect_left
+
+from src.exceptions import CalculatorError
+
+# Границы корзин гистограмм времени в секундах
+DEFAULT_BUCKETS = (
+    1e-05,
+    2.5e-05,
+    5e-05,
+    0.0001,
+    0.00025,
+    0.0005,
+    0.001,
+    0.0025,
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1.0,
+    2.5,
+    5.0,
+    10.0,
+)
+
+
+class Histogram:
+    """
+    Гистограмма с фиксированными корзинами, сумма и число наблюдений
+    (как histogram в Prometheus).
+    """
+
+    __slots__ = ('buckets', 'counts', 'sum', 'count')
+
+    def __init__(self, buckets=DEFAULT_BUCKETS):
+        """
+        Args:
+            buckets (tuple): Возрастающие верхние границы корзин.
+        """
+        self.buckets = tuple(buckets)
+        # Последняя корзина - значения больше всех границ (+Inf)
+        self.counts = [0] * (len(self.buckets) + 1)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value):
+        """
+        Добавляет наблюдение.
+
+        Args:
+            value (float): Значение.
+        """
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+
+    def cumulative(self):
+        """
+        Returns:
+            list: Пары (граница, число наблюдений не больше границы),
+                последняя граница - float('inf').
+        """
+        result = []
+        total = 0
+        for bound, count in zip(
+            self.buckets + (float('inf'),), self.counts, strict=True
+        ):
+            total += count
+            result.append((bound, total))
+        return result
+
+    def snapshot(self):
+        """
+        Returns:
+            dict: Число и сумма наблюдений и накопленные корзины.
+        """
+        return {
+            'count': self.count,
+            'sum': self.sum,
+            'buckets': self.cumulative(),
+        }
+
+
+class Measurement:
+    """
+    Замер одного вычисления: время этапов, полное время, разобранная
+    программа (если разбор успел завершиться) и ошибка.
+    """
+
+    __slots__ = ('stages', 'tokens', 'seconds', 'error')
+
+    def __init__(self):
+        self.stages = {}
+        self.tokens = None
+        self.seconds = 0.0
+        self.error = None
+
+
+class Metrics:
+    """
+    Метрики калькулятора: время этапов (разбор, проверка скобок, оптимизация,
+    вычисление), число вхождений каждого оператора в успешно вычисленные
+    программы, число ошибок по классам и гистограмма времени вычисления
+    выражения.
+    """
+
+    def __init__(self, operators, buckets=DEFAULT_BUCKETS):
+        """
+        Args:
+            operators (Operators): Операторы, вхождения которых считаются.
+            buckets (tuple): Границы корзин гистограмм времени.
+        """
+        self.buckets = buckets
+        self._operators = operators.get_operators()
+        self.reset()
+
+    def reset(self):
+        """Обнуляет все метрики."""
+        self.latency = Histogram(self.buckets)
+        self.stages = {}
+        self.operators = dict.fromkeys(self._operators, 0)
+        self.errors = dict.fromkeys(
+            (cls.__name__ for cls in _error_classes(CalculatorError)), 0
+        )
+
+    def observe_stage(self, stage, seconds):
+        """
+        Добавляет время этапа.
+
+        Args:
+            stage (str): Имя этапа.
+            seconds (float): Время в секундах.
+        """
+        histogram = self.stages.get(stage)
+        if histogram is None:
+            histogram = self.stages[stage] = Histogram(self.buckets)
+        histogram.observe(seconds)
+
+    def observe_latency(self, seconds):
+        """
+        Добавляет полное время вычисления выражения.
+
+        Args:
+            seconds (float): Время в секундах.
+        """
+        self.latency.observe(seconds)
+
+    def observe(self, measurement):
+        """
+        Добавляет замер вычисления: время этапов и полное время, а также
+        операторы программы при успехе или класс ошибки при неудаче.
+
+        Args:
+            measurement (Measurement): Замер вычисления.
+        """
+        for stage, seconds in measurement.stages.items():
+            self.observe_stage(stage, seconds)
+        self.observe_latency(measurement.seconds)
+        if measurement.error is not None:
+            self.record_error(measurement.error)
+        elif measurement.tokens is not None:
+            self.count_operators(measurement.tokens)
+
+    def count_operators(self, tokens):
+        """
+        Увеличивает счётчики операторов по их вхождениям в программу
+        (после оптимизации), а не по числу применений при вычислении.
+        Программы вычислений, завершившихся ошибкой, не учитываются.
+
+        Args:
+            tokens (Iterable): Токены вычисленной программы.
+        """
+        counts = self.operators
+        for token in tokens:
+            if isinstance(token, str) and token in counts:
+                counts[token] += 1
+
+    def record_error(self, error):
+        """
+        Увеличивает счётчик ошибок класса error.
+
+        Args:
+            error (Exception): Ошибка вычисления.
+        """
+        name = type(error).__name__
+        self.errors[name] = self.errors.get(name, 0) + 1
+
+    def snapshot(self):
+        """
+        Returns:
+            dict: Копия текущих значений метрик.
+        """
+        return {
+            'evaluations': self.latency.count,
+            'latency': self.latency.snapshot(),
+            'stages': {
+                stage: histogram.snapshot() for stage, histogram in self.stages.items()
+            },
+            'operators': dict(self.operators),
+            'errors': dict(self.errors),
+        }
+
+    def to_prometheus(self, prefix='rpn'):
+        """
+        Возвращает метрики в текстовом формате Prometheus.
+
+        Args:
+            prefix (str): Префикс имён метрик.
+
+        Returns:
+            str: Текст для страницы /metrics.
+        """
+        lines = []
+
+        name = f'{prefix}_evaluation_seconds'
+        lines.append(f'# HELP {name} Время вычисления одного выражения.')
+        lines.append(f'# TYPE {name} histogram')
+        _histogram_lines(lines, name, {}, self.latency)
+
+        name = f'{prefix}_stage_seconds'
+        lines.append(f'# HELP {name} Время этапов обработки выражения.')
+        lines.append(f'# TYPE {name} histogram')
+        for stage, histogram in self.stages.items():
+            _histogram_lines(lines, name, {'stage': stage}, histogram)
+
+        name = f'{prefix}_operator_occurrences_total'
+        lines.append(
+            f'# HELP {name} Вхождения операторов в успешно вычисленные программы.'
+        )
+        lines.append(f'# TYPE {name} counter')
+        for operator, count in self.operators.items():
+            lines.append(f'{name}{_labels({"operator": operator})} {count}')
+
+        name = f'{prefix}_errors_total'
+        lines.append(f'# HELP {name} Ошибки по классам исключений.')
+        lines.append(f'# TYPE {name} counter')
+        for error, count in self.errors.items():
+            lines.append(f'{name}{_labels({"error": error})} {count}')
+
+        return '\n'.join(lines) + '\n'
+
+
+def _error_classes(base):
+    """Возвращает класс base и все его подклассы."""
+    classes = [base]
+    for subclass in base.__subclasses__():
+        classes.extend(_error_classes(subclass))
+    return classes
+
+
+def _labels(labels):
+    """Форматирует метки Prometheus с экранированием значений."""
+    if not labels:
+        return ''
+    items = ','.join(
+        '{}="{}"'.format(
+            key,
+            str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n'),
+        )
+        for key, value in labels.items()
+    )
+    return '{' + items + '}'
+
+
+def _histogram_lines(lines, name, labels, histogram):
+    """Добавляет строки гистограммы в формате Prometheus."""
+    for bound, count in histogram.cumulative():
+        le = '+Inf' if bound == float('inf') else repr(bound)
+        lines.append(f'{name}_bucket{_labels({**labels, "le": le})} {count}')
+    lines.append(f'{name}_sum{_labels(labels)} {histogram.sum!r}')
+    lines.append(f'{name}_count{_labels(labels)} {histogram.count}')
@@ -1,133 +1,225 @@
+import operator
+from types import MappingProxyType
+
 from src.exceptions import DivisionByZeroError, InvalidOperandTypeError
 
 
-class Operators:
+class OperatorSpec:
     """
-    Класс операторов с их свойствами и функциями.
+    Неизменяемое описание оператора: символ, число операндов, приоритет,
+    ассоциативность и функция вычисления.
     """
 
-    def __init__(self):
-        self.operators = {
-            '+': {
-                'arity': 2,
-                'priority': 1,
-                'func': lambda a, b: a + b,
-            },
-            '-': {
-                'arity': 2,
-                'priority': 1,
-                'func': lambda a, b: a - b,
-            },
-            '*': {
-                'arity': 2,
-                'priority': 2,
-                'func': lambda a, b: a * b,
-            },
-            '/': {
-                'arity': 2,
-                'priority': 2,
-                'func': self._division,
-            },
-            '//': {
-                'arity': 2,
-                'priority': 2,
-                'func': self._integer_division,
-            },
-            '%': {
-                'arity': 2,
-                'priority': 2,
-                'func': self._modulo,
-            },
-            '^': {
-                'arity': 2,
-                'priority': 3,
-                'right_associative': True,
-                'func': lambda a, b: a**b,
-            },
-            '~': {
-                'arity': 1,
-                'priority': 4,
-                'func': lambda a: -a,
-            },
-            '@': {
-                'arity': 1,
-                'priority': 4,
-                'func': lambda a: a,
-            },
-        }
-
-    def _division(self, a, b):
+    __slots__ = (
+        'symbol',
+        'arity',
+        'priority',
+        'right_associative',
+        'func',
+        'vector_func',
+    )
+
+    def __init__(
+        self,
+        symbol,
+        arity,
+        func,
+        priority=0,
+        right_associative=False,
+        vector_func=None,
+    ):
         """
-        Выполняет операцию деления с проверкой деления на ноль.
-
         Args:
-            a: Делимое.
-            b: Делитель.
-
-        Returns:
-            float: Результат деления.
+            symbol (str): Символ или имя оператора в выражении.
+            arity (int): Число операндов (не меньше 1).
+            func (Callable): Функция вычисления над arity операндами.
+            priority (int): Приоритет для инфиксной записи.
+            right_associative (bool): Правая ассоциативность в инфиксной записи.
+            vector_func (Callable | None): Функция над массивами NumPy
+                для векторного режима.
 
         Raises:
-            DivisionByZeroError: При делении на ноль.
+            ValueError: При некорректном символе или числе операндов.
         """
-        if b == 0:
-            raise DivisionByZeroError('Деление на ноль')
-        return a / b
+        if not isinstance(symbol, str) or not symbol or symbol.split() != [symbol]:
+            raise ValueError(f'Некорректный символ оператора: {symbol!r}')
+        if symbol in ('(', ')'):
+            raise ValueError('Скобки не могут быть операторами')
+        if not isinstance(arity, int) or arity < 1:
+            raise ValueError(f'Некорректное число операндов: {arity!r}')
+        if not callable(func):
+            raise ValueError('Функция оператора должна быть вызываемой')
+
+        set_attribute = object.__setattr__
+        set_attribute(self, 'symbol', symbol)
+        set_attribute(self, 'arity', arity)
+        set_attribute(self, 'priority', priority)
+        set_attribute(self, 'right_associative', right_associative)
+        set_attribute(self, 'func', func)
+        set_attribute(self, 'vector_func', vector_func)
+
+    def __setattr__(self, name, value):
+        raise AttributeError('Описание оператора нельзя изменить')
+
+    def __delattr__(self, name):
+        raise AttributeError('Описание оператора нельзя изменить')
+
+    def __reduce__(self):
+        return (
+            OperatorSpec,
+            (
+                self.symbol,
+                self.arity,
+                self.func,
+                self.priority,
+                self.right_associative,
+                self.vector_func,
+            ),
+        )
+
+    def __repr__(self):
+        return f'OperatorSpec({self.symbol!r}, arity={self.arity})'
+
+
+def _division(a, b):
+    """
+    Выполняет операцию деления с проверкой деления на ноль.
 
-    def _integer_division(self, a, b):
-        """
-        Выполняет операцию целочисленного деления с проверками.
+    Args:
+        a: Делимое.
+        b: Делитель.
 
-        Args:
-            a: Делимое.
-            b: Делитель.
+    Returns:
+        float: Результат деления.
 
-        Returns:
-            int: Результат целочисленного деления.
+    Raises:
+        DivisionByZeroError: При делении на ноль.
+    """
+    if b == 0:
+        raise DivisionByZeroError('Деление на ноль')
+    return a / b
+
+
+def _integer_division(a, b):
+    """
+    Выполняет операцию целочисленного деления с проверками.
+
+    Args:
+        a: Делимое.
+        b: Делитель.
+
+    Returns:
+        int: Результат целочисленного деления.
+
+    Raises:
+        DivisionByZeroError: При делении на ноль.
+        InvalidOperandTypeError: Если операнды не целые числа.
+    """
+    if not (isinstance(a, int) and isinstance(b, int)):
+        raise InvalidOperandTypeError(
+            "Операнды должны быть целыми числами для операции '//'"
+        )
+    if b == 0:
+        raise DivisionByZeroError('Целочисленное деление на ноль')
+    return a // b
+
+
+def _modulo(a, b):
+    """
+    Выполняет операцию получения остатка от деления с проверками.
+
+    Args:
+        a: Делимое.
+        b: Делитель.
+
+    Returns:
+        int: Остаток от деления.
+
+    Raises:
+        DivisionByZeroError: При делении на ноль.
+        InvalidOperandTypeError: Если операнды не целые числа.
+    """
+    if not (isinstance(a, int) and isinstance(b, int)):
+        raise InvalidOperandTypeError(
+            "Операнды должны быть целыми числами для операции '%'"
+        )
+    if b == 0:
+        raise DivisionByZeroError('Остаток от деления на ноль')
+    return a % b
+
+
+BUILTIN_OPERATORS = (
+    # Функции модуля operator, а не lambda: реестр передаётся в процессы
+    # пула (в том числе запущенные через spawn) и должен сериализоваться
+    OperatorSpec('+', 2, operator.add, priority=1),
+    OperatorSpec('-', 2, operator.sub, priority=1),
+    OperatorSpec('*', 2, operator.mul, priority=2),
+    OperatorSpec('/', 2, _division, priority=2),
+    OperatorSpec('//', 2, _integer_division, priority=2),
+    OperatorSpec('%', 2, _modulo, priority=2),
+    OperatorSpec('^', 2, operator.pow, priority=3, right_associative=True),
+    OperatorSpec('~', 1, operator.neg, priority=4),
+    OperatorSpec('@', 1, operator.pos, priority=4),
+)
+
+
+class Operators:
+    """
+    Неизменяемый реестр операторов с поиском по символу за O(1).
+    Новые операторы добавляются через register(), который возвращает
+    новый реестр, не изменяя исходный.
+    """
+
+    __slots__ = ('operators',)
+
+    def __init__(self, specs=BUILTIN_OPERATORS):
+        """
+        Args:
+            specs (Iterable[OperatorSpec]): Операторы реестра
+                (по умолчанию - встроенные).
 
         Raises:
-            DivisionByZeroError: При делении на ноль.
-            InvalidOperandTypeError: Если операнды не целые числа.
+            ValueError: Если символ оператора повторяется.
         """
-        if not (isinstance(a, int) and isinstance(b, int)):
-            raise InvalidOperandTypeError(
-                "Операнды должны быть целыми числами для операции '//'"
-            )
-        if b == 0:
-            raise DivisionByZeroError('Целочисленное деление на ноль')
-        return a // b
-
-    def _modulo(self, a, b):
+        operators = {}
+        for spec in specs:
+            if spec.symbol in operators:
+                raise ValueError(f'Оператор уже зарегистрирован: {spec.symbol}')
+            operators[spec.symbol] = spec
+        object.__setattr__(self, 'operators', MappingProxyType(operators))
+
+    def __setattr__(self, name, value):
+        raise AttributeError('Реестр операторов нельзя изменить')
+
+    def __reduce__(self):
+        return (Operators, (tuple(self.operators.values()),))
+
+    def register(self, *specs):
         """
-        Выполняет операцию получения остатка от деления с проверками.
+        Возвращает новый реестр с дополнительными операторами.
 
         Args:
-            a: Делимое.
-            b: Делитель.
+            *specs (OperatorSpec): Новые операторы.
 
         Returns:
-            int: Остаток от деления.
+            Operators: Новый реестр.
 
         Raises:
-            DivisionByZeroError: При делении на ноль.
-            InvalidOperandTypeError: Если операнды не целые числа.
+            ValueError: Если символ оператора уже занят или похож на число.
         """
-        if not (isinstance(a, int) and isinstance(b, int)):
-            raise InvalidOperandTypeError(
-                "Операнды должны быть целыми числами для операции '%'"
-            )
-        if b == 0:
-            raise DivisionByZeroError('Остаток от деления на ноль')
-        return a % b
+        for spec in specs:
+            if _is_number(spec.symbol):
+                raise ValueError(f'Символ оператора похож на число: {spec.symbol}')
+        return Operators((*self.operators.values(), *specs))
 
     def get_operators(self):
         """
-        Возвращает список всех поддерживаемых операторов.
+        Возвращает множество всех поддерживаемых операторов.
 
         Returns:
-            list: Список операторов.
+            KeysView: Операторы (проверка вхождения за O(1)).
         """
-        return list(self.operators.keys())
+        return self.operators.keys()
 
     def get_operator_info(self, operator):
         """
@@ -137,7 +229,7 @@ class Operators:
             operator (str): Оператор.
 
         Returns:
-            dict: Информация об операторе.
+            OperatorSpec: Информация об операторе.
 
         Raises:
             KeyError: Если оператор не найден.
@@ -145,3 +237,16 @@ class Operators:
         if operator not in self.operators:
             raise KeyError(f'Неизвестный оператор: {operator}')
         return self.operators[operator]
+
+
+def _is_number(symbol):
+    """Проверяет, будет ли символ разобран как число."""
+    try:
+        float(symbol)
+    except ValueError:
+        return False
+    return True
+
+
+# Общий для процесса реестр встроенных операторов
+DEFAULT_OPERATORS = Operators()
@@ -0,0 +1,169 @@
+from src.variable import Variable
+
+# Маркер значения подвыражения, которое нельзя вычислить заранее
+_UNKNOWN = object()
+# Максимальный размер (в битах) целого, получаемого свёрткой '^';
+# большие степени остаются вычислению, чтобы не раздувать программу
+MAX_FOLD_BITS = 4096
+
+# Тождества вида "x c op" -> x: оператор -> нейтральный элемент справа
+_RIGHT_IDENTITIES = {'+': 0, '-': 0, '*': 1, '^': 1}
+# Тождества вида "c x op" -> x: оператор -> нейтральный элемент слева
+_LEFT_IDENTITIES = {'+': 0, '*': 1}
+
+
+class _UnoptimizableError(Exception):
+    """Выражение некорректно по числу операндов и оставляется как есть."""
+
+
+class Optimizer:
+    """
+    Статический оптимизатор программы RPN: сворачивает константные
+    подвыражения, удаляет унарный плюс, сокращает двойной унарный минус
+    и упрощает тождества (x 1 *, x 0 +, x 0 -, x 1 ^).
+    Операции, которые при вычислении выбрасывают ошибку (деление на ноль,
+    // и % с вещественными операндами и т.п.), не сворачиваются, поэтому
+    ошибки возникают в том же порядке, что и без оптимизации.
+    """
+
+    def __init__(self, operators, normalize=True):
+        """
+        Args:
+            operators (Operators): Операторы для свёртки констант.
+            normalize (bool): Приводить целые вещественные результаты свёртки
+                к int (False для числовых режимов без такого приведения).
+        """
+        self.operators = operators
+        self.normalize = normalize
+        self.supported_operators = operators.get_operators()
+
+    def optimize(self, tokens):
+        """
+        Возвращает оптимизированную программу без скобок.
+        Если выражение некорректно по числу операндов, возвращает токены без
+        изменений, чтобы ошибку сообщил вычислитель.
+
+        Args:
+            tokens (list): Список токенов (результат TokenParser.parse).
+
+        Returns:
+            list: Оптимизированный список токенов.
+        """
+        try:
+            node = self._build(tokens)
+        except _UnoptimizableError:
+            return list(tokens)
+        return self._flatten(node)
+
+    def _build(self, tokens):
+        """
+        Строит дерево выражения, по ходу применяя оптимизации.
+        Узел - кортеж (значение или _UNKNOWN, токен, дочерние узлы).
+
+        Raises:
+            _UnoptimizableError: При нехватке или избытке операндов.
+        """
+        stack = []
+
+        for token in tokens:
+            if isinstance(token, int | float):
+                stack.append((token, token, ()))
+            elif isinstance(token, Variable):
+                stack.append((_UNKNOWN, token, ()))
+            elif token in self.supported_operators:
+                arity = self.operators.get_operator_info(token).arity
+                if len(stack) < arity:
+                    raise _UnoptimizableError
+                operands = tuple(stack[-arity:])
+                del stack[-arity:]
+                stack.append(self._apply(token, operands))
+            elif token in ('(', ')'):
+                continue
+            else:
+                raise _UnoptimizableError
+
+        if len(stack) != 1:
+            raise _UnoptimizableError
+        return stack[0]
+
+    def _apply(self, token, operands):
+        """
+        Создаёт узел применения оператора, сворачивая или упрощая его.
+        """
+        values = [operand[0] for operand in operands]
+
+        # Свёртка констант
+        if _UNKNOWN not in values:
+            value = self._fold(token, values)
+            if value is not _UNKNOWN:
+                return (value, value, ())
+
+        # Унарный плюс ничего не делает
+        if token == '@':
+            return operands[0]
+
+        # Двойной унарный минус: ~ ~ x -> x
+        if token == '~' and operands[0][1] == '~':
+            return operands[0][2][0]
+
+        if len(operands) == 2:
+            left, right = operands
+            if token in _RIGHT_IDENTITIES and right[0] is not _UNKNOWN:
+                if right[0] == _RIGHT_IDENTITIES[token]:
+                    return left
+            if token in _LEFT_IDENTITIES and left[0] is not _UNKNOWN:
+                if left[0] == _LEFT_IDENTITIES[token]:
+                    return right
+
+        return (_UNKNOWN, token, operands)
+
+    def _fold(self, token, values):
+        """
+        Вычисляет оператор над константами так же, как RPNEvaluator.
+
+        Returns:
+            float, int или _UNKNOWN, если вычисление выбрасывает ошибку или
+            результат слишком велик и его нужно оставить до выполнения.
+        """
+        if token == '^' and not self._is_small_power(*values):
+            return _UNKNOWN
+
+        try:
+            result = self.operators.get_operator_info(token).func(*values)
+        except Exception:
+            return _UNKNOWN
+
+        if self.normalize and isinstance(result, float) and result.is_integer():
+            result = int(result)
+        if not isinstance(result, int | float):
+            # Например, комплексный результат: оставляем как есть
+            return _UNKNOWN
+        return result
+
+    @staticmethod
+    def _is_small_power(base, exponent):
+        """Проверяет, что целая степень не превысит MAX_FOLD_BITS бит."""
+        if not (isinstance(base, int) and isinstance(exponent, int)):
+            return True
+        if exponent <= 0 or abs(base) <= 1:
+            return True
+        return base.bit_length() * exponent <= MAX_FOLD_BITS
+
+    @staticmethod
+    def _flatten(node):
+        """
+        Разворачивает дерево обратно в список токенов (обход в обратном порядке
+        без рекурсии, чтобы не упираться в глубину стека на длинных выражениях).
+        """
+        tokens = []
+        pending = [(node, False)]
+        while pending:
+            current, expanded = pending.pop()
+            _, token, children = current
+            if expanded or not children:
+                tokens.append(token)
+                continue
+            pending.append((current, True))
+            for child in reversed(children):
+                pending.append((child, False))
+        return tokens
@@ -1,5 +1,16 @@
-from src.exceptions import DivisionByZeroError, EvaluationError, InvalidOperandTypeError
-from src.operators import Operators
+from itertools import islice
+
+from src.compact import OP_BASE, OP_FLOAT, OP_INT, OP_OBJECT
+from src.exceptions import (
+    CalculatorError,
+    DivisionByZeroError,
+    EvaluationError,
+    InvalidOperandTypeError,
+)
+from src.limits import LimitBudget, apply_limited, evaluate_limited
+from src.memo import MemoProgram, evaluate_memo
+from src.operators import DEFAULT_OPERATORS
+from src.variable import Variable
 
 
 class RPNEvaluator:
@@ -8,16 +19,38 @@ class RPNEvaluator:
     Реализует стандартный стековый алгоритм для вычисления RPN.
     """
 
-    def __init__(self):
-        self.operators = Operators()
+    def __init__(self, operators=None, limits=None, backend=None):
+        """
+        Args:
+            operators (Operators | None): Операторы; по умолчанию - операторы
+                числового режима или общий реестр встроенных операторов.
+            limits (EvaluationLimits | None): Ограничения ресурсов на одно
+                вычисление; None - без ограничений.
+            backend (NumericBackend | None): Числовой режим; None - exact.
+        """
+        if operators is None:
+            operators = backend.operators if backend is not None else DEFAULT_OPERATORS
+        self.operators = operators
+        self.limits = limits
+        # Режим без приведения к int после каждой операции
+        self.backend = (
+            backend if backend is not None and not backend.normalize_each else None
+        )
         self.supported_operators = self.operators.get_operators()
+        # Таблица разбора: оператор -> (arity, функция)
+        self._dispatch = {
+            symbol: (spec.arity, spec.func)
+            for symbol, spec in self.operators.operators.items()
+        }
 
-    def evaluate(self, tokens):
+    def evaluate(self, tokens, env=None):
         """
         Вычисляет выражение в обратной польской нотации (RPN).
 
         Args:
-            tokens (list): Список токенов (числа и операторы).
+            tokens (list | MemoProgram): Список токенов (числа, переменные
+                и операторы) или программа с общими подвыражениями.
+            env (Mapping | None): Значения переменных выражения.
 
         Returns:
             float или int: Результат вычисления выражения.
@@ -26,34 +59,198 @@ class RPNEvaluator:
             EvaluationError: При ошибке вычисления выражения.
             DivisionByZeroError: При попытке деления на ноль.
             InvalidOperandTypeError: При неподходящем типе операндов.
+            UndefinedVariableError: Если значение переменной не задано.
+            ResourceLimitError: При превышении ограничений limits.
         """
+        if tokens.__class__ is MemoProgram:
+            return self._evaluate_memo(tokens, env)
+        if self.limits is not None:
+            return evaluate_limited(
+                tokens, self._dispatch, self.limits, env, self.backend
+            )
+        if self.backend is not None:
+            return self._evaluate_backend(tokens, env)
 
-        stack = []
+        stack = self._apply(tokens, [], env)
+
+        # Финальная проверка, что остался 1 элемент в стеке
+        if len(stack) != 1:
+            raise EvaluationError(
+                f'Некорректное выражение: в стеке осталось {len(stack)} элементов'
+            )
+
+        return stack[0]
+
+    def evaluate_or_error(self, tokens, env=None):
+        """
+        То же, что evaluate, но ошибка возвращается, а не выбрасывается.
+        Ошибки, видные по самой программе (нехватка операндов, лишние
+        значения в стеке, переменная, которой нет в env-словаре), находятся
+        проходом без вычисления и без исключений; вычисляется только часть
+        программы до ошибки, поэтому ошибки операторов перед ней выбрасываются
+        первыми, как в evaluate. Ошибки самих операторов (деление на ноль и
+        т.п.) и ограничений перехватываются здесь же.
+
+        Args:
+            tokens (list | MemoProgram): Токены или программа с общими
+                подвыражениями.
+            env (Mapping | None): Значения переменных выражения.
+
+        Returns:
+            tuple: (результат, None) или (None, CalculatorError).
+        """
+        source = tokens.source if tokens.__class__ is MemoProgram else tokens
+        found = self._find_error(source, env)
+        try:
+            if found is None:
+                return self.evaluate(tokens, env), None
+            position, error = found
+            self.apply(islice(source, position), [], env)
+        except CalculatorError as e:
+            return None, e
+        return None, error
+
+    def _find_error(self, tokens, env):
+        """
+        Находит первую ошибку, видную по программе без вычисления: моделирует
+        размер стека, как TokenParser.validate для скобок.
+
+        Returns:
+            tuple | None: (позиция, ошибка) или None. Позиция ошибки лишних
+                значений в стеке - длина программы.
+        """
+        dispatch = self._dispatch
+        # Переменные проверяются только в словаре: у других Mapping
+        # (например, defaultdict) значение может найтись при обращении
+        names = env if env.__class__ is dict else None
+        size = 0
+        for position, token in enumerate(tokens):
+            if isinstance(token, str):
+                entry = dispatch.get(token)
+                if entry is None:
+                    # Скобки пропускаются, неизвестный оператор найдёт evaluate
+                    if token == '(' or token == ')':
+                        continue
+                    return None
+                arity = entry[0]
+                if size < arity:
+                    return position, EvaluationError(
+                        'Недостаточно операндов для оператора'
+                    )
+                size -= arity - 1
+            else:
+                if token.__class__ is Variable and (
+                    env is None or (names is not None and token.name not in names)
+                ):
+                    return position, token.undefined()
+                size += 1
+
+        if size != 1:
+            return len(tokens), EvaluationError(
+                f'Некорректное выражение: в стеке осталось {size} элементов'
+            )
+        return None
+
+    def _evaluate_memo(self, program, env):
+        """
+        Вычисляет MemoProgram. Части программы применяются к одному стеку,
+        а с limits - с общим расходом ограничений, поэтому подвыражения и
+        остаток программы считаются как одно вычисление.
+        """
+        if self.limits is not None:
+            budget = LimitBudget(self.limits)
+
+            def apply(tokens, stack, env):
+                return apply_limited(
+                    tokens,
+                    stack,
+                    self._dispatch,
+                    self.limits,
+                    env,
+                    self.backend,
+                    budget,
+                )
+
+        elif self.backend is not None:
+            apply = self._apply_backend
+        else:
+            apply = self._apply
+
+        stack = evaluate_memo(program, apply, env)
+        if len(stack) != 1:
+            raise EvaluationError(
+                f'Некорректное выражение: в стеке осталось {len(stack)} элементов'
+            )
+        finalize = self.backend.finalize if self.backend is not None else None
+        return finalize(stack[0]) if finalize is not None else stack[0]
+
+    def apply(self, tokens, stack, env=None):
+        """
+        Применяет токены к стеку значений, как продолжение уже вычисленной
+        программы: операторы могут брать значения, оставшиеся в стеке.
+        Сколько значений останется в стеке, не проверяется.
+
+        Args:
+            tokens (Iterable): Токены (числа, переменные, операторы и скобки).
+            stack (list): Стек значений; изменяется на месте.
+            env (Mapping | None): Значения переменных.
+
+        Returns:
+            list: Тот же стек. При ошибке стек может быть изменён частично.
+
+        Raises:
+            EvaluationError: При ошибке вычисления.
+            DivisionByZeroError: При попытке деления на ноль.
+            InvalidOperandTypeError: При неподходящем типе операндов.
+            UndefinedVariableError: Если значение переменной не задано.
+            ResourceLimitError: При превышении ограничений limits.
+        """
+        if self.limits is not None:
+            return apply_limited(
+                tokens, stack, self._dispatch, self.limits, env, self.backend
+            )
+        if self.backend is not None:
+            return self._apply_backend(tokens, stack, env)
+        return self._apply(tokens, stack, env)
+
+    def _apply(self, tokens, stack, env):
+        """
+        Применяет токены к стеку в режиме exact: результат каждой операции
+        приводится к int, если он целый.
+        """
+        dispatch = self._dispatch
 
         for token in tokens:
             # Если токен - число, то добавляем в стек
             if isinstance(token, int | float):
                 stack.append(token)
+            # Если токен - переменная, то добавляем в стек её значение
+            elif isinstance(token, Variable):
+                stack.append(token.resolve(env))
             # Если токен - оператор, применяем его
-            elif token in self.supported_operators:
-                # Получаем информацию об операторе
-                operator_info = self.operators.get_operator_info(token)
+            elif token in dispatch:
+                arity, func = dispatch[token]
 
                 # Проверка на достаточность операндов
-                if len(stack) < operator_info['arity']:
+                if len(stack) < arity:
                     raise EvaluationError('Недостаточно операндов для оператора')
 
                 # Извлекаем операнды из стека, применяем оператор
                 try:
-                    if operator_info['arity'] == 1:
+                    if arity == 1:
                         # Унарный оператор
                         a = stack.pop()
-                        result = operator_info['func'](a)
-                    else:
+                        result = func(a)
+                    elif arity == 2:
                         # Бинарный оператор
                         b = stack.pop()
                         a = stack.pop()
-                        result = operator_info['func'](a, b)
+                        result = func(a, b)
+                    else:
+                        # Оператор с большим числом операндов
+                        operands = stack[-arity:]
+                        del stack[-arity:]
+                        result = func(*operands)
 
                     # Преобразовываем в int, если возможно
                     if isinstance(result, float) and result.is_integer():
@@ -74,10 +271,173 @@ class RPNEvaluator:
             else:
                 raise EvaluationError(f'Неизвестный оператор: {token}')
 
-        # Финальная проверка, что остался 1 элемент в стеке
+        return stack
+
+    def _evaluate_backend(self, tokens, env):
+        """
+        Вычисляет выражение в числовом режиме без приведения результата каждой
+        операции: значения нормализуются только в конце.
+        """
+        stack = self._apply_backend(tokens, [], env)
+
         if len(stack) != 1:
             raise EvaluationError(
                 f'Некорректное выражение: в стеке осталось {len(stack)} элементов'
             )
 
+        result = stack[0]
+        finalize = self.backend.finalize
+        return finalize(result) if finalize is not None else result
+
+    def _apply_backend(self, tokens, stack, env):
+        """
+        Применяет токены к стеку в числовом режиме. Числа режима могут быть
+        любого типа, поэтому операторы распознаются как строки.
+        """
+        coerce = self.backend.coerce
+        dispatch = self._dispatch
+        push = stack.append
+
+        for token in tokens:
+            if isinstance(token, str):
+                entry = dispatch.get(token)
+                if entry is None:
+                    if token == '(' or token == ')':
+                        continue
+                    raise EvaluationError(f'Неизвестный оператор: {token}')
+
+                arity, func = entry
+                if len(stack) < arity:
+                    raise EvaluationError('Недостаточно операндов для оператора')
+                try:
+                    if arity == 1:
+                        stack[-1] = func(stack[-1])
+                    elif arity == 2:
+                        b = stack.pop()
+                        stack[-1] = func(stack[-1], b)
+                    else:
+                        operands = stack[-arity:]
+                        del stack[-arity:]
+                        push(func(*operands))
+                except CalculatorError:
+                    raise
+                except Exception as e:
+                    raise EvaluationError(
+                        f"Ошибка при выполнении оператора '{token}': {e}"
+                    ) from e
+            elif isinstance(token, Variable):
+                value = token.resolve(env)
+                push(coerce(value) if coerce is not None else value)
+            else:
+                push(token)
+
+        return stack
+
+    def evaluate_compact(self, program, env=None):
+        """
+        Вычисляет компактную программу (CompactProgram). Тип каждого токена
+        задаётся кодом операции, поэтому в цикле нет проверок isinstance,
+        а операторы выбираются по индексу из таблицы, построенной один раз.
+
+        Args:
+            program (CompactProgram): Проверенная программа.
+            env (Mapping | None): Значения переменных выражения.
+
+        Returns:
+            float или int: Результат вычисления выражения.
+
+        Raises:
+            EvaluationError: При ошибке вычисления выражения.
+            DivisionByZeroError: При попытке деления на ноль.
+            InvalidOperandTypeError: При неподходящем типе операндов.
+            UndefinedVariableError: Если значение переменной не задано.
+            ResourceLimitError: При превышении ограничений limits.
+        """
+        if self.limits is not None:
+            return self.evaluate(program.to_tokens(), env)
+
+        # В числовых режимах, кроме exact, результат приводится только в конце
+        backend = self.backend
+        normalize = backend is None
+        coerce = backend.coerce if backend is not None else None
+
+        # Таблица разбора: код операции -> (arity, функция)
+        arities = [0] * OP_BASE
+        funcs = [None] * OP_BASE
+        for symbol in program.symbols:
+            arity, func = self._dispatch[symbol]
+            arities.append(arity)
+            funcs.append(func)
+
+        next_int = iter(program.ints).__next__
+        next_float = iter(program.floats).__next__
+        next_object = iter(program.objects).__next__
+        next_variable = map(Variable, program.names).__next__
+
+        stack = []
+        push = stack.append
+        pop = stack.pop
+        opcode = None
+
+        try:
+            for opcode in program.code:
+                if opcode >= OP_BASE:
+                    arity = arities[opcode]
+                    if arity == 1:
+                        result = funcs[opcode](pop())
+                    elif arity == 2:
+                        b = pop()
+                        result = funcs[opcode](pop(), b)
+                    else:
+                        operands = stack[-arity:]
+                        del stack[-arity:]
+                        result = funcs[opcode](*operands)
+
+                    # Преобразовываем в int, если возможно
+                    if normalize and isinstance(result, float) and result.is_integer():
+                        result = int(result)
+                    push(result)
+                elif opcode == OP_INT:
+                    push(next_int())
+                elif opcode == OP_FLOAT:
+                    push(next_float())
+                elif opcode == OP_OBJECT:
+                    push(next_object())
+                elif coerce is None:
+                    push(next_variable().resolve(env))
+                else:
+                    push(coerce(next_variable().resolve(env)))
+        except CalculatorError:
+            raise
+        except Exception as e:
+            symbol = program.symbols[opcode - OP_BASE] if opcode >= OP_BASE else None
+            raise EvaluationError(
+                f"Ошибка при выполнении оператора '{symbol}': {e}"
+            ) from e
+
+        if backend is not None and backend.finalize is not None:
+            return backend.finalize(stack[0])
         return stack[0]
+
+    def evaluate_vectorized(self, tokens, env=None):
+        """
+        Вычисляет выражение, в котором операнды - массивы NumPy, за один проход
+        векторными операциями вместо цикла по элементам.
+
+        Args:
+            tokens (list): Список токенов (числа, переменные и операторы).
+            env (Mapping | None): Значения переменных - числа или массивы.
+
+        Returns:
+            numpy.ndarray: Результат вычисления для каждого элемента.
+
+        Raises:
+            EvaluationError: При ошибке вычисления или отсутствии NumPy.
+            DivisionByZeroError: С номерами элементов (indices), где делитель равен 0.
+            InvalidOperandTypeError: С номерами элементов с нецелыми операндами.
+            UndefinedVariableError: Если значение переменной не задано.
+        """
+        # Импорт здесь, чтобы NumPy не загружался без векторного режима
+        from src.vectorized import evaluate_vectorized
+
+        return evaluate_vectorized(tokens, self.operators, env)
@@ -0,0 +1,280 @@
+import asyncio
+import sys
+
+from src.batch import BatchResult, evaluate_chunk, format_result, init_worker
+from src.calculator import Calculator
+from src.exceptions import CalculatorError
+from src.limits import EvaluationLimits
+from src.slow_log import SlowLog
+
+# Максимальная длина строки запроса в байтах
+MAX_LINE_LENGTH = 1 << 20
+# Максимальное число запросов одного соединения, ожидающих отправки ответа
+MAX_PIPELINE_DEPTH = 256
+
+
+class EvaluationServer:
+    """
+    Сервер построчного протокола: клиент присылает выражения в RPN по одному
+    на строку и получает по строке результата на каждое выражение в том же
+    порядке. Все соединения используют один общий калькулятор.
+    """
+
+    def __init__(self, calculator=None, max_concurrency=64, workers=0):
+        """
+        Args:
+            calculator (Calculator | None): Общий калькулятор сервера.
+            max_concurrency (int): Максимум одновременно вычисляемых выражений.
+            workers (int): Число процессов для вычислений; 0 - вычислять в
+                цикле событий (подходит только для лёгких выражений).
+        """
+        self.calculator = calculator if calculator is not None else Calculator()
+        self.max_concurrency = max_concurrency
+        self.workers = workers
+        self._semaphore = None
+        self._executor = None
+
+    async def start(self, host='127.0.0.1', port=0, path=None):
+        """
+        Запускает TCP-сервер или, если указан path, сервер на Unix-сокете.
+
+        Args:
+            host (str): Адрес для TCP.
+            port (int): Порт для TCP (0 - выбрать свободный).
+            path (str | None): Путь к Unix-сокету.
+
+        Returns:
+            asyncio.Server: Запущенный сервер.
+        """
+        self._semaphore = asyncio.Semaphore(self.max_concurrency)
+        if self.workers > 0 and self._executor is None:
+            # Импорт здесь, чтобы не замедлять запуск без пула процессов
+            import multiprocessing
+            from concurrent.futures import ProcessPoolExecutor
+
+            # fork из работающего цикла событий может унаследовать
+            # захваченные блокировки, поэтому процессы запускаются заново
+            self._executor = ProcessPoolExecutor(
+                max_workers=self.workers,
+                mp_context=multiprocessing.get_context('spawn'),
+                initializer=init_worker,
+                initargs=(self.calculator.worker_options(),),
+            )
+
+        if path is not None:
+            return await asyncio.start_unix_server(
+                self.handle_connection, path=path, limit=MAX_LINE_LENGTH
+            )
+        return await asyncio.start_server(
+            self.handle_connection, host, port, limit=MAX_LINE_LENGTH
+        )
+
+    def close(self):
+        """Останавливает пул процессов сервера."""
+        if self._executor is not None:
+            self._executor.shutdown(cancel_futures=True)
+            self._executor = None
+
+    async def evaluate(self, expr):
+        """
+        Вычисляет выражение с учётом ограничения параллельности.
+
+        Args:
+            expr (str): Выражение в RPN.
+
+        Returns:
+            str: Строка ответа в формате пакетного режима.
+        """
+        async with self._semaphore:
+            if self._executor is None:
+                result = next(self.calculator.evaluate_many([expr]))
+            else:
+                loop = asyncio.get_running_loop()
+                try:
+                    results = await loop.run_in_executor(
+                        self._executor, evaluate_chunk, [expr], None
+                    )
+                    result = results[0]
+                except Exception as e:
+                    # Сбой пула (например, упавший процесс) - ошибка запроса,
+                    # а не соединения
+                    error = CalculatorError(f'Ошибка при вычислении: {str(e)}')
+                    result = BatchResult(expr, error=error)
+        return format_result(result)
+
+    async def handle_connection(self, reader, writer):
+        """
+        Обслуживает одно соединение. Запросы читаются без ожидания ответов
+        (конвейер), вычисляются параллельно, а ответы пишутся по порядку.
+
+        Args:
+            reader (asyncio.StreamReader): Поток запросов.
+            writer (asyncio.StreamWriter): Поток ответов.
+        """
+        pending = asyncio.Queue(MAX_PIPELINE_DEPTH)
+        sender = asyncio.create_task(self._send_responses(pending, writer))
+        try:
+            while line := await reader.readline():
+                expr = line.decode('utf-8', errors='replace').rstrip('\r\n')
+                await pending.put(asyncio.create_task(self.evaluate(expr)))
+        except (ValueError, ConnectionError):
+            # Слишком длинная строка или разрыв соединения
+            pass
+        finally:
+            await pending.put(None)
+            await sender
+            writer.close()
+
+    @staticmethod
+    async def _send_responses(pending, writer):
+        """
+        Пишет ответы в порядке поступления запросов.
+
+        Args:
+            pending (asyncio.Queue): Задачи вычисления; None - конец запросов.
+            writer (asyncio.StreamWriter): Поток ответов.
+        """
+        while (task := await pending.get()) is not None:
+            response = await task
+            writer.write(response.encode('utf-8') + b'\n')
+            try:
+                await writer.drain()
+            except ConnectionError:
+                # Клиент отключился: дожидаемся оставшихся задач без отправки
+                continue
+
+
+def parse_args(argv=None):
+    """
+    Разбирает аргументы командной строки сервера.
+
+    Args:
+        argv (list | None): Аргументы (по умолчанию - sys.argv).
+
+    Returns:
+        argparse.Namespace: Разобранные аргументы.
+    """
+    import argparse
+
+    parser = argparse.ArgumentParser(
+        prog='python -m src.server',
+        description='Сервер вычисления выражений в RPN по построчному протоколу',
+    )
+    parser.add_argument('--host', default='127.0.0.1', help='адрес для TCP')
+    parser.add_argument('--port', type=int, default=7878, help='порт для TCP')
+    parser.add_argument('--unix', metavar='PATH', help='путь к Unix-сокету')
+    parser.add_argument(
+        '--max-concurrency',
+        type=int,
+        default=64,
+        metavar='N',
+        help='максимум одновременно вычисляемых выражений',
+    )
+    parser.add_argument(
+        '--workers',
+        type=int,
+        default=0,
+        metavar='N',
+        help='число процессов для вычислений (0 - в цикле событий)',
+    )
+    limits = parser.add_argument_group('ограничения на одно выражение')
+    limits.add_argument(
+        '--max-operations', type=int, metavar='N', help='максимум операций'
+    )
+    limits.add_argument(
+        '--max-int-bits', type=int, metavar='N', help='максимум бит в целом результате'
+    )
+    limits.add_argument(
+        '--max-stack-depth', type=int, metavar='N', help='максимальная глубина стека'
+    )
+    limits.add_argument(
+        '--timeout', type=float, metavar='SEC', help='максимальное время вычисления'
+    )
+    slow = parser.add_argument_group('журнал медленных выражений')
+    slow.add_argument(
+        '--slow-threshold',
+        type=float,
+        metavar='SEC',
+        help='записывать вычисления дольше SEC секунд',
+    )
+    slow.add_argument('--slow-log', metavar='FILE', help='файл журнала (строки JSON)')
+    slow.add_argument(
+        '--slow-profile-rate',
+        type=float,
+        default=0.0,
+        metavar='P',
+        help='доля вычислений под cProfile (от 0 до 1)',
+    )
+    return parser.parse_args(argv)
+
+
+def make_calculator(args):
+    """
+    Создаёт калькулятор сервера по аргументам командной строки.
+
+    Args:
+        args (argparse.Namespace): Разобранные аргументы.
+
+    Returns:
+        Calculator: Калькулятор с ограничениями (если задано хотя бы одно)
+            и журналом медленных выражений (если задан порог).
+    """
+    options = {
+        'max_operations': args.max_operations,
+        'max_int_bits': args.max_int_bits,
+        'max_stack_depth': args.max_stack_depth,
+        'timeout': args.timeout,
+    }
+    # Без ограничений вычисление идёт быстрым циклом без проверок
+    limits = None
+    if any(value is not None for value in options.values()):
+        limits = EvaluationLimits(**options)
+    slow_log = None
+    if args.slow_threshold is not None:
+        slow_log = SlowLog(
+            args.slow_threshold,
+            path=args.slow_log,
+            profile_rate=args.slow_profile_rate,
+        )
+    return Calculator(limits=limits, slow_log=slow_log)
+
+
+async def serve(args):
+    """
+    Запускает сервер и обслуживает соединения до остановки.
+
+    Args:
+        args (argparse.Namespace): Разобранные аргументы.
+    """
+    server = EvaluationServer(
+        make_calculator(args),
+        max_concurrency=args.max_concurrency,
+        workers=args.workers,
+    )
+    try:
+        listener = await server.start(args.host, args.port, args.unix)
+        async with listener:
+            await listener.serve_forever()
+    finally:
+        server.close()
+
+
+def main(argv=None):
+    """
+    Точка входа сервера.
+
+    Args:
+        argv (list | None): Аргументы командной строки.
+
+    Returns:
+        int: Код завершения.
+    """
+    try:
+        asyncio.run(serve(parse_args(argv)))
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
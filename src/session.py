@@ -0,0 +1,129 @@
+from src.calculator import Calculator
+from src.exceptions import CalculatorError, EvaluationError
+
+
+def _need(stack, count, command):
+    """
+    Raises:
+        EvaluationError: Если в стеке меньше count значений.
+    """
+    if len(stack) < count:
+        raise EvaluationError(f'Недостаточно значений в стеке для {command}')
+
+
+def _dup(stack):
+    _need(stack, 1, 'dup')
+    stack.append(stack[-1])
+
+
+def _drop(stack):
+    _need(stack, 1, 'drop')
+    stack.pop()
+
+
+def _swap(stack):
+    _need(stack, 2, 'swap')
+    stack[-1], stack[-2] = stack[-2], stack[-1]
+
+
+def _clear(stack):
+    stack.clear()
+
+
+def _show(stack):
+    # Стек выводится после каждой строки, команда нужна для пустой строки
+    pass
+
+
+# Команды сеанса над стеком значений
+COMMANDS = {
+    'dup': _dup,
+    'drop': _drop,
+    'swap': _swap,
+    'clear': _clear,
+    'stack': _show,
+}
+
+
+class Session:
+    """
+    Сеанс с постоянным стеком: каждая строка применяется к стеку,
+    оставшемуся от предыдущих строк, поэтому вычисляются только новые токены.
+    Кроме токенов RPN в строке могут быть команды над стеком (COMMANDS);
+    их имена нельзя использовать как переменные.
+    """
+
+    def __init__(self, calculator=None, env=None):
+        """
+        Args:
+            calculator (Calculator | None): Калькулятор, чьи разборщик и
+                вычислитель используются; по умолчанию - новый Calculator().
+            env (Mapping | None): Значения переменных.
+        """
+        self.calculator = calculator if calculator is not None else Calculator()
+        self.env = env
+        self._stack = []
+
+    def feed(self, line):
+        """
+        Применяет строку к стеку. Строка применяется целиком или никак:
+        при ошибке стек остаётся прежним.
+
+        Args:
+            line (str): Токены RPN и команды через пробелы.
+
+        Returns:
+            list: Значения стека после строки (см. values()).
+
+        Raises:
+            CalculatorError: При ошибке в строке.
+        """
+        try:
+            self._stack = self._apply(line.split(), list(self._stack))
+        except Exception as e:
+            if isinstance(e, CalculatorError):
+                raise
+            raise CalculatorError(f'Ошибка при вычислении: {str(e)}') from e
+        return self.values()
+
+    def _apply(self, parts, stack):
+        """
+        Применяет части строки к копии стека: токены между командами
+        разбираются и вычисляются вместе.
+        """
+        segment = []
+        for part in parts:
+            command = COMMANDS.get(part)
+            if command is None:
+                segment.append(part)
+                continue
+            if segment:
+                self._evaluate(segment, stack)
+                segment = []
+            command(stack)
+        if segment:
+            self._evaluate(segment, stack)
+        return stack
+
+    def _evaluate(self, segment, stack):
+        """Разбирает токены и применяет их к стеку."""
+        tokens = self.calculator.token_parser.parse(' '.join(segment))
+        self.calculator.rpn_evaluator.apply(tokens, stack, self.env)
+
+    def values(self):
+        """
+        Returns:
+            list: Значения стека от дна к вершине, нормализованные как
+                результат evaluate.
+        """
+        finalize = self.calculator.backend.finalize
+        if finalize is None:
+            return list(self._stack)
+        return [finalize(value) for value in self._stack]
+
+    def clear(self):
+        """Очищает стек."""
+        self._stack = []
+
+    def __len__(self):
+        return len(self._stack)
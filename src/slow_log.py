@@ -0,0 +1,243 @@
+import json
+import time
+from collections import deque
+
+
+class SlowLogEntry:
+    """
+    Запись о медленном вычислении: усечённое выражение, размер программы,
+    максимальная глубина стека, время этапов и, если снимался, профиль.
+    """
+
+    __slots__ = (
+        'expr',
+        'length',
+        'tokens',
+        'max_stack_depth',
+        'stages',
+        'seconds',
+        'error',
+        'profile',
+        'timestamp',
+    )
+
+    def __init__(
+        self,
+        expr,
+        length,
+        tokens,
+        max_stack_depth,
+        stages,
+        seconds,
+        error=None,
+        profile=None,
+        timestamp=None,
+    ):
+        """
+        Args:
+            expr (str): Выражение (усечённое до max_expr_length журнала).
+            length (int): Длина исходного выражения.
+            tokens (int | None): Число токенов программы; None - разбор
+                не завершился.
+            max_stack_depth (int | None): Максимальная глубина стека.
+            stages (dict): Этап -> время в секундах.
+            seconds (float): Полное время вычисления.
+            error (str | None): Класс ошибки, если вычисление не удалось.
+            profile (str | None): Отчёт cProfile по вызову.
+            timestamp (float | None): Время записи (time.time()).
+        """
+        self.expr = expr
+        self.length = length
+        self.tokens = tokens
+        self.max_stack_depth = max_stack_depth
+        self.stages = stages
+        self.seconds = seconds
+        self.error = error
+        self.profile = profile
+        self.timestamp = time.time() if timestamp is None else timestamp
+
+    def to_dict(self):
+        """
+        Returns:
+            dict: Поля записи для JSON.
+        """
+        return {name: getattr(self, name) for name in self.__slots__}
+
+    def __repr__(self):
+        return (
+            f'SlowLogEntry({self.expr!r}, seconds={self.seconds:.6f}, '
+            f'tokens={self.tokens})'
+        )
+
+
+class SlowLog:
+    """
+    Журнал вычислений, которые длились дольше порога: последние записи
+    хранятся в кольцевом буфере и, если задан файл, дописываются в него
+    строками JSON.
+    """
+
+    def __init__(
+        self,
+        threshold,
+        capacity=100,
+        path=None,
+        max_expr_length=200,
+        profile_rate=0.0,
+        profile_lines=20,
+    ):
+        """
+        Args:
+            threshold (float): Порог времени вычисления в секундах.
+            capacity (int): Число последних записей в памяти.
+            path (str | None): Файл, в который дописываются записи.
+            max_expr_length (int): Длина, до которой усекается выражение.
+            profile_rate (float): Доля вычислений (от 0 до 1), выполняемых
+                под cProfile; профиль сохраняется только у медленных.
+                Профилирование заметно замедляет вычисление.
+            profile_lines (int): Число функций в отчёте профиля.
+
+        Raises:
+            ValueError: Если параметры вне допустимых значений.
+        """
+        if threshold < 0:
+            raise ValueError('Порог журнала не может быть отрицательным')
+        if capacity <= 0:
+            raise ValueError('Размер журнала должен быть положительным')
+        if max_expr_length <= 0:
+            raise ValueError('Длина выражения должна быть положительной')
+        if not 0 <= profile_rate <= 1:
+            raise ValueError('Доля профилирования должна быть от 0 до 1')
+        self.threshold = threshold
+        self.capacity = capacity
+        self.path = path
+        self.max_expr_length = max_expr_length
+        self.profile_rate = profile_rate
+        self.profile_lines = profile_lines
+        self._entries = deque(maxlen=capacity)
+
+    def profiler(self):
+        """
+        Возвращает профилировщик для очередного вычисления, если оно
+        попало в выборку profile_rate.
+
+        Returns:
+            cProfile.Profile | None: Профилировщик или None.
+        """
+        if not self.profile_rate:
+            return None
+        import random
+
+        if self.profile_rate < 1 and random.random() >= self.profile_rate:
+            return None
+        import cProfile
+
+        return cProfile.Profile()
+
+    def observe(self, expr, measurement, operators, profiler=None):
+        """
+        Записывает вычисление, если оно длилось дольше порога.
+
+        Args:
+            expr (str): Выражение; не строка (ошибочный ввод) записывается
+                как repr.
+            measurement (Measurement): Замер вычисления.
+            operators (Operators): Операторы программы (для глубины стека).
+            profiler (cProfile.Profile | None): Профилировщик вызова.
+
+        Returns:
+            SlowLogEntry | None: Добавленная запись или None.
+        """
+        if measurement.seconds < self.threshold:
+            return None
+
+        # Вызывается из finally вычисления: ошибка здесь заменила бы
+        # исходную ошибку разбора
+        text = expr if isinstance(expr, str) else repr(expr)
+        tokens = measurement.tokens
+        entry = SlowLogEntry(
+            _truncate(text, self.max_expr_length),
+            len(text),
+            len(tokens) if tokens is not None else None,
+            max_stack_depth(tokens, operators) if tokens is not None else None,
+            dict(measurement.stages),
+            measurement.seconds,
+            type(measurement.error).__name__ if measurement.error else None,
+            _profile_text(profiler, self.profile_lines) if profiler else None,
+        )
+        self._entries.append(entry)
+        if self.path is not None:
+            with open(self.path, 'a', encoding='utf-8') as file:
+                file.write(json.dumps(entry.to_dict(), ensure_ascii=False) + '\n')
+        return entry
+
+    def entries(self):
+        """
+        Returns:
+            list: Записи от старых к новым.
+        """
+        return list(self._entries)
+
+    def clear(self):
+        """Очищает записи в памяти (файл не изменяется)."""
+        self._entries.clear()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def __reduce__(self):
+        # В другой процесс передаются только настройки, без записей
+        return (
+            SlowLog,
+            (
+                self.threshold,
+                self.capacity,
+                self.path,
+                self.max_expr_length,
+                self.profile_rate,
+                self.profile_lines,
+            ),
+        )
+
+
+def max_stack_depth(tokens, operators):
+    """
+    Вычисляет максимальную глубину стека при вычислении программы.
+
+    Args:
+        tokens (Iterable): Токены программы.
+        operators (Operators): Операторы программы.
+
+    Returns:
+        int: Максимальное число значений в стеке.
+    """
+    operator_symbols = operators.get_operators()
+    depth = peak = 0
+    for token in tokens:
+        if isinstance(token, str):
+            if token in operator_symbols:
+                depth -= operators.get_operator_info(token).arity - 1
+            # Скобки на стек не влияют
+            continue
+        depth += 1
+        if depth > peak:
+            peak = depth
+    return peak
+
+
+def _truncate(expr, max_length):
+    """Усекает выражение, отмечая усечение многоточием."""
+    if len(expr) <= max_length:
+        return expr
+    return expr[: max_length - 3] + '...'
+
+
+def _profile_text(profiler, lines):
+    """Возвращает отчёт профиля: функции по накопленному времени."""
+    import io
+    import pstats
+
+    stream = io.StringIO()
+    stats = pstats.Stats(profiler, stream=stream)
+    stats.sort_stats('cumulative').print_stats(lines)
+    return stream.getvalue()
@@ -1,5 +1,11 @@
+import codecs
+
 from src.exceptions import ParserError
-from src.operators import Operators
+from src.operators import DEFAULT_OPERATORS
+from src.variable import Variable
+
+# Размер куска, которым читается длинное выражение
+CHUNK_SIZE = 1 << 16
 
 
 class TokenParser:
@@ -7,9 +13,20 @@ class TokenParser:
     Класс для токенизации строки выражения в RPN на токены.
     """
 
-    def __init__(self):
-        self.operators = Operators()
+    def __init__(self, operators=None, backend=None):
+        """
+        Args:
+            operators (Operators | None): Операторы; по умолчанию - общий
+                реестр встроенных операторов.
+            backend (NumericBackend | None): Числовой режим, задающий тип
+                чисел; None - int и float с приведением целых к int.
+        """
+        self.operators = operators if operators is not None else DEFAULT_OPERATORS
+        self._parse_number = backend.parse_number if backend is not None else None
         self.supported_operators = self.operators.get_operators()
+        self._arities = {
+            symbol: spec.arity for symbol, spec in self.operators.operators.items()
+        }
 
     def parse(self, expr):
         """
@@ -19,96 +36,322 @@ class TokenParser:
             expr (str): Строка с выражением в RPN.
 
         Returns:
-            list: Список токенов (числа и операторы).
+            list: Список токенов (числа, переменные и операторы).
 
         Raises:
             ParserError: При ошибке в разборе токенов.
         """
-        if not expr or not (processed_expr := expr.strip()):
+        # Результат - полный список, поэтому токенизация и проверка скобок
+        # идут двумя простыми проходами: так быстрее, чем цепочка генераторов
+        tokens = self.tokenize(expr)
+
+        # Проверка на валидность скобок и содержимого
+        self.validate(tokens)
+
+        return tokens
+
+    def try_parse(self, expr):
+        """
+        То же, что parse, но ошибка разбора возвращается, а не выбрасывается:
+        в пакетной обработке ошибочные строки часты, а исключение дороже
+        возвращаемого значения.
+
+        Args:
+            expr (str): Строка с выражением в RPN.
+
+        Returns:
+            tuple: (токены, None) или (None, ParserError).
+        """
+        tokens, error = self.try_tokenize(expr)
+        if error is None:
+            error = self.check(tokens)
+        if error is not None:
+            return None, error
+        return tokens, None
+
+    def try_tokenize(self, expr):
+        """
+        То же, что tokenize, но ошибка разбора возвращается, а не выбрасывается.
+
+        Args:
+            expr (str): Строка с выражением в RPN.
+
+        Returns:
+            tuple: (токены, None) или (None, ParserError).
+        """
+        if not expr or expr.isspace():
+            return None, ParserError('Пустое выражение')
+        errors = []
+        tokens = list(self._tokenize(self._split(expr), errors))
+        if errors:
+            return None, errors[0]
+        return tokens, None
+
+    def tokenize(self, expr):
+        """
+        Разбивает выражение на токены без проверки скобок.
+
+        Args:
+            expr (str): Строка с выражением в RPN.
+
+        Returns:
+            list: Список токенов (числа, переменные, операторы и скобки).
+
+        Raises:
+            ParserError: При пустом выражении или неизвестном токене.
+        """
+        return list(self._tokenize(self._split(expr)))
+
+    def iter_tokens(self, expr):
+        """
+        Лениво токенизирует выражение, проверяя скобки за тот же проход.
+        Строка разбирается кусками, а для проверки хранится только состояние
+        открытых скобок, поэтому дополнительная память пропорциональна
+        глубине вложенности, а не длине выражения.
+
+        Args:
+            expr (str): Строка с выражением в RPN.
+
+        Returns:
+            Iterator: Токены выражения (числа, переменные, операторы и скобки).
+
+        Raises:
+            ParserError: При пустом выражении - сразу, при остальных ошибках
+                разбора - в момент их обнаружения во время итерации.
+        """
+        return self._validate(self._tokenize(self._split(expr)))
+
+    def iter_stream_tokens(self, stream, chunk_size=CHUNK_SIZE):
+        """
+        Лениво токенизирует выражение из файлового объекта или mmap, читая его
+        кусками: текст выражения целиком в памяти не хранится.
+
+        Args:
+            stream: Объект с методом read(size), возвращающим str или bytes
+                (текстовый или двоичный файл, io.StringIO, mmap.mmap).
+            chunk_size (int): Размер читаемого куска.
+
+        Yields:
+            Токены выражения (числа, переменные, операторы и скобки).
+
+        Raises:
+            ParserError: При ошибке в разборе токенов или пустом выражении.
+        """
+        parts = _iter_parts(_read_chunks(stream, chunk_size))
+        first = next(parts, None)
+        if first is None:
+            raise ParserError('Пустое выражение')
+
+        yield from self._validate(self._tokenize(_prepend(first, parts)))
+
+    @staticmethod
+    def _split(expr):
+        """
+        Разбивает выражение на части по пробелам. Длинные выражения
+        разбиваются кусками, без построения полного списка частей.
+
+        Args:
+            expr (str): Строка с выражением в RPN.
+
+        Returns:
+            Iterable[str]: Части выражения.
+
+        Raises:
+            ParserError: Если выражение пустое.
+        """
+        if not expr or expr.isspace():
             raise ParserError('Пустое выражение')
 
-        tokens = []
+        if len(expr) <= CHUNK_SIZE:
+            return expr.split()
+        return _iter_parts(
+            expr[start : start + CHUNK_SIZE]
+            for start in range(0, len(expr), CHUNK_SIZE)
+        )
+
+    def _tokenize(self, parts, errors=None):
+        """
+        Превращает строковые части выражения в токены.
+
+        Args:
+            parts (Iterable[str]): Части выражения, разделённые пробелами.
+            errors (list | None): Список, в который записывается ошибка
+                вместо выброса; разбор при этом прекращается.
+
+        Yields:
+            Токены (числа, переменные, операторы и скобки).
 
-        for part in processed_expr.split():
+        Raises:
+            ParserError: При неизвестном токене.
+        """
+        supported_operators = self.supported_operators
+        parse_number = self._parse_number
+
+        for part in parts:
             # Проверка на оператор
-            if part in self.supported_operators:
-                tokens.append(part)
+            if part in supported_operators:
+                yield part
                 continue
 
             # Проверка на скобки
-            if part in '()':
-                tokens.append(part)
+            if part == '(' or part == ')':
+                yield part
                 continue
 
             # Проверка на число
             try:
-                num = float(part) if '.' in part else int(part)
-                if isinstance(num, float) and num.is_integer():
-                    num = int(num)
-                tokens.append(num)
+                if parse_number is None:
+                    num = float(part) if '.' in part else int(part)
+                    if isinstance(num, float) and num.is_integer():
+                        num = int(num)
+                else:
+                    num = parse_number(part)
             except ValueError:
-                raise ParserError(f'Неизвестный токен: {part}') from None
-
-        # Проверка на валидность скобок и содержимого
-        self._check_parentheses_content(tokens)
-
-        return tokens
+                # Проверка на имя переменной
+                if not part.isidentifier():
+                    error = ParserError(f'Неизвестный токен: {part}')
+                    if errors is None:
+                        raise error from None
+                    errors.append(error)
+                    return
+                yield Variable(part)
+            else:
+                yield num
 
-    def _check_parentheses_content(self, tokens):
+    def _validate(self, tokens, errors=None):
         """
-        Проверяет, что каждое выражение в скобках является корректным RPN.
+        Пропускает токены дальше, проверяя, что каждое выражение в скобках
+        является корректным RPN. Размер стека вычислений моделируется без
+        хранения значений: для каждой открытой скобки запоминается только
+        размер стека снаружи неё.
+
         Args:
-            tokens (list): список токенов
+            tokens (Iterable): Токены выражения.
+            errors (list | None): Список, в который записывается ошибка
+                вместо выброса; проверка при этом прекращается.
+
+        Yields:
+            Те же токены.
+
         Raises:
-            ParserError: если выражение в скобках некорректное
+            ParserError: Если скобки несбалансированы или выражение
+                в скобках некорректное.
         """
-        stack = []  # Стек с подвыражениями
-        subexpr = []  # Токены для текущего подвыражения
+        arities = self._arities
+        outer = []  # (размер стека, корректность) уровней снаружи открытых скобок
+        stack_size = 0  # Размер стека текущего уровня
+        valid = True  # Хватало ли операндов всем операторам текущего уровня
 
         for token in tokens:
-            if token == '(':
-                # Кидаем в стек подвыражение и создаём новое
-                stack.append(subexpr)
-                subexpr = []
+            arity = arities.get(token)
+            if arity is not None:
+                # Применение оператора: снимаем arity, кладём один результат
+                if stack_size < arity:
+                    valid = False
+                else:
+                    stack_size = stack_size - arity + 1
+            elif token == '(':
+                # Запоминаем внешний уровень и начинаем подвыражение
+                outer.append((stack_size, valid))
+                stack_size = 0
+                valid = True
             elif token == ')':
+                error = None
                 # Не нашли открывающую скобку
-                if not stack:
-                    raise ParserError('Лишняя закрывающая скобка')
-                # Проверяем подвыражение внутри скобок на корректный RPN
-                if not self._is_valid_rpn(subexpr):
-                    raise ParserError('Некорректное выражение внутри скобок')
-                # Сворачиваем подвыражение до одного значения: помещаем плейсхолдер
-                subexpr = stack.pop()
-                subexpr.append(0)  # любое значение вместо скобок (плейсхолдер)
+                if not outer:
+                    error = ParserError('Лишняя закрывающая скобка')
+                # Корректное RPN выражение оставляет ровно одно значение на стеке
+                elif not valid or stack_size != 1:
+                    error = ParserError('Некорректное выражение внутри скобок')
+                if error is not None:
+                    if errors is None:
+                        raise error
+                    errors.append(error)
+                    return
+                # Сворачиваем подвыражение до одного значения во внешнем уровне
+                stack_size, valid = outer.pop()
+                stack_size += 1
             else:
-                # Копим токены текущего подвыражения
-                subexpr.append(token)
+                # Операнд кладёт значение на стек
+                stack_size += 1
+            yield token
 
         # После всех токенов стек должен быть пустым — иначе не хватило ')'
-        if stack:
-            raise ParserError('Лишняя открывающая скобка')
+        if outer:
+            error = ParserError('Лишняя открывающая скобка')
+            if errors is None:
+                raise error
+            errors.append(error)
+
+    def validate(self, tokens):
+        """
+        Проверяет, что каждое выражение в скобках является корректным RPN
+        (второй этап parse после tokenize).
+        Args:
+            tokens (Iterable): список токенов
+        Raises:
+            ParserError: если выражение в скобках некорректное
+        """
+        for _ in self._validate(tokens):
+            pass
 
-    def _is_valid_rpn(self, tokens):
+    def check(self, tokens):
         """
-        Проверяет, что список токенов представляет корректное RPN-выражение.
+        То же, что validate, но ошибка возвращается, а не выбрасывается.
         Args:
-            tokens (list)
+            tokens (Iterable): список токенов
         Returns:
-            bool
+            ParserError | None: Первая ошибка в скобках или None.
         """
-        stack_size = 0  # Моделируем размер стека вычислений без хранения значений
-        for token in tokens:
-            if isinstance(token, (int, float)):
-                # Операнд кладёт значение на стек
-                stack_size += 1
-            elif token in self.supported_operators:
-                # Проверяем достаточность операндов для оператора заданной arity
-                arity = self.operators.get_operator_info(token)['arity']
-                if stack_size < arity:
-                    return False
-                # Применение оператора: снимаем arity, кладём один результат
-                stack_size = stack_size - arity + 1
-            else:
-                return False
-        # Корректное RPN выражение оставляет ровно одно значение на стеке
-        return stack_size == 1
+        errors = []
+        for _ in self._validate(tokens, errors):
+            pass
+        return errors[0] if errors else None
+
+
+def _read_chunks(stream, chunk_size):
+    """
+    Читает поток кусками, декодируя байты как UTF-8 с учётом символов,
+    разрезанных границей куска.
+
+    Yields:
+        str: Куски текста.
+    """
+    decoder = None
+    while chunk := stream.read(chunk_size):
+        if isinstance(chunk, bytes | bytearray):
+            if decoder is None:
+                decoder = codecs.getincrementaldecoder('utf-8')('replace')
+            chunk = decoder.decode(chunk)
+        yield chunk
+    if decoder is not None:
+        yield decoder.decode(b'', final=True)
+
+
+def _prepend(first, rest):
+    """Возвращает итератор из first и элементов rest."""
+    yield first
+    yield from rest
+
+
+def _iter_parts(chunks):
+    """
+    Разбивает поток кусков текста на части, разделённые пробелами.
+    Часть, разрезанная границей куска, склеивается со следующим куском.
+
+    Args:
+        chunks (Iterable[str]): Куски текста.
+
+    Yields:
+        str: Части текста без пробелов.
+    """
+    tail = ''
+    for chunk in chunks:
+        if not chunk:
+            continue
+        parts = (tail + chunk).split() if tail else chunk.split()
+        # Последняя часть может продолжиться в следующем куске
+        tail = parts.pop() if parts and not chunk[-1].isspace() else ''
+        yield from parts
+    if tail:
+        yield tail
@@ -0,0 +1,56 @@
+from src.exceptions import UndefinedVariableError
+
+
+class Variable:
+    """
+    Токен именованной переменной. Значение берётся из окружения (env),
+    переданного при вычислении, поэтому выражение разбирается один раз
+    и вычисляется для любого числа наборов значений.
+    """
+
+    __slots__ = ('name',)
+
+    def __init__(self, name):
+        self.name = name
+
+    def resolve(self, env):
+        """
+        Возвращает значение переменной из окружения.
+
+        Args:
+            env (Mapping | None): Окружение с значениями переменных.
+
+        Returns:
+            float или int: Значение переменной.
+
+        Raises:
+            UndefinedVariableError: Если значение переменной не задано.
+        """
+        try:
+            value = env[self.name]
+        except (KeyError, TypeError):
+            raise self.undefined() from None
+
+        # Приводим к int так же, как числа в самом выражении
+        if isinstance(value, float) and value.is_integer():
+            value = int(value)
+        return value
+
+    def undefined(self):
+        """
+        Returns:
+            UndefinedVariableError: Ошибка для переменной без значения.
+        """
+        return UndefinedVariableError(f'Неизвестная переменная: {self.name}')
+
+    def __eq__(self, other):
+        return isinstance(other, Variable) and other.name == self.name
+
+    def __hash__(self):
+        return hash((Variable, self.name))
+
+    def __repr__(self):
+        return f'Variable({self.name!r})'
+
+    def __str__(self):
+        return self.name
@@ -0,0 +1,380 @@
+import math
+from functools import cache
+
+from src.backends import FLOAT64
+from src.exceptions import (
+    CalculatorError,
+    DivisionByZeroError,
+    EvaluationError,
+    InvalidOperandTypeError,
+)
+from src.operators import DEFAULT_OPERATORS
+from src.variable import Variable
+
+# NumPy - необязательная зависимость, нужна только для векторного режима
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - зависит от окружения
+    np = None
+
+
+def _require_numpy():
+    """
+    Проверяет, что NumPy установлен.
+
+    Raises:
+        EvaluationError: Если NumPy недоступен.
+    """
+    if np is None:
+        raise EvaluationError('Для векторного вычисления требуется пакет numpy')
+
+
+def _failed_indices(mask, *operands):
+    """
+    Возвращает номера элементов, для которых mask истинна, с учётом
+    приведения формы (broadcasting) операндов.
+    """
+    shape = np.broadcast_shapes(*(np.shape(operand) for operand in operands))
+    return np.flatnonzero(np.broadcast_to(mask, shape)).tolist()
+
+
+def _check_divisor(a, b, message):
+    """
+    Проверяет делитель на ноль поэлементно.
+
+    Raises:
+        DivisionByZeroError: С номерами элементов, где делитель равен нулю.
+    """
+    zero = b == 0
+    if np.any(zero):
+        raise DivisionByZeroError(message, indices=_failed_indices(zero, a, b))
+
+
+def _check_integers(a, b, operator):
+    """
+    Проверяет поэлементно, что операнды целые. В скалярном режиме целые
+    вещественные значения приводятся к int, поэтому здесь проверяется
+    целочисленность значения, а не тип массива.
+
+    Raises:
+        InvalidOperandTypeError: С номерами элементов с нецелыми операндами.
+    """
+    not_integer = (~np.isfinite(a) | (a != np.floor(a))) | (
+        ~np.isfinite(b) | (b != np.floor(b))
+    )
+    if np.any(not_integer):
+        raise InvalidOperandTypeError(
+            f"Операнды должны быть целыми числами для операции '{operator}'",
+            indices=_failed_indices(not_integer, a, b),
+        )
+
+
+def _division(a, b):
+    """Поэлементное деление с проверкой деления на ноль."""
+    _check_divisor(a, b, 'Деление на ноль')
+    return np.true_divide(a, b)
+
+
+def _integer_division(a, b):
+    """Поэлементное целочисленное деление с проверками."""
+    _check_integers(a, b, '//')
+    _check_divisor(a, b, 'Целочисленное деление на ноль')
+    return np.floor_divide(a, b)
+
+
+def _modulo(a, b):
+    """Поэлементный остаток от деления с проверками."""
+    _check_integers(a, b, '%')
+    _check_divisor(a, b, 'Остаток от деления на ноль')
+    return np.mod(a, b)
+
+
+@cache
+def get_vector_funcs():
+    """
+    Возвращает векторные аналоги встроенных операторов.
+
+    Returns:
+        dict: Оператор -> функция над массивами.
+
+    Raises:
+        EvaluationError: Если NumPy недоступен.
+    """
+    _require_numpy()
+    return {
+        '+': np.add,
+        '-': np.subtract,
+        '*': np.multiply,
+        '/': _division,
+        '//': _integer_division,
+        '%': _modulo,
+        '^': np.power,
+        '~': np.negative,
+        '@': np.positive,
+    }
+
+
+def _as_array(value):
+    """
+    Приводит операнд к массиву float64.
+
+    Raises:
+        EvaluationError: Если значение нельзя представить как float64.
+    """
+    try:
+        return np.asarray(value, dtype=np.float64)
+    except (TypeError, ValueError, OverflowError) as e:
+        raise EvaluationError(f'Некорректный операнд: {e}') from e
+
+
+def _vector_func(spec, vector_funcs):
+    """
+    Возвращает векторную функцию оператора: заданную в описании или, для
+    встроенного оператора (в режимах exact и float64), из get_vector_funcs().
+    """
+    if spec.vector_func is not None:
+        return spec.vector_func
+    if any(
+        registry.operators.get(spec.symbol) is spec
+        for registry in (DEFAULT_OPERATORS, FLOAT64.operators)
+    ):
+        return vector_funcs.get(spec.symbol)
+    return None
+
+
+def evaluate_vectorized(tokens, operators, env=None):
+    """
+    Вычисляет выражение в RPN, где операнды - числа или массивы NumPy.
+    Все значения приводятся к float64; переполнение и недопустимые операции
+    (кроме проверяемых /, // и %) дают inf/nan по правилам IEEE 754.
+
+    Args:
+        tokens (list): Список токенов.
+        operators (Operators): Операторы (используются arity и vector_func).
+        env (Mapping | None): Значения переменных - числа или массивы.
+
+    Returns:
+        numpy.ndarray: Результат вычисления для каждого элемента.
+
+    Raises:
+        EvaluationError: При ошибке вычисления выражения.
+        DivisionByZeroError: С номерами элементов, где делитель равен нулю.
+        InvalidOperandTypeError: С номерами элементов с нецелыми операндами.
+        UndefinedVariableError: Если значение переменной не задано.
+    """
+    vector_funcs = get_vector_funcs()
+    supported_operators = operators.get_operators()
+    stack = []
+
+    with np.errstate(divide='ignore', invalid='ignore', over='ignore'):
+        for token in tokens:
+            if isinstance(token, int | float):
+                stack.append(_as_array(token))
+            elif isinstance(token, Variable):
+                stack.append(_as_array(token.resolve(env)))
+            elif token in supported_operators:
+                spec = operators.get_operator_info(token)
+                arity = spec.arity
+                vector_func = _vector_func(spec, vector_funcs)
+                if vector_func is None:
+                    raise EvaluationError(
+                        f"Оператор '{token}' не поддерживается в векторном режиме"
+                    )
+                if len(stack) < arity:
+                    raise EvaluationError('Недостаточно операндов для оператора')
+
+                operands = stack[-arity:]
+                del stack[-arity:]
+                try:
+                    stack.append(vector_func(*operands))
+                except CalculatorError:
+                    raise
+                except Exception as e:
+                    raise EvaluationError(
+                        f"Ошибка при выполнении оператора '{token}': {e}"
+                    ) from e
+            elif token in ('(', ')'):
+                continue
+            else:
+                raise EvaluationError(f'Неизвестный оператор: {token}')
+
+    if len(stack) != 1:
+        raise EvaluationError(
+            f'Некорректное выражение: в стеке осталось {len(stack)} элементов'
+        )
+
+    return np.asarray(stack[0])
+
+
+# Граница точного представления целых в float64: начиная с неё соседние
+# целые округляются к одному значению
+MAX_EXACT_INT = 2**53
+# Место числа в каркасе выражения
+LITERAL = None
+_NUMBER_TYPES = frozenset((int, float))
+
+
+def split_literals(tokens):
+    """
+    Разделяет программу на каркас (операторы, переменные и скобки, где
+    числа заменены на LITERAL) и числа. Выражения с одинаковым каркасом
+    отличаются только числами и вычисляются одним векторным проходом.
+
+    Args:
+        tokens (list): Токены выражения.
+
+    Returns:
+        tuple: (каркас - кортеж, пригодный как ключ словаря; список чисел).
+    """
+    number_types = _NUMBER_TYPES
+    skeleton = []
+    literals = []
+    for token in tokens:
+        if token.__class__ in number_types:
+            skeleton.append(LITERAL)
+            literals.append(token)
+        else:
+            skeleton.append(token)
+    return tuple(skeleton), literals
+
+
+def evaluate_skeleton(skeleton, literals, operators, env=None, exact=True):
+    """
+    Вычисляет группу выражений с общим каркасом: числа каждого места
+    каркаса образуют столбец, и программа выполняется один раз над
+    столбцами. Значение выражения возвращается, только если векторный
+    результат совпадает со скалярным: для выражений с поэлементной ошибкой,
+    с бесконечным или неопределённым промежуточным значением, а в режиме
+    exact - и с числом или промежуточным значением не меньше MAX_EXACT_INT
+    по модулю (скалярный режим считает его точно в int) возвращается None.
+
+    Args:
+        skeleton (tuple): Каркас из split_literals.
+        literals (list): Списки чисел выражений группы.
+        operators (Operators): Операторы.
+        env (Mapping | None): Значения переменных, общие для группы.
+        exact (bool): Режим exact (целые значения - точные int).
+
+    Returns:
+        list: Значение каждого выражения или None, если выражение нужно
+            вычислить в скалярном режиме.
+
+    Raises:
+        EvaluationError: Если группу нельзя вычислить векторно (например,
+            у оператора нет векторной функции) или NumPy недоступен.
+    """
+    _require_numpy()
+    values = [None] * len(literals)
+    try:
+        columns = np.array(literals, dtype=np.float64).reshape(len(literals), -1)
+    except OverflowError:
+        # Целые вне диапазона float64 вычисляются только скалярно
+        rows = [
+            row
+            for row, numbers in enumerate(literals)
+            if all(abs(value) < MAX_EXACT_INT for value in numbers)
+        ]
+        columns = np.array([literals[row] for row in rows], dtype=np.float64).reshape(
+            len(rows), -1
+        )
+    else:
+        rows = list(range(len(literals)))
+        if exact:
+            exact_rows = (np.abs(columns) < MAX_EXACT_INT).all(axis=1)
+            if not exact_rows.all():
+                rows = np.flatnonzero(exact_rows).tolist()
+                columns = columns[exact_rows]
+
+    while rows:
+        try:
+            result, unsafe = _evaluate_columns(skeleton, columns, operators, env, exact)
+        except EvaluationError as e:
+            if not e.indices:
+                raise
+            # Выражения с ошибкой вычисляются скалярно, остальные - заново
+            keep = np.ones(len(rows), dtype=bool)
+            keep[list(e.indices)] = False
+            rows = [row for row, kept in zip(rows, keep.tolist(), strict=True) if kept]
+            columns = columns[keep]
+            continue
+
+        for row, value, skip in zip(
+            rows, result.tolist(), unsafe.tolist(), strict=True
+        ):
+            if not skip:
+                values[row] = int(value) if value.is_integer() else value
+        break
+
+    return values
+
+
+def _scalar_power(a, b):
+    """
+    Поэлементная степень через ** над float: np.power для некоторых
+    показателей (например, 2 и 0.5) округляет иначе, чем скалярный режим.
+    Комплексные результаты и ошибки дают nan.
+    """
+    result = []
+    for base, exponent in zip(a.tolist(), b.tolist(), strict=True):
+        try:
+            value = base**exponent
+        except (ArithmeticError, ValueError):
+            value = math.nan
+        result.append(value if isinstance(value, float) else math.nan)
+    return np.array(result, dtype=np.float64)
+
+
+def _evaluate_columns(skeleton, columns, operators, env, exact):
+    """
+    Выполняет каркас над столбцами чисел.
+
+    Returns:
+        tuple: (результаты, маска выражений с неточным результатом).
+    """
+    vector_funcs = get_vector_funcs()
+    size = columns.shape[0]
+    unsafe = np.zeros(size, dtype=bool)
+    stack = []
+    column = 0
+
+    with np.errstate(divide='ignore', invalid='ignore', over='ignore'):
+        for token in skeleton:
+            if token is LITERAL:
+                stack.append(columns[:, column])
+                column += 1
+            elif isinstance(token, Variable):
+                value = token.resolve(env)
+                if not isinstance(value, int | float) or (
+                    exact and abs(value) >= MAX_EXACT_INT
+                ):
+                    raise EvaluationError(
+                        f'Значение {token} нельзя точно вычислить векторно'
+                    )
+                stack.append(np.full(size, value, dtype=np.float64))
+            elif token in ('(', ')'):
+                continue
+            else:
+                spec = operators.get_operator_info(token)
+                vector_func = _vector_func(spec, vector_funcs)
+                if vector_func is None:
+                    raise EvaluationError(
+                        f"Оператор '{token}' не поддерживается в векторном режиме"
+                    )
+                if vector_func is vector_funcs['^']:
+                    vector_func = _scalar_power
+                if len(stack) < spec.arity:
+                    raise EvaluationError('Недостаточно операндов для оператора')
+                operands = stack[-spec.arity :]
+                del stack[-spec.arity :]
+                result = vector_func(*operands)
+                unsafe |= ~np.isfinite(result)
+                if exact:
+                    unsafe |= np.abs(result) >= MAX_EXACT_INT
+                stack.append(result)
+
+    if len(stack) != 1:
+        raise EvaluationError(
+            f'Некорректное выражение: в стеке осталось {len(stack)} элементов'
+        )
+
+    return stack[0], unsafe
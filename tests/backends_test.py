@@ -0,0 +1,116 @@
+import subprocess
+import sys
+from decimal import Decimal
+from fractions import Fraction
+
+import pytest
+from src.backends import EXACT, FLOAT64, NumericBackend, get_backend, is_builtin_backend
+from src.calculator import Calculator
+from src.exceptions import (
+    CalculatorError,
+    DivisionByZeroError,
+    EvaluationError,
+    InvalidOperandTypeError,
+    ParserError,
+)
+from src.limits import EvaluationLimits
+
+
+class TestBackends:
+    def test_get_backend(self):
+        """Проверка выбора числового режима"""
+        assert get_backend(None) is EXACT
+        assert get_backend('float64') is FLOAT64
+        assert get_backend(FLOAT64) is FLOAT64
+        with pytest.raises(ValueError):
+            get_backend('complex')
+        with pytest.raises(ValueError):
+            Calculator(backend='complex')
+
+        decimal = get_backend('decimal')
+        assert get_backend('decimal') is decimal
+        assert is_builtin_backend(decimal) and is_builtin_backend(FLOAT64)
+        custom = NumericBackend('decimal', decimal.operators)
+        assert not is_builtin_backend(custom)
+
+    def test_lazy_modules(self):
+        """Проверка, что режимы decimal и fraction не загружаются при запуске"""
+        code = (
+            'import sys, src.main; '
+            "print(*(m in sys.modules for m in ('decimal', 'fractions', 're')))"
+        )
+        output = subprocess.run(
+            [sys.executable, '-c', code], capture_output=True, text=True, check=True
+        ).stdout
+        assert output.split() == ['False', 'False', 'False']
+
+    def test_float64(self):
+        """Проверка режима float64: целые результаты приводятся только в конце"""
+        calculator = Calculator(backend='float64')
+        assert calculator.evaluate('0.1 0.2 +') == 0.1 + 0.2
+        result = calculator.evaluate('2.5 2 *')
+        assert result == 5 and isinstance(result, int)
+        assert calculator.evaluate('7 2 //') == 3
+        assert calculator.evaluate('7 ~ 2 %') == 1
+        assert calculator.evaluate('x 2 ^', {'x': 1.5}) == 2.25
+        with pytest.raises(InvalidOperandTypeError):
+            calculator.evaluate('7.5 2 //')
+        with pytest.raises(DivisionByZeroError):
+            calculator.evaluate('1 0 /')
+        with pytest.raises(ParserError):
+            calculator.evaluate(f'{10**400} 1 +')
+
+    def test_decimal(self):
+        """Проверка режима decimal без двоичного округления"""
+        calculator = Calculator(backend='decimal')
+        assert calculator.evaluate('0.1 0.2 +') == Decimal('0.3')
+        assert calculator.evaluate('x 0.1 +', {'x': 0.2}) == Decimal('0.3')
+        assert calculator.evaluate('7 ~ 2 //') == Decimal(-4)
+        assert calculator.evaluate('7 ~ 2 %') == Decimal(1)
+        with pytest.raises(InvalidOperandTypeError):
+            calculator.evaluate('7.5 2 %')
+        with pytest.raises(DivisionByZeroError):
+            calculator.evaluate('1 0.0 /')
+        with pytest.raises(DivisionByZeroError):
+            calculator.evaluate('0 1 ~ ^')
+        with pytest.raises(EvaluationError, match='Степень не определена'):
+            calculator.evaluate('2 ~ 0.5 ^')
+
+        # Оптимизатор не применяется, а memoize действует и с optimize
+        calculator = Calculator(backend='decimal', optimize=True, memoize=True)
+        assert calculator.optimizer is None
+        assert calculator.evaluate('( 0.1 0.2 + ) ( 0.1 0.2 + ) +') == Decimal('0.6')
+
+    def test_fraction(self):
+        """Проверка режима fraction с точными дробями"""
+        calculator = Calculator(backend='fraction')
+        assert calculator.evaluate('1 3 / 1 6 / +') == Fraction(1, 2)
+        assert calculator.evaluate('0.1 3 *') == Fraction(3, 10)
+        assert calculator.evaluate('2 3 / 2 ~ ^') == Fraction(9, 4)
+        with pytest.raises(InvalidOperandTypeError):
+            calculator.evaluate('2 0.5 ^')
+        with pytest.raises(DivisionByZeroError):
+            calculator.evaluate('0 1 ~ ^')
+
+    @pytest.mark.parametrize('backend', ['exact', 'float64', 'decimal', 'fraction'])
+    def test_all_modes(self, backend):
+        """Проверка согласованности режимов калькулятора"""
+        calculator = Calculator(cache_size=8, optimize=True, backend=backend)
+        expr = '( x 3 * ) 1.5 + 2 /'
+        env = {'x': 2}
+        expected = calculator.evaluate(expr, env)
+        assert expected == Fraction(15, 4)
+        assert calculator.compile(expr).run(env) == expected
+        assert calculator.evaluate_compact(calculator.encode(expr), env) == expected
+        assert next(calculator.evaluate_many([expr], env)).value == expected
+
+        # 0 ^ 0 = 1 во всех режимах
+        for zero_power in ('0 0 ^', '0.0 0 ^', '0 0.0 ^'):
+            assert calculator.evaluate(zero_power) == 1
+
+        limited = Calculator(limits=EvaluationLimits(max_int_bits=64), backend=backend)
+        assert limited.evaluate(expr, env) == expected
+        if backend in ('exact', 'fraction'):
+            # Размер оценивается только для точных чисел
+            with pytest.raises(CalculatorError):
+                limited.evaluate('3 100 ^')
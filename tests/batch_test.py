@@ -0,0 +1,95 @@
+import pytest
+from src.batch import (
+    BatchResult,
+    GroupRef,
+    evaluate_chunk,
+    evaluate_parallel,
+    init_worker,
+    split_groups,
+)
+from src.calculator import Calculator
+from src.exceptions import DivisionByZeroError, UndefinedVariableError
+
+
+class TestBatchResult:
+    def test_value(self):
+        """Проверка успешного результата"""
+        result = BatchResult('3 4 +', 7)
+        assert result.ok
+        assert result.unwrap() == 7
+        assert result == BatchResult('3 4 +', 7)
+
+    def test_error(self):
+        """Проверка результата с ошибкой"""
+        error = DivisionByZeroError('Деление на ноль')
+        result = BatchResult('3 0 /', error=error)
+        assert not result.ok
+        assert result.value is None
+        with pytest.raises(DivisionByZeroError):
+            result.unwrap()
+
+
+class TestEvaluateParallel:
+    def test_order_and_errors(self):
+        """Проверка порядка результатов и передачи ошибок"""
+        exprs = ['1 1 +', '1 0 //', 'x 1 +', '2 3 ^']
+        results = list(
+            evaluate_parallel(exprs, {}, {'x': 1}, max_workers=2, chunksize=1)
+        )
+        assert [result.value for result in results] == [2, None, 2, 8]
+        assert isinstance(results[1].error, DivisionByZeroError)
+
+    def test_worker(self):
+        """Проверка калькулятора процесса-исполнителя с настройками родителя"""
+        calculator = Calculator(backend='fraction', memoize=True)
+        options = calculator.worker_options()
+        assert options['backend'] == 'fraction' and options['memoize']
+        options['memoize'] = False
+        assert calculator.worker_options()['memoize']
+
+        init_worker(calculator.worker_options())
+        results = evaluate_chunk(['1 3 /', '1 0 /'], None)
+        assert str(results[0].value) == '1/3'
+        assert isinstance(results[1].error, DivisionByZeroError)
+
+    def test_invalid_chunksize(self):
+        """Проверка некорректного размера части"""
+        with pytest.raises(ValueError):
+            list(evaluate_parallel(['1'], {}, chunksize=0))
+
+
+class TestEvaluateGroups:
+    def test_split_groups(self):
+        """Проверка выноса больших подвыражений верхнего уровня"""
+        tokens = ['(', 1, 2, '+', ')', '(', 3, ')', '(', '(', 4, ')', 5, '*', ')', '+']
+        skeleton, groups = split_groups(tokens, 3)
+        assert skeleton == [GroupRef(0), '(', 3, ')', GroupRef(1), '+']
+        assert groups == [[1, 2, '+'], ['(', 4, ')', 5, '*']]
+
+    def test_result(self):
+        """Проверка совпадения с последовательным вычислением"""
+        calculator = Calculator()
+        expr = '( 1 2 + x * ) 7 ( 2 ( 3 4 ^ ) - ) * - ( 5 ) ( 10 3 / ) + +'
+        result = calculator.evaluate_grouped(
+            expr, {'x': 2}, max_workers=2, min_group_size=2
+        )
+        assert result == calculator.evaluate(expr, {'x': 2})
+
+    def test_backend(self):
+        """Проверка числового режима у подвыражений"""
+        calculator = Calculator(backend='fraction')
+        expr = '( 1 3 / 1 6 / + ) ( 1 2 / 1 4 / - ) *'
+        result = calculator.evaluate_grouped(expr, max_workers=2, min_group_size=2)
+        assert result == calculator.evaluate(expr)
+
+    def test_error_order(self):
+        """Проверка, что выбрасывается та же ошибка, что и у evaluate"""
+        calculator = Calculator()
+        with pytest.raises(DivisionByZeroError):
+            calculator.evaluate_grouped(
+                '( 1 0 / ) ( x 1 + ) +', max_workers=2, min_group_size=1
+            )
+        with pytest.raises(UndefinedVariableError):
+            calculator.evaluate_grouped(
+                'y ( 1 0 / ) ( 2 3 + ) + +', max_workers=2, min_group_size=1
+            )
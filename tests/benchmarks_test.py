@@ -0,0 +1,42 @@
+from benchmarks import stages
+from benchmarks.workloads import WORKLOADS, Workload, generate_expression
+from src.calculator import Calculator
+
+
+class TestBenchmarks:
+    def test_workloads_are_valid(self):
+        """Проверка, что синтетические выражения корректны и воспроизводимы"""
+        calculator = Calculator()
+        for workload in WORKLOADS:
+            expr = workload.generate()
+            assert expr == workload.generate()
+            calculator.evaluate(expr)
+
+    def test_generate_expression_depth(self):
+        """Проверка глубины вложенности скобок"""
+        expr = generate_expression(3, depth=5)
+        depth = max_depth = 0
+        for part in expr.split():
+            depth += (part == '(') - (part == ')')
+            max_depth = max(max_depth, depth)
+        assert max_depth == 5
+
+    def test_run_and_compare(self):
+        """Проверка замеров и обнаружения регрессий"""
+        results = stages.run([Workload('tiny', 3)], repeat=2)
+        tiny = results['results']['tiny']
+        assert set(tiny) >= {'tokens', 'parse', 'tokenize', 'validate', 'evaluate'}
+        assert stages.compare(results, results) == []
+
+        slower = {'results': {'tiny': {}}}
+        for stage, timing in tiny.items():
+            if isinstance(timing, dict) and stage != 'calibration':
+                timing = {**timing, 'best_us': timing['best_us'] * 3}
+            slower['results']['tiny'][stage] = timing
+        regressions = stages.compare(slower, results)
+        assert {regression[1] for regression in regressions} == {
+            'parse',
+            'tokenize',
+            'validate',
+            'evaluate',
+        }
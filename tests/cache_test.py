@@ -0,0 +1,39 @@
+import pytest
+from src.cache import LRUCache
+
+
+class TestLRUCache:
+    def setup_method(self):
+        self.cache = LRUCache(maxsize=2)
+
+    def test_get_put(self):
+        """Проверка сохранения и получения значений"""
+        assert self.cache.get('a') is None
+        self.cache.put('a', 1)
+        assert self.cache.get('a') == 1
+        assert 'a' in self.cache
+        assert self.cache.info() == {'hits': 1, 'misses': 1, 'size': 1, 'maxsize': 2}
+
+    def test_eviction(self):
+        """Проверка вытеснения давно не использованных записей"""
+        self.cache.put('a', 1)
+        self.cache.put('b', 2)
+        # Обращение к 'a' делает её самой свежей
+        self.cache.get('a')
+        self.cache.put('c', 3)
+        assert 'a' in self.cache
+        assert 'b' not in self.cache
+        assert len(self.cache) == 2
+
+    def test_clear(self):
+        """Проверка очистки кэша"""
+        self.cache.put('a', 1)
+        self.cache.get('a')
+        self.cache.clear()
+        assert len(self.cache) == 0
+        assert self.cache.info()['hits'] == 0
+
+    def test_invalid_size(self):
+        """Проверка некорректного размера кэша"""
+        with pytest.raises(ValueError):
+            LRUCache(maxsize=0)
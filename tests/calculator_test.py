@@ -1,6 +1,17 @@
+import io
+import mmap
+from collections import defaultdict
+
 import pytest
 from src.calculator import Calculator
-from src.exceptions import CalculatorError
+from src.exceptions import (
+    CalculatorError,
+    DivisionByZeroError,
+    EvaluationError,
+    InvalidOperandTypeError,
+)
+from src.limits import EvaluationLimits
+from src.variable import Variable
 
 
 class TestCalculator:
@@ -102,3 +113,173 @@ class TestCalculator:
         # Проверка, что дробные числа не преобразуются в целые
         result = self.calculator.evaluate('7 2 /')
         assert not result.is_integer()
+
+    def test_compile(self):
+        """Тестирование компиляции выражений"""
+        compiled = self.calculator.compile('( 3 4 + ) 2 *')
+        assert compiled.run() == 14
+        assert compiled.run() == 14
+
+        # Ошибки разбора возникают при компиляции
+        with pytest.raises(CalculatorError):
+            self.calculator.compile('3 4 $')
+
+        # Ошибки вычисления возникают при запуске
+        compiled = self.calculator.compile('3 0 /')
+        with pytest.raises(CalculatorError):
+            compiled.run()
+
+    def test_cache(self):
+        """Тестирование кэша выражений"""
+        calculator = Calculator(cache_size=2)
+        assert calculator.evaluate('3 4 +') == 7
+        # Повтор с другими пробелами попадает в кэш
+        assert calculator.evaluate('  3   4 + ') == 7
+        assert calculator.cache_info()['hits'] == 1
+
+        # Ошибки не кэшируются и возникают при каждом вызове
+        for _ in range(2):
+            with pytest.raises(CalculatorError):
+                calculator.evaluate('3 0 /')
+
+        # Вытеснение при переполнении
+        calculator.evaluate('1 2 +')
+        assert calculator.cache_info()['size'] == 2
+
+        calculator.cache_clear()
+        assert calculator.cache_info()['size'] == 0
+
+        # Без кэша статистика недоступна
+        assert self.calculator.cache_info() is None
+
+    def test_variables(self):
+        """Тестирование вычисления выражений с переменными"""
+        assert self.calculator.evaluate('x y * 2 +', {'x': 3, 'y': 4}) == 14
+
+        # Разбор один раз, вычисление для многих окружений
+        compiled = self.calculator.compile('x 2 ^')
+        assert [compiled.run({'x': x}) for x in range(4)] == [0, 1, 4, 9]
+
+        with pytest.raises(CalculatorError):
+            self.calculator.evaluate('x 1 +')
+
+        # Результаты выражений с переменными не кэшируются
+        calculator = Calculator(cache_size=4)
+        assert calculator.evaluate('x 1 +', {'x': 1}) == 2
+        assert calculator.evaluate('x 1 +', {'x': 2}) == 3
+
+    def test_evaluate_vectorized(self):
+        """Тестирование векторного вычисления"""
+        np = pytest.importorskip('numpy')
+        x = np.arange(5)
+        result = self.calculator.evaluate_vectorized('x x * 1 +', {'x': x})
+        assert result.tolist() == [1, 2, 5, 10, 17]
+
+        with pytest.raises(CalculatorError) as excinfo:
+            self.calculator.evaluate_vectorized('1 x /', {'x': x})
+        assert excinfo.value.indices == [0]
+
+    def test_evaluate_many(self):
+        """Тестирование пакетного вычисления"""
+        results = self.calculator.evaluate_many(['3 4 +', '3 0 /', '', 'x 2 *'])
+        # Генератор вычисляет выражения лениво
+        assert next(results).value == 7
+
+        results = list(results)
+        assert [result.ok for result in results] == [False, False, False]
+        assert isinstance(results[0].error, CalculatorError)
+        assert results[0].error.__traceback__ is None
+
+        results = self.calculator.evaluate_many(['x 2 *', 'x x *'], {'x': 3})
+        assert [result.unwrap() for result in results] == [6, 9]
+
+    @pytest.mark.parametrize(
+        'options',
+        [
+            {},
+            {'cache_size': 4, 'optimize': True},
+            {'memoize': True, 'backend': 'fraction'},
+            {'limits': EvaluationLimits(max_operations=3)},
+        ],
+    )
+    def test_evaluate_many_errors(self, options):
+        """Проверка, что ошибки пакета совпадают с ошибками evaluate"""
+        calculator = Calculator(**options)
+        exprs = [
+            '3 4 $',
+            '( 1 + ) 2',
+            '( 1 2 +',
+            '3 + 4',
+            '1 2 3 +',
+            'y 2 +',
+            '1 0 / y +',
+            'y 1 0 / +',
+            '( 1 1 + ) ( 1 1 + ) * y 0 / +',
+            '1 1 + 1 + 1 + 1 +',
+            'x 2 ^ ( x 1 + ) +',
+        ]
+        for env in (None, {'x': 2}, defaultdict(int)):
+            for expr in exprs:
+                (result,) = calculator.evaluate_many([expr], env)
+                try:
+                    expected = calculator.evaluate(expr, env)
+                except CalculatorError as e:
+                    assert type(result.error) is type(e)
+                    assert str(result.error) == str(e)
+                else:
+                    assert result.value == expected
+
+    def test_evaluate_parallel(self):
+        """Тестирование вычисления пакета в пуле процессов"""
+        exprs = [f'{i} 2 ^' for i in range(50)] + ['3 0 /', '2 2 +']
+        results = list(
+            self.calculator.evaluate_parallel(exprs, max_workers=2, chunksize=7)
+        )
+
+        # Порядок результатов совпадает с порядком выражений
+        assert [result.expr for result in results] == exprs
+        assert [result.value for result in results[:50]] == [i**2 for i in range(50)]
+        assert isinstance(results[50].error, CalculatorError)
+        assert results[51].value == 4
+
+    def test_optimize(self):
+        """Тестирование вычисления с оптимизацией программы"""
+        calculator = Calculator(optimize=True)
+        assert calculator.evaluate('( 3 4 + ) 2 *') == 14
+        assert calculator.evaluate('x 1 * ~ ~ 0 +', {'x': 5}) == 5
+        assert calculator.compile('x 2 3 ^ *').tokens == [Variable('x'), 8, '*']
+
+        # Ошибки сохраняются
+        with pytest.raises(DivisionByZeroError):
+            calculator.evaluate('3 0 / 1 *')
+        with pytest.raises(InvalidOperandTypeError):
+            calculator.evaluate('3.5 2 // @')
+        with pytest.raises(EvaluationError):
+            calculator.evaluate('3 4 5')
+
+    def test_evaluate_stream(self, tmp_path):
+        """Тестирование вычисления выражения из файла и mmap"""
+        path = tmp_path / 'expr.txt'
+        path.write_text(' '.join(['1'] * 1000 + ['+'] * 999), encoding='utf-8')
+
+        with open(path, encoding='utf-8') as stream:
+            assert self.calculator.evaluate_stream(stream) == 1000
+
+        with open(path, 'rb') as file:
+            with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as stream:
+                assert self.calculator.evaluate_stream(stream) == 1000
+
+        with pytest.raises(CalculatorError):
+            self.calculator.evaluate_stream(io.StringIO('1 0 /'))
+        with pytest.raises(CalculatorError):
+            self.calculator.evaluate_stream(io.StringIO('( 1 + )'))
+
+    def test_encode(self):
+        """Тестирование компактного представления выражений"""
+        program = self.calculator.encode('( x 4 + ) 2 *')
+        assert self.calculator.evaluate_compact(program, {'x': 1}) == 10
+
+        with pytest.raises(CalculatorError):
+            self.calculator.encode('3 4 5')
+        with pytest.raises(CalculatorError):
+            self.calculator.evaluate_compact(self.calculator.encode('1 0 /'))
@@ -0,0 +1,54 @@
+import pytest
+from src.compact import (
+    OP_BASE,
+    OP_FLOAT,
+    OP_INT,
+    OP_OBJECT,
+    OP_VARIABLE,
+    CompactProgram,
+)
+from src.exceptions import EvaluationError
+from src.operators import Operators
+from src.variable import Variable
+
+
+class TestCompactProgram:
+    def setup_method(self):
+        self.operators = Operators()
+
+    def test_encoding(self):
+        """Проверка кодирования токенов в массивы"""
+        tokens = ['(', 3, 2.5, '*', ')', 2**70, '+', Variable('x'), '*', '~']
+        program = CompactProgram.from_tokens(tokens, self.operators)
+
+        assert list(program.code) == [
+            OP_INT,
+            OP_FLOAT,
+            OP_BASE,
+            OP_OBJECT,
+            OP_BASE + 1,
+            OP_VARIABLE,
+            OP_BASE,
+            OP_BASE + 2,
+        ]
+        assert list(program.ints) == [3]
+        assert list(program.floats) == [2.5]
+        assert program.objects == [2**70]
+        assert program.names == ['x']
+        assert program.symbols == ('*', '+', '~')
+        assert program.to_tokens() == [t for t in tokens if t not in ('(', ')')]
+        assert len(program) == 8
+
+    def test_compact_size(self):
+        """Компактная программа занимает по байту на оператор"""
+        tokens = [1] + [1, '+'] * 1000
+        program = CompactProgram.from_tokens(tokens, self.operators)
+        assert program.nbytes == len(program) + 1001 * 8
+
+    def test_validation(self):
+        """Проверка структуры программы при кодировании"""
+        with pytest.raises(EvaluationError):
+            CompactProgram.from_tokens([3, '+'], self.operators)
+
+        with pytest.raises(EvaluationError):
+            CompactProgram.from_tokens([3, 4], self.operators)
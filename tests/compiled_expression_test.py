@@ -0,0 +1,71 @@
+import pytest
+from src.compiled_expression import CompiledExpression
+from src.exceptions import (
+    DivisionByZeroError,
+    EvaluationError,
+    InvalidOperandTypeError,
+    UndefinedVariableError,
+)
+from src.operators import Operators
+from src.variable import Variable
+
+
+class TestCompiledExpression:
+    def setup_method(self):
+        self.operators = Operators()
+
+    def test_run(self):
+        """Тестирование вычисления скомпилированных выражений"""
+        compiled = CompiledExpression([3, 4, '+', 2, '*'], self.operators)
+        assert compiled.run() == 14
+
+        # Повторный запуск даёт тот же результат
+        assert compiled.run() == 14
+
+        # Скобки отбрасываются при компиляции
+        compiled = CompiledExpression(['(', 3, 4, '+', ')', 2, '*'], self.operators)
+        assert compiled.tokens == [3, 4, '+', 2, '*']
+        assert compiled.run() == 14
+
+        # Унарные операторы
+        assert CompiledExpression([5, '~', '~', '@'], self.operators).run() == 5
+
+    def test_result_types(self):
+        """Проверка приведения целых результатов к int"""
+        result = CompiledExpression([10, 2, '/'], self.operators).run()
+        assert result == 5 and isinstance(result, int)
+
+        assert CompiledExpression([7, 2, '/'], self.operators).run() == 3.5
+
+    def test_structure_errors(self):
+        """Структурные ошибки обнаруживаются при компиляции"""
+        with pytest.raises(EvaluationError):
+            CompiledExpression([3, '+'], self.operators)
+
+        with pytest.raises(EvaluationError):
+            CompiledExpression([3, 4, 5], self.operators)
+
+    def test_runtime_errors(self):
+        """Ошибки вычисления возникают при каждом запуске"""
+        compiled = CompiledExpression([3, 0, '/'], self.operators)
+        for _ in range(2):
+            with pytest.raises(DivisionByZeroError):
+                compiled.run()
+
+        with pytest.raises(InvalidOperandTypeError):
+            CompiledExpression([3.5, 2, '//'], self.operators).run()
+
+        with pytest.raises(EvaluationError):
+            CompiledExpression([10.0, 1000, '^'], self.operators).run()
+
+    def test_variables(self):
+        """Проверка связывания переменных при каждом запуске"""
+        compiled = CompiledExpression(
+            [Variable('x'), Variable('y'), '*', 2, '+'], self.operators
+        )
+        assert compiled.variables == {'x', 'y'}
+        assert compiled.run({'x': 3, 'y': 4}) == 14
+        assert compiled.run({'x': 1, 'y': 1}) == 3
+
+        with pytest.raises(UndefinedVariableError):
+            compiled.run({'x': 1})
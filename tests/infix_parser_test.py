@@ -0,0 +1,121 @@
+import pytest
+from src.calculator import Calculator
+from src.exceptions import CalculatorError, ParserError
+from src.fraction_backend import FRACTION
+from src.infix_parser import InfixParser
+from src.memo import MemoProgram
+from src.operators import DEFAULT_OPERATORS, OperatorSpec
+from src.slow_log import SlowLog
+from src.variable import Variable
+
+
+class TestInfixParser:
+    def setup_method(self):
+        self.parser = InfixParser()
+        self.calculator = Calculator()
+
+    def test_program(self):
+        """Проверка, что получается программа RPN без скобок"""
+        assert self.parser.parse('(3 + 4) * -x') == [
+            3,
+            4,
+            '+',
+            Variable('x'),
+            '~',
+            '*',
+        ]
+        assert self.parser.parse('1.5*2') == [1.5, 2, '*']
+
+    def test_precedence_and_associativity(self):
+        """Проверка приоритетов и ассоциативности из реестра операторов"""
+        assert self.calculator.evaluate_infix('2 + 3 * 4') == 14
+        assert self.calculator.evaluate_infix('10 - 4 - 3') == 3
+        assert self.calculator.evaluate_infix('2 ^ 3 ^ 2') == 512
+        assert self.calculator.evaluate_infix('7 // 2 % 3') == 0
+        assert self.calculator.evaluate_infix('(2 + 3) * 4') == 20
+        # Префиксный минус связывает слабее '^', но сильнее '*'
+        assert self.calculator.evaluate_infix('-2 ^ 2') == -4
+        assert self.calculator.evaluate_infix('-2 ^ 2 ^ 2') == -16
+        assert self.calculator.evaluate_infix('(-2) ^ 2') == 4
+        assert self.calculator.evaluate_infix('2 ^ -1') == 0.5
+        assert self.calculator.evaluate_infix('2 ^ -1 ^ 2') == 0.5
+        assert self.calculator.evaluate_infix('-2 * 3 ^ 2') == -18
+        assert self.calculator.evaluate_infix('+3 - -2') == 5
+
+    def test_same_result_as_rpn(self):
+        """Проверка совпадения с вычислением той же программы в RPN"""
+        env = {'x': 3, 'y': 2.5}
+        assert self.calculator.evaluate_infix(
+            '(x + 1) * y - x ^ 2 / 3', env
+        ) == self.calculator.evaluate('x 1 + y * x 2 ^ 3 / -', env)
+
+    def test_functions(self):
+        """Проверка вызова пользовательских операторов как функций"""
+        operators = DEFAULT_OPERATORS.register(
+            OperatorSpec('min', 2, min),
+            OperatorSpec('clamp', 3, lambda x, lo, hi: max(lo, min(x, hi))),
+        )
+        calculator = Calculator(operators=operators)
+        assert (
+            calculator.evaluate_infix('clamp(x * 2, 0, min(5, 3 + 1)) + 1', {'x': 10})
+            == 5
+        )
+        assert calculator.infix_parser.parse('min(a, b)') == [
+            Variable('a'),
+            Variable('b'),
+            'min',
+        ]
+        with pytest.raises(ParserError):
+            calculator.infix_parser.parse('min(1)')
+        with pytest.raises(ParserError):
+            calculator.infix_parser.parse('clamp 3')
+
+    def test_cache(self):
+        """Проверка кэширования преобразования"""
+        tokens = self.parser.parse('1 + 2')
+        assert self.parser.parse('1 + 2') is tokens
+        assert self.parser.cache.hits == 1
+        assert InfixParser(cache_size=None).cache is None
+
+    def test_optimizer_and_backend(self):
+        """Проверка оптимизации программы и числового режима"""
+        calculator = Calculator(optimize=True)
+        assert calculator.infix_parser.parse('(1 + 2) * x') == [3, Variable('x'), '*']
+        tokens = InfixParser(backend=FRACTION).parse('0.1 + .2')
+        assert tokens[0] == FRACTION.parse_number('0.1')
+        fraction = Calculator(backend='fraction')
+        assert fraction.evaluate_infix('0.1 + 0.2') == FRACTION.parse_number('0.3')
+
+    def test_measured_and_memoize(self):
+        """Проверка метрик, журнала медленных выражений и memoize"""
+        slow_log = SlowLog(threshold=0)
+        calculator = Calculator(metrics=True, slow_log=slow_log, memoize=True)
+        expr = '(x + 1) * (x + 1) - -(x + 1)'
+        assert isinstance(calculator.infix_parser.parse(expr), MemoProgram)
+        assert calculator.evaluate_infix(expr, {'x': 2}) == 12
+        with pytest.raises(CalculatorError):
+            calculator.evaluate_infix('1 / 0')
+        stats = calculator.stats()
+        assert stats['evaluations'] == 2
+        assert stats['stages']['infix']['count'] == 2
+        assert stats['operators']['*'] == 1
+        assert stats['errors']['DivisionByZeroError'] == 1
+        assert [entry.expr for entry in slow_log.entries()] == [expr, '1 / 0']
+
+    @pytest.mark.parametrize(
+        'expr',
+        ['', '3 +', '(3', '3)', '3 4', '3 $ 4', '1, 2', '* 2', '()', 'x y'],
+    )
+    def test_errors(self, expr):
+        """Проверка синтаксических ошибок"""
+        with pytest.raises(ParserError):
+            self.parser.parse(expr)
+        with pytest.raises(CalculatorError):
+            self.calculator.evaluate_infix(expr)
+
+    def test_evaluation_errors(self):
+        """Проверка ошибок вычисления"""
+        with pytest.raises(CalculatorError):
+            self.calculator.evaluate_infix('1 / (2 - 2)')
+        with pytest.raises(CalculatorError):
+            self.calculator.evaluate_infix('x + 1')
@@ -0,0 +1,98 @@
+from decimal import Decimal
+from fractions import Fraction
+
+import pytest
+from src.calculator import Calculator
+from src.exceptions import CalculatorError, DivisionByZeroError, LibraryError
+from src.library import Library, build_library
+
+FORMULAS = {
+    'area': 'r r * 3.14159 *',
+    'mean': '( a b + ) 2 /',
+    'big': f'{2**70} x +',
+    'ratio': '1 x /',
+}
+
+
+class TestLibrary:
+    def build(self, tmp_path, formulas=FORMULAS, calculator=None):
+        path = tmp_path / 'formulas.rpnl'
+        build_library(path, formulas, calculator)
+        return path
+
+    def test_lookup(self, tmp_path):
+        """Проверка поиска формул по имени и номеру"""
+        path = self.build(tmp_path)
+        with Library(path) as library:
+            assert len(library) == 4
+            assert list(library) == list(FORMULAS)
+            assert 'mean' in library and 1 in library and 'x' not in library
+            assert library.name(1) == 'mean'
+            assert library.get('mean') is library[1]
+            assert library.evaluate('mean', {'a': 3, 'b': 4}) == 3.5
+            assert library.evaluate(2, {'x': 1}) == 2**70 + 1
+            with pytest.raises(KeyError):
+                library.get('missing')
+            with pytest.raises(KeyError):
+                library.get(4)
+            with pytest.raises(DivisionByZeroError):
+                library.evaluate('ratio', {'x': 0})
+
+    def test_results(self, tmp_path):
+        """Проверка совпадения с разбором формул во всех числовых режимах"""
+        env = {'r': 2, 'a': 1, 'b': 2, 'x': 3}
+        for backend in ('exact', 'float64', 'decimal', 'fraction'):
+            calculator = Calculator(backend=backend)
+            path = self.build(tmp_path, calculator=calculator)
+            with Library(path) as library:
+                assert library.backend == backend
+                for name, expr in FORMULAS.items():
+                    assert library.evaluate(name, env) == calculator.evaluate(expr, env)
+
+        path = self.build(tmp_path, {'d': '0.1 0.2 +'}, Calculator(backend='decimal'))
+        with Library(path) as library:
+            assert library.evaluate('d') == Decimal('0.3')
+        path = self.build(
+            tmp_path, [('q', '1 3 / -2 *')], Calculator(backend='fraction')
+        )
+        with Library(path) as library:
+            assert library.evaluate('q') == Fraction(-2, 3)
+
+    def test_build_errors(self, tmp_path):
+        """Проверка ошибок при сборке библиотеки"""
+        with pytest.raises(CalculatorError, match='bad'):
+            self.build(tmp_path, {'ok': '1 2 +', 'bad': '1 +'})
+        with pytest.raises(LibraryError):
+            self.build(tmp_path, [('a', '1'), ('a', '2')])
+        assert list(tmp_path.iterdir()) == []
+
+    def test_corruption(self, tmp_path):
+        """Проверка контрольных сумм и версии формата"""
+        path = self.build(tmp_path)
+        data = path.read_bytes()
+
+        # Повреждённая запись обнаруживается при обращении к формуле
+        broken = bytearray(data)
+        broken[40] ^= 0xFF
+        path.write_bytes(broken)
+        with Library(path) as library:
+            with pytest.raises(LibraryError):
+                library.get(0)
+            assert library.evaluate('mean', {'a': 1, 'b': 1}) == 1
+
+        for position in (0, 4, 8, len(data) - 2):
+            broken = bytearray(data)
+            broken[position] ^= 0xFF
+            path.write_bytes(broken)
+            with pytest.raises(LibraryError):
+                Library(path)
+
+        path.write_bytes(data[:-10])
+        with pytest.raises(LibraryError):
+            Library(path)
+
+    def test_backend_mismatch(self, tmp_path):
+        """Проверка совпадения числового режима библиотеки и калькулятора"""
+        path = self.build(tmp_path)
+        with pytest.raises(LibraryError):
+            Library(path, Calculator(backend='fraction'))
@@ -0,0 +1,112 @@
+import pickle
+
+import pytest
+from src.calculator import Calculator
+from src.exceptions import CalculatorError, DivisionByZeroError, ResourceLimitError
+from src.limits import EvaluationLimits, estimate_int_bits
+from src.rpn_evaluator import RPNEvaluator
+from src.token_parser import TokenParser
+
+
+class TestEvaluationLimits:
+    def setup_method(self):
+        self.parser = TokenParser()
+
+    def evaluate(self, expr, **limits):
+        evaluator = RPNEvaluator(limits=EvaluationLimits(**limits))
+        return evaluator.evaluate(self.parser.parse(expr))
+
+    def test_within_limits(self):
+        """Проверка вычисления, не превышающего ограничений"""
+        limits = {
+            'max_operations': 10,
+            'max_int_bits': 64,
+            'max_stack_depth': 4,
+            'timeout': 1,
+        }
+        assert self.evaluate('( 2 3 + ) 4 * 2 ^', **limits) == 400
+        assert self.evaluate('7 2 / ~', **limits) == -3.5
+
+    def test_max_int_bits_before_power(self):
+        """Проверка отказа от вычисления огромной степени до её вычисления"""
+        with pytest.raises(ResourceLimitError):
+            self.evaluate('10 10 10 ^ ^', max_int_bits=4096)
+        assert self.evaluate('2 4095 ^', max_int_bits=4096) == 2**4095
+        with pytest.raises(ResourceLimitError):
+            self.evaluate('2 4096 ^', max_int_bits=4096)
+        # Показатель больше диапазона float
+        with pytest.raises(ResourceLimitError):
+            self.evaluate('10 ( 10 400 ^ ) ^', max_int_bits=10000)
+
+    def test_max_int_bits_multiplication(self):
+        """Проверка ограничения размера произведения"""
+        with pytest.raises(ResourceLimitError):
+            self.evaluate(f'{2**40} {2**40} *', max_int_bits=64)
+        with pytest.raises(ResourceLimitError):
+            self.evaluate(f'{2**63} {2**63} +', max_int_bits=64)
+
+    def test_max_operations(self):
+        """Проверка ограничения числа операций"""
+        expr = '1 ' + '1 + ' * 5
+        assert self.evaluate(expr, max_operations=5) == 6
+        with pytest.raises(ResourceLimitError):
+            self.evaluate(expr, max_operations=4)
+
+    def test_max_stack_depth(self):
+        """Проверка ограничения глубины стека"""
+        expr = '1 ' * 4 + '+ ' * 3
+        assert self.evaluate(expr, max_stack_depth=4) == 4
+        with pytest.raises(ResourceLimitError):
+            self.evaluate(expr, max_stack_depth=3)
+
+    def test_timeout(self):
+        """Проверка ограничения времени вычисления"""
+        with pytest.raises(ResourceLimitError):
+            self.evaluate('1 ' + '1 + ' * 200_000, timeout=1e-4)
+
+    def test_regular_errors(self):
+        """Проверка, что обычные ошибки вычисления не меняются"""
+        with pytest.raises(DivisionByZeroError):
+            self.evaluate('1 0 /', max_operations=10)
+
+    def test_invalid_limits(self):
+        """Проверка некорректных ограничений"""
+        with pytest.raises(ValueError):
+            EvaluationLimits(max_operations=0)
+        with pytest.raises(ValueError):
+            EvaluationLimits(timeout=-1)
+
+    def test_estimate_int_bits(self):
+        """Проверка оценки длины целого результата"""
+        assert estimate_int_bits('^', 2, 100) == (2**100).bit_length()
+        assert estimate_int_bits('^', 10, 100) == (10**100).bit_length()
+        assert estimate_int_bits('*', 255, 255) >= (255 * 255).bit_length()
+        assert estimate_int_bits('^', 2.0, 100) == 0
+        assert estimate_int_bits('^', 10, 10**400) > 10**400
+
+    def test_calculator_limits(self):
+        """Проверка ограничений во всех режимах калькулятора"""
+        limits = EvaluationLimits(max_int_bits=128)
+        calculator = Calculator(cache_size=8, limits=limits)
+        with pytest.raises(CalculatorError, match='бит'):
+            calculator.evaluate('10 10 10 ^ ^')
+        with pytest.raises(ResourceLimitError):
+            calculator.compile('x 200 ^').run({'x': 3})
+        with pytest.raises(ResourceLimitError):
+            calculator.evaluate_compact(calculator.encode('3 200 ^'))
+        with pytest.raises(ResourceLimitError):
+            calculator.compile('10 x ^').run({'x': 10**400})
+        assert calculator.evaluate('2 100 ^') == 2**100
+        assert pickle.loads(pickle.dumps(limits)) == limits
+
+    def test_optimizer_with_limits(self):
+        """Проверка, что свёртка констант не обходит ограничения"""
+        calculator = Calculator(optimize=True, limits=EvaluationLimits(max_int_bits=64))
+        assert calculator.optimizer is None
+        with pytest.raises(ResourceLimitError):
+            calculator.evaluate('2 1000 ^')
+        calculator = Calculator(
+            optimize=True, limits=EvaluationLimits(max_operations=2)
+        )
+        with pytest.raises(ResourceLimitError):
+            calculator.evaluate('1 1 + 1 + 1 + 1 +')
@@ -0,0 +1,73 @@
+import io
+
+from src.calculator import Calculator
+from src.main import main, run_batch, run_coprocess
+
+
+class TestBatchMode:
+    def setup_method(self):
+        self.calculator = Calculator()
+
+    def test_run_batch(self):
+        """Тестирование пакетного режима на потоках"""
+        source = io.StringIO('3 4 +\n7 2 /\n3 0 /\n\n')
+        target = io.StringIO()
+        errors = run_batch(self.calculator, source, target)
+
+        assert errors == 2
+        assert target.getvalue().splitlines() == [
+            '7',
+            '3.5',
+            'ERROR\tDivisionByZeroError\tДеление на ноль',
+            'ERROR\tParserError\tПустое выражение',
+        ]
+
+    def test_files(self, tmp_path):
+        """Тестирование пакетного режима с файлами и несколькими процессами"""
+        source = tmp_path / 'input.txt'
+        target = tmp_path / 'output.txt'
+        source.write_text(''.join(f'{i} 2 *\n' for i in range(20)), encoding='utf-8')
+
+        args = ['--batch', str(source), '-o', str(target), '--jobs', '2']
+        assert main(args + ['--chunksize', '3']) == 0
+        lines = target.read_text(encoding='utf-8').splitlines()
+        assert lines == [str(i * 2) for i in range(20)]
+
+
+class TestOneShotMode:
+    def test_expr(self, capsys):
+        """Тестирование однократного режима -e"""
+        assert main(['-e', '3 4 +']) == 0
+        assert capsys.readouterr().out == '7\n'
+
+        # Выражение, начинающееся с минуса, не принимается за флаг
+        assert main(['-e', '-3 4 +']) == 0
+        assert capsys.readouterr().out == '1\n'
+
+        assert main(['-e', '3 0 /']) == 1
+        assert 'Деление на ноль' in capsys.readouterr().err
+
+    def test_coprocess(self):
+        """Тестирование построчного протокола сопроцесса"""
+        source = io.StringIO('3 4 +\n3 0 /\n')
+        target = io.StringIO()
+        run_coprocess(Calculator(), source, target)
+        assert target.getvalue() == ('7\nERROR\tDivisionByZeroError\tДеление на ноль\n')
+
+    def test_backend(self):
+        """Тестирование выбора числового режима в пакетном режиме"""
+        source = io.StringIO('0.1 0.2 +\n1 3 /\n')
+        target = io.StringIO()
+        run_batch(Calculator(backend='fraction'), source, target)
+        assert target.getvalue().splitlines() == ['3/10', '1/3']
+
+    def test_session(self, capsys, monkeypatch):
+        """Тестирование сеанса с постоянным стеком"""
+        lines = iter(['3 4', '+ dup', '1 0 /', '*', 'q'])
+        monkeypatch.setattr('builtins.input', lambda prompt: next(lines))
+        assert main(['--session']) == 0
+        out = capsys.readouterr().out
+        assert 'Стек: 3 4\n' in out
+        assert 'Стек: 7 7\n' in out
+        assert 'Ошибка: Деление на ноль\nСтек: 7 7\n' in out
+        assert 'Стек: 49\n' in out
@@ -0,0 +1,102 @@
+import pytest
+from src.calculator import Calculator
+from src.exceptions import (
+    DivisionByZeroError,
+    ResourceLimitError,
+    UndefinedVariableError,
+)
+from src.limits import EvaluationLimits
+from src.memo import MemoProgram, SharedGroup, share_groups
+from src.variable import Variable
+
+REPEATED = '( 2 3 ^ 7 * ) ( ( 2 3 ^ 7 * ) x + ) + ( ( 2 3 ^ 7 * ) x + ) *'
+
+
+class TestMemo:
+    def setup_method(self):
+        self.calculator = Calculator(memoize=True)
+
+    def test_share_groups(self):
+        """Проверка объединения одинаковых подвыражений на всех уровнях"""
+        program = self.calculator._tokenize(REPEATED)
+        assert isinstance(program, MemoProgram)
+        assert program.tokens == [
+            SharedGroup(0),
+            SharedGroup(1),
+            '+',
+            SharedGroup(1),
+            '*',
+        ]
+        assert program.groups == [
+            [2, 3, '^', 7, '*'],
+            [SharedGroup(0), Variable('x'), '+'],
+        ]
+
+    def test_no_repeats(self):
+        """Проверка, что без повторов программа не меняется"""
+        tokens = self.calculator.token_parser.parse('( 1 2 + ) ( 1 3 + ) *')
+        assert share_groups(tokens) is tokens
+
+    def test_number_types(self):
+        """Проверка, что равные числа разных типов не объединяются"""
+        calculator = Calculator(backend='float64')
+        tokens = calculator.token_parser.parse('( 1 -0.0 / ) ( 1 0.0 / ) +')
+        assert share_groups(tokens) is tokens
+
+    def test_result(self):
+        """Проверка совпадения с вычислением без объединения"""
+        env = {'x': 1.5}
+        assert self.calculator.evaluate(REPEATED, env) == Calculator().evaluate(
+            REPEATED, env
+        )
+        for backend in ('float64', 'fraction'):
+            calculator = Calculator(backend=backend, memoize=True)
+            assert calculator.evaluate(REPEATED, env) == Calculator(
+                backend=backend
+            ).evaluate(REPEATED, env)
+
+    def test_error_order(self):
+        """Проверка, что ошибка выбрасывается при первом вхождении"""
+        with pytest.raises(DivisionByZeroError):
+            self.calculator.evaluate('( 1 0 / ) ( 1 0 / ) + y +')
+        with pytest.raises(UndefinedVariableError):
+            self.calculator.evaluate('y ( 1 0 / ) ( 1 0 / ) + +')
+
+    def test_cache_and_compile(self):
+        """Проверка кэша, компиляции и метрик с объединением"""
+        calculator = Calculator(cache_size=4, memoize=True, metrics=True)
+        assert calculator.evaluate(REPEATED, {'x': 1}) == 6441
+        assert calculator.evaluate(REPEATED, {'x': 2}) == 6612
+        assert calculator.compile(REPEATED).run({'x': 1}) == 6441
+        assert calculator.stats()['operators']['^'] == 6
+
+    def test_limits(self):
+        """Проверка, что ограничения общие для всех подвыражений"""
+        expr = '( 1 1 + 1 + ) ( 1 1 + 1 + ) + ( 2 2 + 2 + ) ( 2 2 + 2 + ) + +'
+        for limits in (
+            EvaluationLimits(max_operations=3),
+            EvaluationLimits(max_stack_depth=2),
+        ):
+            calculator = Calculator(limits=limits, memoize=True)
+            with pytest.raises(ResourceLimitError):
+                calculator.evaluate(expr)
+            with pytest.raises(ResourceLimitError):
+                Calculator(limits=limits).evaluate(expr)
+
+        # Одинаковые подвыражения вычисляются и считаются один раз
+        limits = EvaluationLimits(max_operations=7, max_stack_depth=4)
+        assert Calculator(limits=limits, memoize=True).evaluate(expr) == 18
+        with pytest.raises(ResourceLimitError):
+            Calculator(limits=limits).evaluate(expr)
+
+    def test_deep_nesting(self):
+        """Проверка глубоко вложенных общих подвыражений без рекурсии"""
+        depth = 3000
+        rpn = infix = '1'
+        for _ in range(depth):
+            rpn = f'( {rpn} 1 + )'
+            infix = f'({infix} + 1)'
+        assert self.calculator.evaluate(f'{rpn} {rpn} +') == 2 * (depth + 1)
+        assert self.calculator.evaluate_infix(f'{infix} + {infix}') == 2 * (depth + 1)
+        calculator = Calculator(backend='fraction', memoize=True)
+        assert calculator.evaluate(f'{rpn} {rpn} *') == (depth + 1) ** 2
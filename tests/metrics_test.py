@@ -0,0 +1,77 @@
+import pytest
+from src.calculator import Calculator
+from src.exceptions import CalculatorError
+from src.metrics import Histogram
+
+
+class TestMetrics:
+    def setup_method(self):
+        self.calculator = Calculator(metrics=True)
+
+    def test_disabled(self):
+        """Проверка, что без флага метрики не собираются"""
+        calculator = Calculator()
+        assert calculator.evaluate('3 4 +') == 7
+        assert calculator.stats() is None
+        assert calculator.metrics_text() is None
+
+    def test_stages_and_operators(self):
+        """Проверка времени этапов и счётчиков операторов"""
+        assert self.calculator.evaluate('( 3 4 + ) 2 * 1 +') == 15
+        stats = self.calculator.stats()
+
+        assert stats['evaluations'] == 1
+        assert set(stats['stages']) == {'tokenize', 'validate', 'evaluate'}
+        for stage in stats['stages'].values():
+            assert stage['count'] == 1
+            assert stage['sum'] >= 0
+        assert stats['operators']['+'] == 2
+        assert stats['operators']['*'] == 1
+        assert stats['operators']['/'] == 0
+
+    def test_errors(self):
+        """Проверка счётчиков ошибок по классам"""
+        with pytest.raises(CalculatorError):
+            self.calculator.evaluate('1 0 /')
+        results = list(self.calculator.evaluate_many(['1 +', '2 2 +', 'x']))
+        assert [result.ok for result in results] == [False, True, False]
+
+        stats = self.calculator.stats()
+        assert stats['evaluations'] == 4
+        assert stats['errors']['DivisionByZeroError'] == 1
+        assert stats['errors']['EvaluationError'] == 1
+        assert stats['errors']['UndefinedVariableError'] == 1
+        assert stats['errors']['ParserError'] == 0
+
+    def test_with_cache_and_optimizer(self):
+        """Проверка метрик вместе с кэшем и оптимизатором"""
+        calculator = Calculator(cache_size=8, optimize=True, metrics=True)
+        for _ in range(3):
+            assert calculator.evaluate('x 2 3 * +', {'x': 1}) == 7
+        stats = calculator.stats()
+        # Разбор выполняется один раз, вычисление - при каждом вызове
+        assert stats['stages']['tokenize']['count'] == 1
+        assert stats['stages']['optimize']['count'] == 1
+        assert stats['stages']['evaluate']['count'] == 3
+        assert stats['operators']['+'] == 3
+        assert stats['operators']['*'] == 0
+
+    def test_prometheus_text(self):
+        """Проверка текстового формата Prometheus"""
+        self.calculator.evaluate('3 4 +')
+        text = self.calculator.metrics_text()
+        assert '# TYPE rpn_evaluation_seconds histogram' in text
+        assert 'rpn_evaluation_seconds_bucket{le="+Inf"} 1' in text
+        assert 'rpn_evaluation_seconds_count 1' in text
+        assert 'rpn_stage_seconds_count{stage="tokenize"} 1' in text
+        assert 'rpn_operator_occurrences_total{operator="+"} 1' in text
+        assert 'rpn_errors_total{error="DivisionByZeroError"} 0' in text
+
+    def test_histogram(self):
+        """Проверка накопленных корзин гистограммы"""
+        histogram = Histogram((1, 2))
+        for value in (0.5, 1, 1.5, 3):
+            histogram.observe(value)
+        assert histogram.cumulative() == [(1, 2), (2, 3), (float('inf'), 4)]
+        assert histogram.sum == 6
+        assert histogram.count == 4
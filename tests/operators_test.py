@@ -1,6 +1,13 @@
+import multiprocessing
+import pickle
+from concurrent.futures import ProcessPoolExecutor
+
 import pytest
+from src.backends import BACKEND_NAMES, get_backend
+from src.batch import evaluate_chunk, init_worker
+from src.calculator import Calculator
 from src.exceptions import DivisionByZeroError, InvalidOperandTypeError
-from src.operators import Operators
+from src.operators import DEFAULT_OPERATORS, Operators, OperatorSpec
 
 
 class TestOperators:
@@ -17,15 +24,15 @@ class TestOperators:
         """Проверка получения информации об операторе"""
         # Проверка бинарного оператора
         info = self.operators.get_operator_info('+')
-        assert info['arity'] == 2
-        assert info['priority'] == 1
-        assert callable(info['func'])
+        assert info.arity == 2
+        assert info.priority == 1
+        assert callable(info.func)
 
         # Проверка унарного оператора
         info = self.operators.get_operator_info('~')
-        assert info['arity'] == 1
-        assert info['priority'] == 4
-        assert callable(info['func'])
+        assert info.arity == 1
+        assert info.priority == 4
+        assert callable(info.func)
 
         # Проверка несуществующего оператора
         with pytest.raises(KeyError):
@@ -34,67 +41,132 @@ class TestOperators:
     def test_binary_operators(self):
         """Тестирование бинарных операторов"""
         # Сложение
-        add_func = self.operators.get_operator_info('+')['func']
+        add_func = self.operators.get_operator_info('+').func
         assert add_func(3, 4) == 7
 
         # Вычитание
-        sub_func = self.operators.get_operator_info('-')['func']
+        sub_func = self.operators.get_operator_info('-').func
         assert sub_func(7, 3) == 4
 
         # Умножение
-        mul_func = self.operators.get_operator_info('*')['func']
+        mul_func = self.operators.get_operator_info('*').func
         assert mul_func(3, 4) == 12
 
         # Деление
-        div_func = self.operators.get_operator_info('/')['func']
+        div_func = self.operators.get_operator_info('/').func
         assert div_func(10, 2) == 5.0
 
         # Целочисленное деление
-        idiv_func = self.operators.get_operator_info('//')['func']
+        idiv_func = self.operators.get_operator_info('//').func
         assert idiv_func(10, 3) == 3
 
         # Остаток от деления
-        mod_func = self.operators.get_operator_info('%')['func']
+        mod_func = self.operators.get_operator_info('%').func
         assert mod_func(10, 3) == 1
 
         # Возведение в степень
-        pow_func = self.operators.get_operator_info('^')['func']
+        pow_func = self.operators.get_operator_info('^').func
         assert pow_func(2, 3) == 8
 
     def test_unary_operators(self):
         """Тестирование унарных операторов"""
         # Унарный минус
-        neg_func = self.operators.get_operator_info('~')['func']
+        neg_func = self.operators.get_operator_info('~').func
         assert neg_func(5) == -5
 
         # Унарный плюс
-        pos_func = self.operators.get_operator_info('@')['func']
+        pos_func = self.operators.get_operator_info('@').func
         assert pos_func(5) == 5
 
     def test_division_by_zero(self):
         """Проверка деления на ноль"""
-        div_func = self.operators.get_operator_info('/')['func']
+        div_func = self.operators.get_operator_info('/').func
         with pytest.raises(DivisionByZeroError):
             div_func(10, 0)
 
-        idiv_func = self.operators.get_operator_info('//')['func']
+        idiv_func = self.operators.get_operator_info('//').func
         with pytest.raises(DivisionByZeroError):
             idiv_func(10, 0)
 
-        mod_func = self.operators.get_operator_info('%')['func']
+        mod_func = self.operators.get_operator_info('%').func
         with pytest.raises(DivisionByZeroError):
             mod_func(10, 0)
 
     def test_invalid_operand_type(self):
         """Проверка операций с неправильными типами операндов"""
-        idiv_func = self.operators.get_operator_info('//')['func']
+        idiv_func = self.operators.get_operator_info('//').func
         with pytest.raises(InvalidOperandTypeError):
             idiv_func(10.5, 2)
         with pytest.raises(InvalidOperandTypeError):
             idiv_func(10, 2.5)
 
-        mod_func = self.operators.get_operator_info('%')['func']
+        mod_func = self.operators.get_operator_info('%').func
         with pytest.raises(InvalidOperandTypeError):
             mod_func(10.5, 2)
         with pytest.raises(InvalidOperandTypeError):
             mod_func(10, 2.5)
+
+    def test_registry_is_immutable(self):
+        """Проверка неизменяемости реестра и описаний операторов"""
+        spec = self.operators.get_operator_info('+')
+        with pytest.raises(AttributeError):
+            spec.arity = 3
+        with pytest.raises(AttributeError):
+            spec.extra = 1
+        with pytest.raises(AttributeError):
+            self.operators.operators = {}
+        with pytest.raises(TypeError):
+            self.operators.operators['+'] = spec
+
+    def test_register_custom_operators(self):
+        """Проверка добавления пользовательских операторов"""
+        operators = DEFAULT_OPERATORS.register(
+            OperatorSpec('min', 2, min),
+            OperatorSpec('max', 2, max),
+            OperatorSpec('sqrt', 1, lambda a: a**0.5),
+            OperatorSpec('clamp', 3, lambda x, lo, hi: max(lo, min(x, hi))),
+        )
+
+        # Исходный реестр не изменился
+        assert 'min' not in DEFAULT_OPERATORS.get_operators()
+        assert 'min' in operators.get_operators()
+
+        calculator = Calculator(operators=operators)
+        assert calculator.evaluate('3 5 min 2 max') == 3
+        assert calculator.evaluate('16 sqrt') == 4
+        assert calculator.evaluate('15 0 ( 2 5 * ) clamp') == 10
+        assert calculator.compile('x 0 10 clamp').run({'x': -3}) == 0
+        assert calculator.evaluate_compact(calculator.encode('2 9 max sqrt')) == 3
+
+    def test_register_invalid_operators(self):
+        """Проверка ошибок при добавлении операторов"""
+        with pytest.raises(ValueError):
+            DEFAULT_OPERATORS.register(OperatorSpec('+', 2, max))
+        with pytest.raises(ValueError):
+            DEFAULT_OPERATORS.register(OperatorSpec('1e3', 1, abs))
+        with pytest.raises(ValueError):
+            OperatorSpec('a b', 2, max)
+        with pytest.raises(ValueError):
+            OperatorSpec('(', 1, abs)
+        with pytest.raises(ValueError):
+            OperatorSpec('abs', 0, abs)
+        with pytest.raises(ValueError):
+            OperatorSpec('abs', 1, None)
+
+    def test_pickle_spawn(self):
+        """Проверка передачи реестра с новым оператором в процесс spawn"""
+        operators = DEFAULT_OPERATORS.register(OperatorSpec('max', 2, max))
+        backends = [get_backend(name) for name in BACKEND_NAMES]
+        for registry in (operators, *(backend.operators for backend in backends)):
+            restored = pickle.loads(pickle.dumps(registry))
+            assert list(restored.get_operators()) == list(registry.get_operators())
+
+        calculator = Calculator(operators=operators)
+        with ProcessPoolExecutor(
+            max_workers=1,
+            mp_context=multiprocessing.get_context('spawn'),
+            initializer=init_worker,
+            initargs=(calculator.worker_options(),),
+        ) as executor:
+            results = executor.submit(evaluate_chunk, ['1 5 max 2 ^'], None).result()
+        assert results[0].value == 25
@@ -0,0 +1,73 @@
+import pytest
+from src.exceptions import DivisionByZeroError, InvalidOperandTypeError
+from src.operators import Operators
+from src.optimizer import Optimizer
+from src.rpn_evaluator import RPNEvaluator
+from src.token_parser import TokenParser
+from src.variable import Variable
+
+
+class TestOptimizer:
+    def setup_method(self):
+        operators = Operators()
+        self.parser = TokenParser(operators)
+        self.evaluator = RPNEvaluator(operators)
+        self.optimizer = Optimizer(operators)
+
+    def optimize(self, expr):
+        return self.optimizer.optimize(self.parser.parse(expr))
+
+    def test_constant_folding(self):
+        """Проверка свёртки константных подвыражений"""
+        assert self.optimize('3 4 + 2 *') == [14]
+        assert self.optimize('( 3 4 + ) 2 *') == [14]
+        assert self.optimize('x 2 3 ^ *') == [Variable('x'), 8, '*']
+        assert self.optimize('7 2 /') == [3.5]
+        assert self.optimize('6 3 /') == [2]
+
+    def test_peephole(self):
+        """Проверка упрощения тождеств и унарных операторов"""
+        x = Variable('x')
+        assert self.optimize('x @') == [x]
+        assert self.optimize('x ~ ~') == [x]
+        assert self.optimize('x ~ ~ ~') == [x, '~']
+        assert self.optimize('x 1 *') == [x]
+        assert self.optimize('1 x *') == [x]
+        assert self.optimize('x 0 +') == [x]
+        assert self.optimize('0 x +') == [x]
+        assert self.optimize('x 0 -') == [x]
+        assert self.optimize('x 1 ^') == [x]
+        assert self.optimize('x ( 2 1 - ) *') == [x]
+
+        # Не тождества
+        assert self.optimize('0 x -') == [0, x, '-']
+        assert self.optimize('x 0 *') == [x, 0, '*']
+
+    def test_errors_preserved(self):
+        """Ошибочные операции не сворачиваются и дают те же ошибки"""
+        tokens = self.optimize('1 0 / 2 3 + *')
+        assert tokens == [1, 0, '/', 5, '*']
+        with pytest.raises(DivisionByZeroError):
+            self.evaluator.evaluate(tokens)
+
+        tokens = self.optimize('3.5 2 // ~ ~')
+        with pytest.raises(InvalidOperandTypeError):
+            self.evaluator.evaluate(tokens)
+
+        # Некорректные по числу операндов выражения не изменяются
+        tokens = self.parser.parse('1 0 / +')
+        assert self.optimizer.optimize(tokens) == tokens
+
+    def test_large_power_not_folded(self):
+        """Огромные степени остаются вычислению"""
+        assert self.optimize('10 10 10 ^ ^') == [10, 10000000000, '^']
+
+    def test_same_results(self):
+        """Оптимизированная программа вычисляет то же значение"""
+        env = {'x': 3, 'y': 2.5}
+        for expr in ('x 1 * y 0 + * 2 3 ^ -', 'x ~ ~ @ y 1 ^ / 4 2 // +', 'x y 2 ^ +'):
+            tokens = self.parser.parse(expr)
+            expected = self.evaluator.evaluate(tokens, env)
+            assert self.evaluator.evaluate(self.optimizer.optimize(tokens), env) == (
+                expected
+            )
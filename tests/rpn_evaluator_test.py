@@ -1,6 +1,13 @@
 import pytest
-from src.exceptions import DivisionByZeroError, EvaluationError, InvalidOperandTypeError
+from src.compact import CompactProgram
+from src.exceptions import (
+    DivisionByZeroError,
+    EvaluationError,
+    InvalidOperandTypeError,
+    UndefinedVariableError,
+)
 from src.rpn_evaluator import RPNEvaluator
+from src.variable import Variable
 
 
 class TestRPNEvaluator:
@@ -96,3 +103,59 @@ class TestRPNEvaluator:
         # Неверный тип операндов
         with pytest.raises(InvalidOperandTypeError):
             self.evaluator.evaluate([3.5, 2, '//'])
+
+    def test_variables(self):
+        """Тестирование выражений с переменными"""
+        tokens = [Variable('x'), Variable('y'), '*', 2, '+']
+        assert self.evaluator.evaluate(tokens, {'x': 3, 'y': 4}) == 14
+        assert self.evaluator.evaluate(tokens, {'x': 0.5, 'y': 4}) == 4
+
+        # Незаданная переменная
+        with pytest.raises(UndefinedVariableError):
+            self.evaluator.evaluate(tokens, {'x': 3})
+        with pytest.raises(UndefinedVariableError):
+            self.evaluator.evaluate(tokens)
+
+    def test_evaluate_compact(self):
+        """Тестирование вычисления компактной программы"""
+        tokens = [Variable('x'), 2.5, '*', 2**70, '+', 2**70, '-', '~']
+        program = CompactProgram.from_tokens(tokens, self.evaluator.operators)
+        assert self.evaluator.evaluate_compact(program, {'x': 4}) == -10
+
+        program = CompactProgram.from_tokens([3, 0, '//'], self.evaluator.operators)
+        with pytest.raises(DivisionByZeroError):
+            self.evaluator.evaluate_compact(program)
+
+        program = CompactProgram.from_tokens([3.5, 2, '%'], self.evaluator.operators)
+        with pytest.raises(InvalidOperandTypeError):
+            self.evaluator.evaluate_compact(program)
+
+        program = CompactProgram.from_tokens(
+            [10.0, 1000, '^'], self.evaluator.operators
+        )
+        with pytest.raises(EvaluationError):
+            self.evaluator.evaluate_compact(program)
+
+        program = CompactProgram.from_tokens([Variable('y')], self.evaluator.operators)
+        with pytest.raises(UndefinedVariableError):
+            self.evaluator.evaluate_compact(program, {'x': 1})
+
+    def test_evaluate_or_error(self):
+        """Проверка возврата ошибок без выброса исключений"""
+        evaluate = self.evaluator.evaluate_or_error
+        assert evaluate([3, 4, '+']) == (7, None)
+
+        # Ошибки, видные по программе, не выбрасываются: трассировки нет
+        for tokens, env, error_type in (
+            ([3, '+'], None, EvaluationError),
+            ([1, 2, 3, '+'], None, EvaluationError),
+            ([Variable('y'), 1, '+'], {'x': 1}, UndefinedVariableError),
+            ([Variable('x')], None, UndefinedVariableError),
+        ):
+            value, error = evaluate(tokens, env)
+            assert value is None and type(error) is error_type
+            assert error.__traceback__ is None
+
+        # Ошибка оператора до найденной ошибки возвращается первой
+        _, error = evaluate([1, 0, '/', Variable('y'), '+'], {})
+        assert isinstance(error, DivisionByZeroError)
@@ -0,0 +1,49 @@
+import asyncio
+
+from src.server import EvaluationServer, make_calculator, parse_args
+
+
+async def _request(server, lines, path=None):
+    """Отправляет строки одним пакетом (конвейером) и читает ответы."""
+    listener = await server.start(path=path)
+    async with listener:
+        if path is None:
+            port = listener.sockets[0].getsockname()[1]
+            reader, writer = await asyncio.open_connection('127.0.0.1', port)
+        else:
+            reader, writer = await asyncio.open_unix_connection(path)
+        writer.write(''.join(f'{line}\n' for line in lines).encode('utf-8'))
+        await writer.drain()
+        writer.write_eof()
+        responses = (await reader.read()).decode('utf-8').splitlines()
+        writer.close()
+    server.close()
+    return responses
+
+
+class TestEvaluationServer:
+    def test_pipelining(self):
+        """Проверка порядка ответов при конвейерных запросах"""
+        lines = [f'{i} 2 ^' for i in range(20)] + ['3 0 /']
+        responses = asyncio.run(_request(EvaluationServer(max_concurrency=4), lines))
+        assert responses[:20] == [str(i**2) for i in range(20)]
+        assert responses[20] == 'ERROR\tDivisionByZeroError\tДеление на ноль'
+
+    def test_workers(self):
+        """Проверка вычислений в пуле процессов"""
+        server = EvaluationServer(workers=2)
+        responses = asyncio.run(_request(server, ['2 100 ^', '1 1 +']))
+        assert responses == [str(2**100), '2']
+
+    def test_unix_socket(self, tmp_path):
+        """Проверка сервера на Unix-сокете"""
+        path = str(tmp_path / 'rpn.sock')
+        responses = asyncio.run(_request(EvaluationServer(), ['3 4 +'], path))
+        assert responses == ['7']
+
+    def test_make_calculator(self):
+        """Проверка, что без флагов ограничений вычисление идёт без limits"""
+        assert make_calculator(parse_args([])).rpn_evaluator.limits is None
+        calculator = make_calculator(parse_args(['--timeout', '0.5']))
+        assert calculator.rpn_evaluator.limits.timeout == 0.5
+        assert calculator.rpn_evaluator.limits.max_operations is None
@@ -0,0 +1,57 @@
+from fractions import Fraction
+
+import pytest
+from src.calculator import Calculator
+from src.exceptions import (
+    DivisionByZeroError,
+    EvaluationError,
+    ResourceLimitError,
+)
+from src.limits import EvaluationLimits
+from src.session import Session
+
+
+class TestSession:
+    def setup_method(self):
+        self.session = Session()
+
+    def test_persistent_stack(self):
+        """Проверка, что стек сохраняется между строками"""
+        assert self.session.feed('3 4') == [3, 4]
+        assert self.session.feed('+') == [7]
+        assert self.session.feed('2 ^') == [49]
+        assert self.session.feed('( 1 2 + ) /') == [pytest.approx(49 / 3)]
+
+    def test_commands(self):
+        """Проверка команд над стеком"""
+        assert self.session.feed('1 2 dup') == [1, 2, 2]
+        assert self.session.feed('swap drop') == [1, 2]
+        assert self.session.feed('swap -') == [1]
+        assert self.session.feed('3 dup * stack') == [1, 9]
+        assert self.session.feed('clear') == []
+
+    def test_error_restores_stack(self):
+        """Проверка, что строка с ошибкой не меняет стек"""
+        self.session.feed('5 6')
+        with pytest.raises(DivisionByZeroError):
+            self.session.feed('+ 0 /')
+        assert self.session.values() == [5, 6]
+        with pytest.raises(EvaluationError):
+            self.session.feed('drop drop drop')
+        with pytest.raises(EvaluationError):
+            self.session.feed('+ +')
+        assert self.session.values() == [5, 6]
+
+    def test_variables_and_backend(self):
+        """Проверка переменных и числового режима"""
+        session = Session(Calculator(backend='fraction'), env={'x': 3})
+        assert session.feed('1 x /') == [Fraction(1, 3)]
+        assert session.feed('dup +') == [Fraction(2, 3)]
+
+    def test_limits(self):
+        """Проверка ограничений на одну строку"""
+        session = Session(Calculator(limits=EvaluationLimits(max_operations=2)))
+        session.feed('1 2 + 3 +')
+        with pytest.raises(ResourceLimitError):
+            session.feed('1 + 1 + 1 +')
+        assert session.feed('4 +') == [10]
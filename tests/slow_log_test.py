@@ -0,0 +1,128 @@
+import json
+import pickle
+
+import pytest
+from src.calculator import Calculator
+from src.exceptions import CalculatorError, ParserError
+from src.operators import DEFAULT_OPERATORS
+from src.slow_log import SlowLog, max_stack_depth
+
+
+class TestSlowLog:
+    def test_threshold(self):
+        """Проверка, что записываются только вычисления дольше порога"""
+        fast = Calculator(slow_log=SlowLog(threshold=10))
+        assert fast.evaluate('3 4 +') == 7
+        assert fast.slow_log.entries() == []
+
+        calculator = Calculator(slow_log=SlowLog(threshold=0))
+        assert calculator.evaluate('( 3 4 + ) 2 *') == 14
+        (entry,) = calculator.slow_log.entries()
+        assert entry.expr == '( 3 4 + ) 2 *'
+        assert entry.tokens == 7
+        assert entry.max_stack_depth == 2
+        assert set(entry.stages) == {'tokenize', 'validate', 'evaluate'}
+        assert entry.seconds >= sum(entry.stages.values())
+        assert entry.error is None
+        assert entry.profile is None
+
+    def test_ring_buffer_and_truncation(self):
+        """Проверка кольцевого буфера и усечения длинных выражений"""
+        slow_log = SlowLog(threshold=0, capacity=2, max_expr_length=10)
+        calculator = Calculator(slow_log=slow_log)
+        for expr in ('1 1 +', '2 2 +', '1 2 3 4 5 6 7 8 + + + + + + +'):
+            calculator.evaluate(expr)
+
+        entries = slow_log.entries()
+        assert len(entries) == 2
+        assert entries[0].expr == '2 2 +'
+        assert entries[1].expr == '1 2 3 4...'
+        assert entries[1].length == 29
+        assert entries[1].max_stack_depth == 8
+
+    def test_errors(self):
+        """Проверка записи неудачных вычислений"""
+        calculator = Calculator(slow_log=SlowLog(threshold=0))
+        with pytest.raises(CalculatorError):
+            calculator.evaluate('1 0 /')
+        with pytest.raises(CalculatorError):
+            calculator.evaluate('( 1 +')
+
+        division, parse = calculator.slow_log.entries()
+        assert division.error == 'DivisionByZeroError'
+        assert division.tokens == 3
+        assert parse.error is not None
+        assert parse.tokens is None
+        assert 'evaluate' not in parse.stages
+
+        # Не строка записывается как repr, исходная ошибка не подменяется
+        with pytest.raises(ParserError):
+            calculator.evaluate(None)
+        with pytest.raises(CalculatorError):
+            calculator.evaluate(123)
+        assert [entry.expr for entry in calculator.slow_log.entries()[-2:]] == [
+            'None',
+            '123',
+        ]
+
+    def test_file(self, tmp_path):
+        """Проверка записи журнала в файл строками JSON"""
+        path = tmp_path / 'slow.jsonl'
+        calculator = Calculator(slow_log=SlowLog(threshold=0, path=str(path)))
+        calculator.evaluate('2 3 ^')
+        list(calculator.evaluate_many(['1 2 +', 'x']))
+
+        records = [json.loads(line) for line in path.read_text().splitlines()]
+        assert [record['expr'] for record in records] == ['2 3 ^', '1 2 +', 'x']
+        assert records[2]['error'] is not None
+        assert records[0]['stages']['evaluate'] >= 0
+
+    def test_profile(self):
+        """Проверка профиля вызова при profile_rate=1"""
+        calculator = Calculator(slow_log=SlowLog(threshold=0, profile_rate=1))
+        calculator.evaluate('3 4 * 5 +')
+        (entry,) = calculator.slow_log.entries()
+        assert 'function calls' in entry.profile
+        assert 'evaluate' in entry.profile
+
+    def test_with_metrics_and_cache(self):
+        """Проверка совместной работы с метриками и кэшем"""
+        calculator = Calculator(
+            cache_size=8, metrics=True, slow_log=SlowLog(threshold=0)
+        )
+        assert calculator.evaluate('2 2 *') == 4
+        assert calculator.evaluate('2 2 *') == 4
+
+        first, cached = calculator.slow_log.entries()
+        assert first.tokens == 3
+        # Результат взят из кэша: разбора и вычисления не было
+        assert cached.tokens is None
+        assert cached.stages == {}
+        assert calculator.stats()['evaluations'] == 2
+        assert calculator.stats()['operators']['*'] == 1
+
+    def test_max_stack_depth(self):
+        """Проверка вычисления глубины стека"""
+        assert max_stack_depth([1, 2, '+', 3, '*'], DEFAULT_OPERATORS) == 2
+        assert max_stack_depth([1, 2, 3, '+', '+', '~'], DEFAULT_OPERATORS) == 3
+        assert max_stack_depth(['(', 1, ')'], DEFAULT_OPERATORS) == 1
+
+    def test_pickle(self):
+        """Проверка передачи настроек журнала в другой процесс"""
+        slow_log = SlowLog(threshold=0.5, capacity=3, profile_rate=0.1)
+        calculator = Calculator(slow_log=SlowLog(threshold=0))
+        calculator.evaluate('1 1 +')
+        restored = pickle.loads(pickle.dumps(slow_log))
+        assert restored.threshold == 0.5
+        assert restored.capacity == 3
+        assert restored.profile_rate == 0.1
+        assert len(pickle.loads(pickle.dumps(calculator.slow_log))) == 0
+
+    def test_invalid(self):
+        """Проверка неверных параметров журнала"""
+        with pytest.raises(ValueError):
+            SlowLog(threshold=-1)
+        with pytest.raises(ValueError):
+            SlowLog(threshold=0, capacity=0)
+        with pytest.raises(ValueError):
+            SlowLog(threshold=0, profile_rate=2)
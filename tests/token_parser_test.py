@@ -1,6 +1,9 @@
+import io
+
 import pytest
 from src.exceptions import ParserError
 from src.token_parser import TokenParser
+from src.variable import Variable
 
 
 class TestTokenParser:
@@ -71,8 +74,93 @@ class TestTokenParser:
             self.parser.parse('3 4 + )')
         assert 'Лишняя закрывающая скобка' in str(excinfo.value)
 
+    def test_validate(self):
+        """Проверка отдельной проверки скобок после tokenize"""
+        tokens = self.parser.tokenize('( 3 4 + ) 2 *')
+        self.parser.validate(tokens)
+        with pytest.raises(ParserError):
+            self.parser.validate(self.parser.tokenize('( 3 5 ) +'))
+
+    def test_try_parse(self):
+        """Проверка возврата ошибок разбора без выброса исключений"""
+        assert self.parser.try_parse('( 3 4 + ) x *') == (
+            ['(', 3, 4, '+', ')', Variable('x'), '*'],
+            None,
+        )
+        for expr in ('', '3 4 $', '( 3 5 ) +', '( 3', '3 )'):
+            tokens, error = self.parser.try_parse(expr)
+            assert tokens is None and isinstance(error, ParserError)
+            assert error.__traceback__ is None
+            with pytest.raises(ParserError) as excinfo:
+                self.parser.parse(expr)
+            assert str(excinfo.value) == str(error)
+
     def test_empty_parentheses(self):
         """Проверка пустых скобок"""
         with pytest.raises(ParserError) as excinfo:
             self.parser.parse('( )')
         assert 'Некорректное выражение внутри скобок' in str(excinfo.value)
+
+    def test_variables(self):
+        """Тестирование токенизации переменных"""
+        tokens = self.parser.parse('x y * 2 +')
+        assert tokens == [Variable('x'), Variable('y'), '*', 2, '+']
+
+        # Переменные внутри скобок считаются операндами
+        tokens = self.parser.parse('( rate 100 / )')
+        assert tokens == ['(', Variable('rate'), 100, '/', ')']
+
+        # Некорректное имя переменной
+        with pytest.raises(ParserError) as excinfo:
+            self.parser.parse('1x 2 +')
+        assert 'Неизвестный токен' in str(excinfo.value)
+
+    def test_iter_tokens(self):
+        """Тестирование ленивой токенизации с проверкой скобок"""
+        tokens = self.parser.iter_tokens('3 ( 4 5 + ) *')
+        assert next(tokens) == 3
+        assert list(tokens) == ['(', 4, 5, '+', ')', '*']
+
+        # Пустое выражение обнаруживается сразу
+        with pytest.raises(ParserError):
+            self.parser.iter_tokens('   ')
+
+        # Ошибка в скобках обнаруживается при достижении ')'
+        tokens = self.parser.iter_tokens('1 2 + ( 3 + )')
+        assert [next(tokens) for _ in range(6)] == [1, 2, '+', '(', 3, '+']
+        with pytest.raises(ParserError) as excinfo:
+            next(tokens)
+        assert 'Некорректное выражение внутри скобок' in str(excinfo.value)
+
+        with pytest.raises(ParserError) as excinfo:
+            list(self.parser.iter_tokens('( ( 3 4 + )'))
+        assert 'Лишняя открывающая скобка' in str(excinfo.value)
+
+    def test_long_expression(self, monkeypatch):
+        """Тестирование разбора длинного выражения кусками"""
+        # Маленькие куски, чтобы числа и операторы разрезались границами
+        monkeypatch.setattr('src.token_parser.CHUNK_SIZE', 7)
+        expr = ' '.join(['( 123 456 + 7.5 * )'] * 20 + ['//'] * 19)
+        expected = ['(', 123, 456, '+', 7.5, '*', ')'] * 20 + ['//'] * 19
+        assert self.parser.parse(expr) == expected
+        assert list(self.parser.iter_tokens(expr)) == expected
+
+    def test_parentheses_token(self):
+        """Скобки должны быть отдельными токенами"""
+        with pytest.raises(ParserError) as excinfo:
+            self.parser.parse('3 ()')
+        assert 'Неизвестный токен' in str(excinfo.value)
+
+    def test_stream_tokens(self):
+        """Тестирование токенизации из потока"""
+        expected = ['(', 12, 34, '+', ')', Variable('x'), '*']
+        stream = io.StringIO('( 12 34 + )\nx *\n')
+        assert list(self.parser.iter_stream_tokens(stream, chunk_size=3)) == expected
+
+        # Двоичный поток
+        stream = io.BytesIO(b'( 12 34 + ) x *')
+        assert list(self.parser.iter_stream_tokens(stream, chunk_size=2)) == expected
+
+        with pytest.raises(ParserError) as excinfo:
+            list(self.parser.iter_stream_tokens(io.StringIO(' \n ')))
+        assert 'Пустое выражение' in str(excinfo.value)
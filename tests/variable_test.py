@@ -0,0 +1,30 @@
+import pytest
+from src.exceptions import UndefinedVariableError
+from src.variable import Variable
+
+
+class TestVariable:
+    def test_resolve(self):
+        """Проверка получения значения переменной"""
+        assert Variable('x').resolve({'x': 5}) == 5
+
+        # Целые вещественные значения приводятся к int
+        value = Variable('x').resolve({'x': 4.0})
+        assert value == 4 and isinstance(value, int)
+
+        assert Variable('x').resolve({'x': 2.5}) == 2.5
+
+    def test_undefined(self):
+        """Проверка обращения к незаданной переменной"""
+        with pytest.raises(UndefinedVariableError):
+            Variable('x').resolve({'y': 1})
+
+        with pytest.raises(UndefinedVariableError):
+            Variable('x').resolve(None)
+
+    def test_equality(self):
+        """Проверка сравнения переменных"""
+        assert Variable('x') == Variable('x')
+        assert Variable('x') != Variable('y')
+        assert Variable('x') != 'x'
+        assert len({Variable('x'), Variable('x')}) == 1
@@ -0,0 +1,143 @@
+from fractions import Fraction
+
+import pytest
+from src.calculator import Calculator
+from src.exceptions import (
+    DivisionByZeroError,
+    EvaluationError,
+    InvalidOperandTypeError,
+    ParserError,
+    ResourceLimitError,
+    UndefinedVariableError,
+)
+from src.limits import EvaluationLimits
+from src.operators import Operators
+from src.variable import Variable
+from src.vectorized import evaluate_vectorized, split_literals
+
+np = pytest.importorskip('numpy')
+
+
+class TestVectorized:
+    def setup_method(self):
+        self.operators = Operators()
+
+    def evaluate(self, tokens, env=None):
+        return evaluate_vectorized(tokens, self.operators, env)
+
+    def test_arrays(self):
+        """Тестирование вычисления над массивами"""
+        x = np.array([1, 2, 3])
+        y = np.array([4, 5, 6])
+        tokens = [Variable('x'), Variable('y'), '*', 2, '+']
+        assert self.evaluate(tokens, {'x': x, 'y': y}).tolist() == [6, 12, 20]
+
+        # Скаляры и массивы смешиваются по правилам broadcasting
+        tokens = [Variable('x'), '~', 2, '^', 1, '+']
+        assert self.evaluate(tokens, {'x': x}).tolist() == [2, 5, 10]
+
+        tokens = ['(', Variable('x'), 2, '//', ')', Variable('x'), 2, '%', '+']
+        assert self.evaluate(tokens, {'x': x}).tolist() == [1, 1, 2]
+
+        # Выражение без массивов даёт нульмерный массив
+        assert self.evaluate([7, 2, '/']).tolist() == 3.5
+
+    def test_division_by_zero_indices(self):
+        """Проверка номеров элементов с делением на ноль"""
+        env = {'x': np.array([1, 2, 3]), 'y': np.array([1, 0, 0])}
+        for operator in ('/', '//', '%'):
+            tokens = [Variable('x'), Variable('y'), operator]
+            with pytest.raises(DivisionByZeroError) as excinfo:
+                self.evaluate(tokens, env)
+            assert excinfo.value.indices == [1, 2]
+
+        # Скалярный ноль делит все элементы
+        with pytest.raises(DivisionByZeroError) as excinfo:
+            self.evaluate([Variable('x'), 0, '/'], env)
+        assert excinfo.value.indices == [0, 1, 2]
+
+    def test_invalid_operand_indices(self):
+        """Проверка номеров элементов с нецелыми операндами"""
+        env = {'x': np.array([4.0, 4.5, 5.0, np.inf])}
+        with pytest.raises(InvalidOperandTypeError) as excinfo:
+            self.evaluate([Variable('x'), 2, '//'], env)
+        assert excinfo.value.indices == [1, 3]
+
+    def test_errors(self):
+        """Тестирование обработки ошибок"""
+        with pytest.raises(EvaluationError):
+            self.evaluate([3, '+'])
+
+        with pytest.raises(EvaluationError):
+            self.evaluate([3, 4, 5])
+
+        with pytest.raises(UndefinedVariableError):
+            self.evaluate([Variable('x'), 1, '+'])
+
+
+class TestVectorizedBatch:
+    def check(self, calculator, exprs, env=None):
+        """Сравнивает векторный пакет с evaluate_many"""
+        results = calculator.evaluate_many_vectorized(exprs, env, min_group_size=2)
+        expected = list(calculator.evaluate_many(exprs, env))
+        assert [result.expr for result in results] == exprs
+        assert [result.value for result in results] == [
+            result.value for result in expected
+        ]
+        assert [type(result.error) for result in results] == [
+            type(result.error) for result in expected
+        ]
+        return results
+
+    def test_split_literals(self):
+        """Проверка разделения программы на каркас и числа"""
+        tokens = ['(', 1, Variable('x'), '+', ')', 2.5, '*']
+        skeleton, literals = split_literals(tokens)
+        assert skeleton == ('(', None, Variable('x'), '+', ')', None, '*')
+        assert literals == [1, 2.5]
+
+    def test_results(self):
+        """Проверка совпадения результатов со скалярным вычислением"""
+        exprs = [f'{a} {b} + {a} * 7 / x -' for a in range(-5, 6) for b in (1, 2.5)]
+        for backend in ('exact', 'float64'):
+            results = self.check(Calculator(backend=backend), exprs, {'x': 3})
+            assert results[0].value == (-5 + 1) * -5 / 7 - 3
+        # Целые результаты в режиме exact - int
+        results = self.check(Calculator(), ['6 3 /', '8 2 /', '1 2 /'])
+        assert [type(result.value) for result in results] == [int, int, float]
+
+    def test_element_errors(self):
+        """Проверка ошибок отдельных выражений группы"""
+        exprs = ['1 0 /', '4 2 /', '5 0 //', '7 3 //', '2.5 2 //', 'x 2 +']
+        results = self.check(Calculator(), exprs)
+        assert isinstance(results[0].error, DivisionByZeroError)
+        assert results[1].value == 2
+        assert isinstance(results[5].error, UndefinedVariableError)
+
+    def test_exact_fallback(self):
+        """Проверка скалярного вычисления там, где float64 неточен"""
+        big = 2**53
+        exprs = [f'{big} 1 +', f'{big - 1} 2 +', f'{10**400} 1 +', '3 4 +']
+        results = self.check(Calculator(), exprs)
+        assert results[0].value == big + 1
+        assert results[1].value == big + 1
+        assert results[2].value == 10**400 + 1
+        # Степень совпадает с ** до последнего бита
+        exprs = [f'{a} 0.37 ^' for a in (1.1, 2.3, 7.9, 13.7)] + ['-8 0.5 ^']
+        self.check(Calculator(backend='float64'), exprs)
+
+    def test_parse_errors(self):
+        """Проверка ошибок разбора и некорректного каркаса"""
+        exprs = ['1 2 +', '( 1 + )', '( 3 + )', '1 2 ?', '']
+        results = self.check(Calculator(), exprs)
+        assert results[0].value == 3
+        assert all(isinstance(result.error, ParserError) for result in results[1:])
+
+    def test_scalar_modes(self):
+        """Проверка режимов, которые вычисляются скалярно"""
+        exprs = ['1 3 /', '2 3 /', '4 0 /']
+        results = self.check(Calculator(backend='fraction'), exprs)
+        assert results[0].value == Fraction(1, 3)
+        limits = EvaluationLimits(max_operations=1)
+        results = self.check(Calculator(limits=limits), ['1 2 +', '1 2 + 3 +'])
+        assert isinstance(results[1].error, ResourceLimitError)